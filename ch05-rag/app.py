@@ -19,7 +19,8 @@ from rag_agent import (
     get_settings,
     setup_sample_index,
 )
-from rag_agent.indexer import create_opensearch_client
+from rag_agent.indexer import check_cluster_health, check_index_exists
+from rag_agent.reranker import get_reranker_stats, preload_reranker_in_background
 
 # 페이지 설정
 st.set_page_config(
@@ -30,26 +31,20 @@ st.set_page_config(
 )
 
 
-def check_opensearch_connection() -> bool:
-    """OpenSearch 연결 상태를 확인합니다."""
-    try:
-        client = create_opensearch_client()
-        client.info()
-        return True
-    except Exception:
-        return False
+@st.cache_resource
+def preload_reranker() -> None:
+    """프로세스당 한 번, 리랭커 모델을 백그라운드에서 미리 로드합니다."""
+    if get_settings().reranker_preload:
+        preload_reranker_in_background()
 
 
-def check_index_exists() -> bool:
-    """인덱스 존재 여부를 확인합니다."""
-    try:
-        settings = get_settings()
-        client = create_opensearch_client()
-        return client.indices.exists(index=settings.index_name)
-    except Exception:
-        return False
+def check_opensearch_connection() -> bool:
+    """OpenSearch 연결 상태를 확인합니다. (TTL 동안 결과 캐시)"""
+    return check_cluster_health()
 
 
+preload_reranker()
+
 # 사이드바 설정
 with st.sidebar:
     st.title("⚙️ 설정")
@@ -106,6 +101,17 @@ with st.sidebar:
         st.error("OpenSearch 연결 실패", icon="❌")
         st.info("docker compose up -d 로 OpenSearch를 시작하세요")
 
+    # 리랭커 상태
+    if use_rerank:
+        try:
+            reranker_stats = get_reranker_stats()
+            if reranker_stats["load_seconds"] is not None:
+                st.caption(f"리랭커 로드 시간: {reranker_stats['load_seconds']:.1f}초")
+            else:
+                st.caption("리랭커 로드 중...")
+        except Exception:
+            st.caption("리랭커 워커에 연결할 수 없습니다")
+
     st.divider()
 
     # 대화 초기화 버튼
@@ -0,0 +1,83 @@
+"""
+검색 응답 크기 벤치마크: _source 필터링 전/후 비교.
+
+벡터/키워드 검색 응답에 1536차원 ``embedding`` 배열이 포함될 때와
+``_source`` includes + ``filter_path`` 로 응답을 줄였을 때의
+쿼리당 응답 바이트 수와 지연 시간을 비교합니다.
+
+실행:
+    cd ch05-rag
+    docker compose up -d
+    uv run python examples/bench_search_payload.py
+
+샘플 인덱스(``setup_sample_index``)가 먼저 만들어져 있어야 합니다.
+"""
+
+from __future__ import annotations
+
+import json
+import statistics
+import time
+
+from rag_agent import get_settings
+from rag_agent.embeddings import create_embeddings
+from rag_agent.indexer import get_opensearch_client
+from rag_agent.opensearch_backend import (
+    SEARCH_FILTER_PATH,
+    _keyword_query,
+    _vector_query,
+)
+
+QUERIES = [
+    "연차휴가는 며칠인가요?",
+    "재택근무 신청 방법",
+    "출장 숙박비 한도",
+    "경조사 휴가 일수",
+    "자기개발비 지원",
+]
+
+CANDIDATE_K = 15
+REPEAT = 5
+
+
+def measure(body: dict, slim: bool) -> tuple[int, float]:
+    settings = get_settings()
+    client = get_opensearch_client()
+    params = {"filter_path": SEARCH_FILTER_PATH} if slim else {}
+
+    start = time.perf_counter()
+    response = client.search(index=settings.index_name, body=body, **params)
+    elapsed_ms = (time.perf_counter() - start) * 1000
+
+    return len(json.dumps(response, ensure_ascii=False).encode()), elapsed_ms
+
+
+def main() -> None:
+    embeddings = create_embeddings()
+
+    for leg in ["vector", "keyword"]:
+        print(f"\n== {leg} 검색 (k={CANDIDATE_K}, 쿼리 {len(QUERIES)}개 x {REPEAT}회)")
+        for label, slim in [("전체 _source", False), ("필터링", True)]:
+            sizes, latencies = [], []
+            for query in QUERIES:
+                source_fields = None if not slim else ["content", "metadata"]
+                if leg == "vector":
+                    body = _vector_query(
+                        embeddings.embed_query(query), CANDIDATE_K, source_fields
+                    )
+                else:
+                    body = _keyword_query(query, CANDIDATE_K, source_fields)
+
+                for _ in range(REPEAT):
+                    size, elapsed_ms = measure(body, slim)
+                    sizes.append(size)
+                    latencies.append(elapsed_ms)
+
+            print(
+                f"{label:>10}: 평균 {statistics.mean(sizes) / 1024:8.1f} KB/쿼리, "
+                f"p50 {statistics.median(latencies):6.1f} ms"
+            )
+
+
+if __name__ == "__main__":
+    main()
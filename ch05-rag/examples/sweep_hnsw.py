@@ -0,0 +1,181 @@
+"""
+HNSW 인덱스 프로필 스윕: 프로필/ef_search별 recall@k 와 p50/p99 지연 시간 비교.
+
+프로필마다 임시 인덱스(``{INDEX_NAME}-sweep-{프로필}``)를 만들어 같은 문서를
+인덱싱한 뒤, ef_search 값을 바꿔 가며 질문 세트로 k-NN 검색을 실행합니다.
+nmslib은 ef_search를 인덱스 설정으로 바꾸고, faiss는 ef_search가 매핑에 고정되므로
+값마다 인덱스를 다시 만듭니다. lucene은 ef_search를 지원하지 않아 한 번만 측정합니다.
+
+정답은 질문 파일(JSONL)의 ``relevant`` (정답 ``chunk_id`` 목록)를 사용하고,
+없으면 전수 비교(exact k-NN) 결과를 정답으로 씁니다.
+
+    {"query": "연차휴가는 며칠인가요?", "relevant": ["<chunk_id>", ...]}
+
+실행:
+    cd ch05-rag
+    docker compose up -d
+    uv run python examples/sweep_hnsw.py
+    uv run python examples/sweep_hnsw.py --docs data/sample_docs --queries queries.jsonl
+    uv run python examples/sweep_hnsw.py --profiles latency recall --ef-search 16 64 256
+
+문서 임베딩은 임베딩 캐시를 사용하므로 두 번째 프로필부터는 API를 호출하지 않습니다.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import statistics
+import time
+from pathlib import Path
+
+from rag_agent import get_settings
+from rag_agent.document import get_sample_chunks
+from rag_agent.embeddings import create_embeddings
+from rag_agent.indexer import (
+    INDEX_PROFILES,
+    create_index,
+    get_opensearch_client,
+    index_documents,
+    resolve_index_profile,
+    set_ef_search,
+)
+from rag_agent.ingest import iter_chunks
+
+DEFAULT_QUERIES = [
+    "연차휴가는 며칠인가요?",
+    "재택근무 신청 방법",
+    "출장 숙박비 한도",
+    "경조사 휴가 일수",
+    "자기개발비 지원",
+    "반차 사용 가능 여부",
+    "재택근무 중 보안 수칙",
+    "법인카드 사용 규정",
+]
+
+
+def load_queries(path: str | None) -> list[dict]:
+    if path is None:
+        return [{"query": query} for query in DEFAULT_QUERIES]
+    lines = Path(path).read_text(encoding="utf-8").splitlines()
+    return [json.loads(line) for line in lines if line.strip()]
+
+
+def knn_ids(client, index_name: str, vector: list[float], k: int) -> list[str]:
+    body = {
+        "size": k,
+        "_source": False,
+        "query": {"knn": {"embedding": {"vector": vector, "k": k}}},
+    }
+    response = client.search(index=index_name, body=body, filter_path=["hits.hits._id"])
+    return [hit["_id"] for hit in response.get("hits", {}).get("hits", [])]
+
+
+def exact_ids(client, index_name: str, vector: list[float], k: int) -> list[str]:
+    # 전수 비교 (근사 없음) -> 정답 세트
+    body = {
+        "size": k,
+        "_source": False,
+        "query": {
+            "script_score": {
+                "query": {"match_all": {}},
+                "script": {
+                    "source": "knn_score",
+                    "lang": "knn",
+                    "params": {
+                        "field": "embedding",
+                        "query_value": vector,
+                        "space_type": "cosinesimil",
+                    },
+                },
+            }
+        },
+    }
+    response = client.search(index=index_name, body=body, filter_path=["hits.hits._id"])
+    return [hit["_id"] for hit in response.get("hits", {}).get("hits", [])]
+
+
+def percentile(values: list[float], q: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(int(len(ordered) * q), len(ordered) - 1)]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--profiles", nargs="+", default=list(INDEX_PROFILES))
+    parser.add_argument(
+        "--ef-search", nargs="+", type=int, default=[16, 32, 64, 128, 256]
+    )
+    parser.add_argument("--docs", help="인덱싱할 문서 폴더 (기본: 샘플 문서)")
+    parser.add_argument("--queries", help="질문 JSONL 파일 (기본: 내장 질문)")
+    parser.add_argument("-k", type=int, default=5)
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--keep", action="store_true", help="임시 인덱스 유지")
+    args = parser.parse_args()
+
+    settings = get_settings()
+    client = get_opensearch_client()
+    embeddings = create_embeddings()
+
+    queries = load_queries(args.queries)
+    vectors = embeddings.embed_documents([q["query"] for q in queries])
+    chunks = list(iter_chunks(args.docs)) if args.docs else get_sample_chunks()
+    print(f"문서 청크 {len(chunks)}개, 질문 {len(queries)}개, k={args.k}")
+
+    print(
+        f"\n{'프로필':<10}{'엔진':<8}{'m':>4}{'ef_c':>6}{'ef_s':>6}"
+        f"{'recall@k':>10}{'p50 ms':>9}{'p99 ms':>9}"
+    )
+    for profile_name in args.profiles:
+        profile = resolve_index_profile(profile_name)
+        index_name = f"{settings.index_name}-sweep-{profile_name}"
+        # faiss는 ef_search가 매핑에 고정되므로 값마다 다시 생성
+        rebuild = profile["engine"] == "faiss"
+
+        ef_values = args.ef_search if profile["engine"] != "lucene" else [None]
+        build_seconds, builds, truths = 0.0, 0, None
+        for ef_search in ef_values:
+            if truths is None or rebuild:
+                overrides = {} if ef_search is None else {"ef_search": ef_search}
+                start = time.perf_counter()
+                create_index(
+                    client=client,
+                    index_name=index_name,
+                    profile=profile_name,
+                    **overrides,
+                )
+                index_documents(chunks, client=client, index_name=index_name)
+                build_seconds += time.perf_counter() - start
+                builds += 1
+            else:
+                set_ef_search(ef_search, client=client, index_name=index_name)
+
+            if truths is None:
+                truths = [
+                    set(q.get("relevant") or exact_ids(client, index_name, v, args.k))
+                    for q, v in zip(queries, vectors, strict=True)
+                ]
+
+            recalls, latencies = [], []
+            for vector, truth in zip(vectors, truths, strict=True):
+                for _ in range(args.repeat):
+                    t0 = time.perf_counter()
+                    found = knn_ids(client, index_name, vector, args.k)
+                    latencies.append((time.perf_counter() - t0) * 1000)
+                recalls.append(len(truth & set(found)) / max(len(truth), 1))
+
+            print(
+                f"{profile_name:<10}{profile['engine']:<8}{profile['m']:>4}"
+                f"{profile['ef_construction']:>6}{ef_search or '-':>6}"
+                f"{statistics.mean(recalls):>10.3f}"
+                f"{statistics.median(latencies):>9.1f}"
+                f"{percentile(latencies, 0.99):>9.1f}"
+            )
+        print(f"{'':<10}(인덱스 생성 + 인덱싱 {builds}회, {build_seconds:.1f}초)")
+
+        if not args.keep:
+            client.indices.delete(index=index_name)
+
+
+if __name__ == "__main__":
+    main()
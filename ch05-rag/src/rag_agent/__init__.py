@@ -3,6 +3,7 @@ from rag_agent.agentic_rag import (
     ask_agentic_rag,
     create_agentic_rag_agent,
 )
+from rag_agent.backend import LocalSearchBackend, SearchBackend, get_search_backend
 from rag_agent.config import Settings, get_settings
 from rag_agent.document import (
     chunk_documents,
@@ -10,10 +11,37 @@ from rag_agent.document import (
     get_sample_chunks,
     get_sample_documents,
 )
-from rag_agent.indexer import create_index, index_documents, setup_sample_index
-from rag_agent.rag_chain import RAGAgent, ask_rag, create_rag_agent, stream_rag
-from rag_agent.reranker import rerank, search_with_rerank
+from rag_agent.fusion import fuse
+from rag_agent.indexer import (
+    create_index,
+    index_documents,
+    rebuild_index,
+    setup_sample_index,
+    sync_documents,
+)
+from rag_agent.ingest import ingest_directory, iter_chunks
+from rag_agent.opensearch_backend import OpenSearchBackend
+from rag_agent.rag_chain import (
+    RAGAgent,
+    aask_rag,
+    ask_rag,
+    astream_rag,
+    create_rag_agent,
+    stream_rag,
+)
+from rag_agent.reranker import (
+    arerank,
+    asearch_with_rerank,
+    preload_reranker_in_background,
+    rerank,
+    search_with_rerank,
+    warmup_reranker,
+)
 from rag_agent.search import (
+    ahybrid_search,
+    akeyword_search,
+    avector_search,
+    expand_neighbors,
     format_search_results,
     hybrid_search,
     keyword_search,
@@ -33,18 +61,37 @@ __all__ = [
     # 인덱싱
     "create_index",
     "index_documents",
+    "rebuild_index",
+    "sync_documents",
+    "ingest_directory",
+    "iter_chunks",
     "setup_sample_index",
+    "SearchBackend",
+    "OpenSearchBackend",
+    "LocalSearchBackend",
+    "get_search_backend",
     # 검색
     "vector_search",
     "keyword_search",
+    "avector_search",
+    "akeyword_search",
+    "expand_neighbors",
     "hybrid_search",
+    "ahybrid_search",
     "format_search_results",
+    "fuse",
     # 리랭킹
     "rerank",
     "search_with_rerank",
+    "arerank",
+    "asearch_with_rerank",
+    "warmup_reranker",
+    "preload_reranker_in_background",
     # RAG
     "ask_rag",
     "stream_rag",
+    "aask_rag",
+    "astream_rag",
     "RAGAgent",
     "create_rag_agent",
     # 에이전틱 RAG
@@ -6,14 +6,16 @@ from langchain_core.output_parsers import StrOutputParser
 from langchain_core.prompts import ChatPromptTemplate
 from langgraph.graph import END, StateGraph
 
-from rag_agent.rag_chain import create_llm
+from rag_agent.rag_chain import get_llm
 from rag_agent.reranker import search_with_rerank
+from rag_agent.search import expand_neighbors, format_search_results
 
 
 class AgentState(TypedDict):
     messages: Annotated[list[BaseMessage], operator.add]
     question: str
     context: str
+    results: list[dict]
     search_count: int
     search_queries: list[str]
 
@@ -28,7 +30,7 @@ def should_search(state: AgentState) -> str:
         return "search"
 
     # LLM이 추가 검색 필요 여부 판단
-    llm = create_llm()
+    llm = get_llm()
 
     prompt = ChatPromptTemplate.from_template(
         """질문: {question}
@@ -57,7 +59,7 @@ def generate_search_query(state: AgentState) -> str:
         return state["question"]
 
     # LLM이 새로운 검색 쿼리 생성
-    llm = create_llm()
+    llm = get_llm()
 
     prompt = ChatPromptTemplate.from_template(
         """원래 질문: {question}
@@ -87,18 +89,17 @@ def search_node(state: AgentState) -> dict:
     search_query = generate_search_query(state)
 
     # 검색 수행 (하이브리드 + 리랭킹)
-    results = search_with_rerank(search_query, initial_k=10, final_k=3)
+    results = expand_neighbors(
+        search_with_rerank(search_query, initial_k=10, final_k=3)
+    )
 
-    # 새로운 컨텍스트 추가
-    new_context = "\n\n".join([r["content"] for r in results])
-    combined_context = state["context"]
-    if combined_context:
-        combined_context += "\n\n---\n\n" + new_context
-    else:
-        combined_context = new_context
+    # 누적 결과를 다시 구성 (중복 청크 제거 + 토큰 예산 적용)
+    seen = {r["id"] for r in state["results"]}
+    combined = state["results"] + [r for r in results if r["id"] not in seen]
 
     return {
-        "context": combined_context,
+        "context": format_search_results(combined, include_score=False),
+        "results": combined,
         "search_count": state["search_count"] + 1,
         "search_queries": state["search_queries"] + [search_query],
         "messages": [],
@@ -106,7 +107,7 @@ def search_node(state: AgentState) -> dict:
 
 
 def answer_node(state: AgentState) -> dict:
-    llm = create_llm()
+    llm = get_llm()
 
     prompt = ChatPromptTemplate.from_template(
         """다음 정보를 바탕으로 질문에 답변하세요.
@@ -163,6 +164,7 @@ def ask_agentic_rag(question: str) -> str:
             "question": question,
             "messages": [],
             "context": "",
+            "results": [],
             "search_count": 0,
             "search_queries": [],
         }
@@ -185,6 +187,7 @@ class AgenticRAGAgent:
                 "question": question,
                 "messages": [],
                 "context": "",
+                "results": [],
                 "search_count": 0,
                 "search_queries": [],
             }
@@ -0,0 +1,145 @@
+import threading
+import time
+from functools import lru_cache
+
+import numpy as np
+
+from rag_agent.config import get_settings
+
+
+class SemanticAnswerCache:
+    """질문 임베딩의 코사인 유사도로 이전 답변을 재사용하는 캐시.
+
+    항목은 인덱스 세대(``generation``)와 검색 방식(``mode``)별로 구분한다.
+    세대가 바뀐(재인덱싱된) 항목과 ``ttl`` 이 지난 항목은 조회 시 버린다.
+    """
+
+    def __init__(
+        self, threshold: float = 0.95, ttl: float = 3600, max_entries: int = 1000
+    ):
+        self.threshold = threshold
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._entries: list[dict] = []
+        # 질문 벡터 버퍼: _start 행부터 len(_entries)개가 _entries와 같은 순서
+        # (여유 행을 두어 저장 시 새 행만 쓰고, 오래된 행은 _start만 옮겨 제거)
+        self._matrix: np.ndarray | None = None
+        self._start = 0
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _normalize(vector: list[float]) -> np.ndarray:
+        v = np.asarray(vector, dtype=np.float32)
+        norm = np.linalg.norm(v)
+        return v / norm if norm else v
+
+    def _purge(self, generation: str) -> None:
+        now = time.monotonic()
+        alive = [
+            entry
+            for entry in self._entries
+            if entry["generation"] == generation
+            and now - entry["created_at"] < self.ttl
+        ]
+        if len(alive) != len(self._entries):
+            self._entries = alive
+            self._matrix = None
+
+    def _rows(self) -> np.ndarray:
+        if self._matrix is None:
+            vectors = np.stack([e["vector"] for e in self._entries])
+            capacity = max(2 * self.max_entries, len(vectors))
+            self._matrix = np.empty((capacity, vectors.shape[1]), dtype=np.float32)
+            self._matrix[: len(vectors)] = vectors
+            self._start = 0
+        return self._matrix[self._start : self._start + len(self._entries)]
+
+    def _append_row(self, vector: np.ndarray) -> None:
+        # 행렬이 아직 없으면 다음 조회에서 한 번에 만듦
+        if self._matrix is None:
+            return
+        end = self._start + len(self._entries) - 1
+        if end >= len(self._matrix):
+            # 버퍼 끝에 닿으면 유효 행을 앞으로 옮김 (max_entries번 저장마다 한 번)
+            count = end - self._start
+            self._matrix[:count] = self._matrix[self._start : end]
+            self._start, end = 0, count
+        self._matrix[end] = vector
+
+    def lookup(
+        self, question_vector: list[float], generation: str, mode: str
+    ) -> dict | None:
+        with self._lock:
+            self._purge(generation)
+
+            candidates = [i for i, e in enumerate(self._entries) if e["mode"] == mode]
+            if candidates:
+                similarities = self._rows()[candidates] @ self._normalize(
+                    question_vector
+                )
+                best = int(np.argmax(similarities))
+                if similarities[best] >= self.threshold:
+                    self.hits += 1
+                    return {
+                        **self._entries[candidates[best]],
+                        "similarity": float(similarities[best]),
+                    }
+
+            self.misses += 1
+            return None
+
+    def store(
+        self,
+        question: str,
+        question_vector: list[float],
+        answer: str,
+        sources: list[dict],
+        generation: str,
+        mode: str,
+    ) -> None:
+        vector = self._normalize(question_vector)
+        with self._lock:
+            self._entries.append(
+                {
+                    "question": question,
+                    "vector": vector,
+                    "answer": answer,
+                    "sources": sources,
+                    "generation": generation,
+                    "mode": mode,
+                    "created_at": time.monotonic(),
+                }
+            )
+            self._append_row(vector)
+            # 가장 오래된 항목부터 제거
+            overflow = len(self._entries) - self.max_entries
+            if overflow > 0:
+                self._entries = self._entries[overflow:]
+                self._start += overflow
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries = []
+            self._matrix = None
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self) -> dict[str, int]:
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "size": len(self._entries),
+            }
+
+
+@lru_cache
+def get_answer_cache() -> SemanticAnswerCache:
+    settings = get_settings()
+    return SemanticAnswerCache(
+        threshold=settings.answer_cache_threshold,
+        ttl=settings.answer_cache_ttl,
+        max_entries=settings.answer_cache_max_entries,
+    )
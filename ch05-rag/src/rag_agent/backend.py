@@ -0,0 +1,745 @@
+import asyncio
+import json
+import math
+import re
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import Counter
+from collections.abc import Callable, Iterable, Iterator
+from contextlib import contextmanager
+from functools import lru_cache
+from pathlib import Path
+from typing import NamedTuple
+
+import numpy as np
+from langchain_core.documents import Document
+from opensearchpy import AsyncOpenSearch, OpenSearch
+
+from rag_agent.config import get_settings
+from rag_agent.document import chunk_hash, chunk_id
+from rag_agent.embeddings import create_embeddings
+from rag_agent.fusion import fuse
+
+TOKEN_PATTERN = re.compile(r"\w+")
+
+
+def tokenize(text: str) -> list[str]:
+    # OpenSearch standard 분석기와 비슷하게 단어 단위 + 소문자
+    return TOKEN_PATTERN.findall(text.lower())
+
+
+def tokenize_ngrams(text: str) -> list[str]:
+    # OpenSearch ngram 토크나이저(2~3글자)와 같은 부분 단어 토큰
+    return [
+        word[i : i + n]
+        for word in tokenize(text)
+        for n in (2, 3)
+        for i in range(len(word) - n + 1)
+    ]
+
+
+def minimum_matches(total: int, minimum_should_match: str | None) -> int:
+    """OpenSearch ``minimum_should_match`` 를 일치해야 하는 토큰 수로 변환.
+
+    정수/백분율(음수는 빠져도 되는 수)과 ``"2<60%"`` 같은 조건식(토큰이 2개를
+    넘을 때만 60%, 이하면 모두)을 지원한다.
+    """
+    if not minimum_should_match or total == 0:
+        return min(total, 1)
+
+    spec: str | None = None
+    for clause in minimum_should_match.split():
+        if "<" not in clause:
+            spec = clause
+            continue
+        # 조건식: 가장 큰 조건부터 적용 (조건 이하이면 모두 일치해야 함)
+        threshold, conditional = clause.split("<", 1)
+        if total > int(threshold):
+            spec = conditional
+        elif spec is None:
+            spec = str(total)
+    if spec is None:
+        return total
+
+    if spec.endswith("%"):
+        # 백분율은 내림
+        count = int(total * abs(float(spec[:-1])) / 100)
+    else:
+        count = abs(int(spec))
+    required = total - count if spec.startswith("-") else count
+    return min(max(required, 1), total)
+
+
+class BM25Index:
+    """메모리 내 BM25 역색인 (Lucene과 같은 idf/정규화 공식)."""
+
+    def __init__(
+        self,
+        texts: list[str],
+        tokenizer: Callable[[str], list[str]] = tokenize,
+        k1: float = 1.2,
+        b: float = 0.75,
+    ):
+        self.tokenizer = tokenizer
+        self.k1 = k1
+        self.b = b
+        self.size = len(texts)
+
+        postings: dict[str, tuple[list[int], list[int]]] = {}
+        lengths = np.zeros(len(texts), dtype=np.float32)
+        for doc, text in enumerate(texts):
+            counts = Counter(tokenizer(text))
+            lengths[doc] = sum(counts.values())
+            for term, tf in counts.items():
+                docs, tfs = postings.setdefault(term, ([], []))
+                docs.append(doc)
+                tfs.append(tf)
+
+        self.postings = {
+            term: (np.asarray(docs, dtype=np.int64), np.asarray(tfs, np.float32))
+            for term, (docs, tfs) in postings.items()
+        }
+        avg_length = float(lengths.mean()) if len(texts) else 0.0
+        self.norms = self.k1 * (1 - self.b + self.b * lengths / (avg_length or 1.0))
+
+    def score(self, query: str, minimum_should_match: str | None = None) -> np.ndarray:
+        terms = set(self.tokenizer(query))
+        scores = np.zeros(self.size, dtype=np.float32)
+        matched = np.zeros(self.size, dtype=np.int32)
+        for term in terms:
+            if term not in self.postings:
+                continue
+            docs, tfs = self.postings[term]
+            idf = math.log(1 + (self.size - len(docs) + 0.5) / (len(docs) + 0.5))
+            scores[docs] += idf * tfs * (self.k1 + 1) / (tfs + self.norms[docs])
+            matched[docs] += 1
+
+        # 질문 토큰 중 일치해야 하는 수를 채우지 못한 문서는 0점
+        required = minimum_matches(len(terms), minimum_should_match)
+        return np.where(matched >= required, scores, 0.0).astype(np.float32)
+
+
+def iter_batches(
+    documents: Iterable[Document], batch_size: int
+) -> Iterator[list[Document]]:
+    batch: list[Document] = []
+    for doc in documents:
+        batch.append(doc)
+        if len(batch) >= batch_size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def fuse_legs(
+    vector_results: list[dict],
+    keyword_results: list[dict],
+    k: int,
+    vector_weight: float,
+    keyword_weight: float,
+) -> list[dict]:
+    # 벡터/키워드 후보를 설정된 방식(settings.fusion_method)으로 결합
+    settings = get_settings()
+    return fuse(
+        [vector_results, keyword_results],
+        weights=[vector_weight, keyword_weight],
+        names=["vector", "keyword"],
+        method=settings.fusion_method,
+        k=k,
+        rrf_k=settings.rrf_k,
+    )
+
+
+class SearchBackend(ABC):
+    """검색/인덱싱 백엔드 인터페이스.
+
+    ``search`` / ``indexer`` 모듈의 공개 함수는 ``get_search_backend`` 로 백엔드를
+    한 번 고른 뒤 이 메서드들을 호출한다. 검색 결과는
+    ``{"id", "content", "metadata", "score"}`` 딕셔너리 목록이다.
+    """
+
+    @abstractmethod
+    def vector_search(
+        self, query: str, k: int, section: str | None = None
+    ) -> list[dict]: ...
+
+    @abstractmethod
+    async def avector_search(
+        self, query: str, k: int, section: str | None = None
+    ) -> list[dict]: ...
+
+    @abstractmethod
+    def keyword_search(
+        self, query: str, k: int, section: str | None = None
+    ) -> list[dict]: ...
+
+    @abstractmethod
+    async def akeyword_search(
+        self, query: str, k: int, section: str | None = None
+    ) -> list[dict]: ...
+
+    def hybrid_search(
+        self,
+        query: str,
+        k: int,
+        vector_weight: float,
+        keyword_weight: float,
+        mode: str = "client",
+        section: str | None = None,
+    ) -> list[dict]:
+        """벡터/키워드 후보(k x ``HYBRID_CANDIDATE_MULTIPLIER``)를 검색해 결합.
+
+        기본 구현은 ``mode`` 와 관계없이 두 번 검색한 뒤 결합한다 (client 방식).
+        """
+        candidate_k = k * get_settings().hybrid_candidate_multiplier
+        return fuse_legs(
+            self.vector_search(query, candidate_k, section),
+            self.keyword_search(query, candidate_k, section),
+            k,
+            vector_weight,
+            keyword_weight,
+        )
+
+    async def ahybrid_search(
+        self,
+        query: str,
+        k: int,
+        vector_weight: float,
+        keyword_weight: float,
+        mode: str = "client",
+        section: str | None = None,
+    ) -> list[dict]:
+        candidate_k = k * get_settings().hybrid_candidate_multiplier
+        # 두 검색을 동시에 실행 (지연 시간 = 두 검색 중 긴 쪽)
+        # 키워드 검색은 질문 임베딩을 기다리지 않고 바로 시작됨
+        vector_results, keyword_results = await asyncio.gather(
+            self.avector_search(query, candidate_k, section),
+            self.akeyword_search(query, candidate_k, section),
+        )
+        return fuse_legs(
+            vector_results, keyword_results, k, vector_weight, keyword_weight
+        )
+
+    def hybrid_mode(self, mode: str) -> str:
+        """``mode`` 를 요청했을 때 실제로 쓰이는 결합 방식 (캐시 키용)."""
+        return "client"
+
+    @abstractmethod
+    def get_chunks(self, wanted: dict[str, set[int]]) -> list[dict]:
+        """출처별 ``chunk_index`` 목록에 해당하는 청크 (이웃 확장용)."""
+
+    @abstractmethod
+    async def aget_chunks(self, wanted: dict[str, set[int]]) -> list[dict]: ...
+
+    @abstractmethod
+    def healthy(self, ttl: float | None = None) -> bool: ...
+
+    @abstractmethod
+    def exists(self, ttl: float | None = None) -> bool: ...
+
+    @abstractmethod
+    def generation(self, ttl: float | None = None) -> str:
+        """내용이 바뀔 때마다 갱신되는 세대 값 (캐시 키에 포함)."""
+
+    @abstractmethod
+    def create_index(
+        self,
+        recreate: bool = True,
+        profile: str | None = None,
+        vector_dimension: int | None = None,
+        **overrides,
+    ) -> None: ...
+
+    @abstractmethod
+    def index_documents(
+        self,
+        documents: Iterable[Document],
+        batch_size: int | None = None,
+        concurrency: int | None = None,
+    ) -> int: ...
+
+    @abstractmethod
+    def sync_documents(self, documents: Iterable[Document]) -> dict[str, int]: ...
+
+    @abstractmethod
+    def rebuild_index(
+        self,
+        documents: Iterable[Document],
+        profile: str | None = None,
+        keep_versions: int | None = None,
+        **overrides,
+    ) -> dict: ...
+
+
+class LocalSnapshot(NamedTuple):
+    """한 세대의 로컬 인덱스 (문서, 벡터, 역색인을 항상 함께 교체)."""
+
+    documents: list[dict]
+    vectors: np.ndarray
+    # (본문, 제목 경로) 역색인 쌍: 기본 토큰 + 선택적으로 n-gram
+    text_indexes: list[tuple[BM25Index, BM25Index]]
+    generation: str
+    stamp: tuple[int, int] | None
+
+
+class LocalSearchBackend(SearchBackend):
+    """OpenSearch 없이 프로세스 안에서 동작하는 검색 백엔드.
+
+    벡터는 정규화한 float32 행렬(``vectors-{세대}.npy``)로,
+    청크는 ``documents.json`` 으로 ``path`` 에 저장한다. 행렬은 메모리 매핑으로 열어
+    필요한 부분만 읽고, BM25 역색인은 로드 시 메모리에 만든다. ``analyzer`` 가
+    ``standard`` 가 아니면 n-gram 역색인을 함께 만들어 점수를 더하며, n-gram 쪽은
+    ``minimum_should_match`` 만큼 질문 토큰이 일치해야 한다
+    (nori 형태소 분석은 로컬에서 n-gram으로 대신함).
+
+    다른 프로세스가 ``documents.json`` 을 교체하면 다음 검색에서 다시 로드한다.
+    """
+
+    def __init__(
+        self,
+        path: str | Path,
+        heading_boost: float = 2.0,
+        analyzer: str = "standard",
+        minimum_should_match: str | None = None,
+    ):
+        self.path = Path(path)
+        self.heading_boost = heading_boost
+        self.analyzer = analyzer
+        self.minimum_should_match = minimum_should_match
+        self._lock = threading.RLock()
+        # batch() 중 아직 저장하지 않은 (문서, 벡터)
+        self._pending: tuple[list[dict], np.ndarray] | None = None
+        self._batch_depth = 0
+        self._load()
+
+    def _stamp(self) -> tuple[int, int] | None:
+        # documents.json은 교체(rename)로만 바뀌므로 inode + 수정 시각으로 변경 감지
+        try:
+            stat = (self.path / "documents.json").stat()
+        except FileNotFoundError:
+            return None
+        return stat.st_ino, stat.st_mtime_ns
+
+    def _load(self) -> None:
+        documents_file = self.path / "documents.json"
+
+        for _ in range(3):
+            stamp = self._stamp()
+            if stamp is None:
+                documents: list[dict] = []
+                generation = "0"
+                vectors = np.zeros((0, 0), dtype=np.float32)
+                break
+            try:
+                data = json.loads(documents_file.read_text(encoding="utf-8"))
+                vectors = np.load(self.path / data["vectors"], mmap_mode="r")
+            except FileNotFoundError:
+                # 읽는 사이 다른 프로세스가 새 세대로 교체하고 이전 파일을 지움
+                continue
+            documents = data["documents"]
+            generation = data["generation"]
+            break
+        else:
+            raise RuntimeError(f"로컬 인덱스를 읽을 수 없습니다: {self.path}")
+
+        # 검색 중인 스레드가 반쯤 바뀐 상태를 보지 않도록 스냅샷 하나로 교체
+        self._snapshot = LocalSnapshot(
+            documents,
+            vectors,
+            self._build_text_indexes(documents),
+            generation,
+            stamp,
+        )
+
+    def _snapshot_now(self) -> LocalSnapshot:
+        # 다른 프로세스(또는 인스턴스)가 저장했으면 다시 로드한 뒤 현재 스냅샷 반환
+        if self._stamp() != self._snapshot.stamp:
+            with self._lock:
+                if self._stamp() != self._snapshot.stamp:
+                    self._load()
+        return self._snapshot
+
+    def _build_text_indexes(
+        self, documents: list[dict]
+    ) -> list[tuple[BM25Index, BM25Index]]:
+        contents = [d["content"] for d in documents]
+        headings = [d["metadata"].get("heading_path", "") for d in documents]
+
+        text_indexes = [(BM25Index(contents), BM25Index(headings))]
+        if self.analyzer != "standard":
+            text_indexes.append(
+                (
+                    BM25Index(contents, tokenize_ngrams),
+                    BM25Index(headings, tokenize_ngrams),
+                )
+            )
+        return text_indexes
+
+    def _save(self, documents: list[dict], vectors: np.ndarray) -> None:
+        self.path.mkdir(parents=True, exist_ok=True)
+        generation = str(time.time_ns())
+
+        # 벡터는 세대별 새 파일에 쓰고 documents.json 교체로 전환
+        # (메모리 매핑 중인 파일을 덮어쓰지 않고, 읽는 쪽은 항상 완전한 파일을 봄)
+        vectors_name = f"vectors-{generation}.npy"
+        np.save(
+            self.path / vectors_name, np.ascontiguousarray(vectors, dtype=np.float32)
+        )
+        tmp_documents = self.path / "documents.json.tmp"
+        tmp_documents.write_text(
+            json.dumps(
+                {
+                    "generation": generation,
+                    "vectors": vectors_name,
+                    "documents": documents,
+                },
+                ensure_ascii=False,
+            ),
+            encoding="utf-8",
+        )
+        tmp_documents.replace(self.path / "documents.json")
+
+        self._load()
+
+        # 이전 세대 벡터 파일 정리 (다른 프로세스가 아직 열고 있으면 다음에 삭제)
+        for old in self.path.glob("vectors-*.npy"):
+            if old.name != vectors_name:
+                try:
+                    old.unlink()
+                except OSError:
+                    pass
+
+    @contextmanager
+    def batch(self) -> Iterator["LocalSearchBackend"]:
+        """블록 안의 add/delete/clear를 모아 끝날 때 파일을 한 번만 다시 쓴다.
+
+        변경분은 블록이 끝나야 검색에 보이며, 예외가 나면 저장하지 않고 버린다.
+        """
+        with self._lock:
+            self._batch_depth += 1
+            try:
+                yield self
+            except BaseException:
+                if self._batch_depth == 1:
+                    self._pending = None
+                raise
+            finally:
+                self._batch_depth -= 1
+
+            if self._batch_depth == 0 and self._pending is not None:
+                documents, vectors = self._pending
+                self._pending = None
+                self._save(documents, vectors)
+
+    def _current(self) -> tuple[list[dict], np.ndarray]:
+        # 배치 중이면 아직 저장하지 않은 변경분 기준
+        if self._pending is not None:
+            return self._pending
+        snapshot = self._snapshot_now()
+        return snapshot.documents, snapshot.vectors
+
+    def _commit(self, documents: list[dict], vectors: np.ndarray) -> None:
+        if self._batch_depth:
+            self._pending = (documents, vectors)
+        else:
+            self._save(documents, vectors)
+
+    def add(
+        self,
+        documents: list[Document],
+        vectors: list[list[float]],
+        replace: bool = False,
+    ) -> int:
+        """문서를 추가 (같은 ID는 덮어씀). ``replace`` 면 기존 문서를 모두 교체."""
+        if not documents:
+            if replace:
+                self.clear()
+            return 0
+
+        new_vectors = np.asarray(vectors, dtype=np.float32)
+        norms = np.linalg.norm(new_vectors, axis=1, keepdims=True)
+        new_vectors /= np.where(norms == 0, 1.0, norms)
+
+        with self._lock:
+            current, current_vectors = self._current()
+            if replace:
+                current = []
+            if (
+                current
+                and len(current_vectors)
+                and current_vectors.shape[1] != new_vectors.shape[1]
+            ):
+                raise ValueError(
+                    f"벡터 차원이 다릅니다: {current_vectors.shape[1]} != "
+                    f"{new_vectors.shape[1]} (clear 후 다시 인덱싱하세요)"
+                )
+
+            # 같은 ID는 덮어쓰기
+            added = {chunk_id(doc): i for i, doc in enumerate(documents)}
+            keep = [i for i, doc in enumerate(current) if doc["id"] not in added]
+            merged_documents = [current[i] for i in keep] + [
+                {
+                    "id": doc_id,
+                    "content": documents[i].page_content,
+                    "metadata": documents[i].metadata,
+                }
+                for doc_id, i in added.items()
+            ]
+            merged_vectors = np.concatenate(
+                [
+                    np.asarray(current_vectors[keep]).reshape(-1, new_vectors.shape[1]),
+                    new_vectors[list(added.values())],
+                ]
+            )
+            self._commit(merged_documents, merged_vectors)
+
+        return len(added)
+
+    def delete(self, ids: Iterable[str]) -> int:
+        ids = set(ids)
+        with self._lock:
+            current, current_vectors = self._current()
+            keep = [i for i, doc in enumerate(current) if doc["id"] not in ids]
+            deleted = len(current) - len(keep)
+            if deleted:
+                self._commit(
+                    [current[i] for i in keep], np.asarray(current_vectors[keep])
+                )
+        return deleted
+
+    def clear(self) -> None:
+        with self._lock:
+            self._commit([], np.zeros((0, 0), dtype=np.float32))
+
+    def content_hashes(self) -> dict[str, str | None]:
+        """저장된 문서 ID -> 내용 해시 (증분 동기화용)."""
+        documents, _ = self._current()
+        return {doc["id"]: doc["metadata"].get("content_hash") for doc in documents}
+
+    def __len__(self) -> int:
+        return len(self._snapshot_now().documents)
+
+    @staticmethod
+    def _section_mask(documents: list[dict], section: str | None) -> np.ndarray | None:
+        if not section:
+            return None
+        return np.fromiter(
+            (
+                d["metadata"].get("heading_path", "").startswith(section)
+                for d in documents
+            ),
+            dtype=bool,
+            count=len(documents),
+        )
+
+    @classmethod
+    def _top_k(
+        cls, documents: list[dict], scores: np.ndarray, k: int, section: str | None
+    ) -> list[dict]:
+        mask = cls._section_mask(documents, section)
+        if mask is not None:
+            scores = np.where(mask, scores, -np.inf)
+
+        k = min(k, len(scores))
+        if k == 0:
+            return []
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top], kind="stable")]
+
+        return [
+            {
+                "content": documents[i]["content"],
+                "score": float(scores[i]),
+                "metadata": documents[i]["metadata"],
+                "id": documents[i]["id"],
+            }
+            for i in top
+            if np.isfinite(scores[i])
+        ]
+
+    def healthy(self, ttl: float | None = None) -> bool:
+        return True
+
+    def exists(self, ttl: float | None = None) -> bool:
+        return len(self) > 0
+
+    def generation(self, ttl: float | None = None) -> str:
+        return self._snapshot_now().generation
+
+    def create_index(
+        self,
+        recreate: bool = True,
+        profile: str | None = None,
+        vector_dimension: int | None = None,
+        **overrides,
+    ) -> None:
+        # 매핑이 없으므로 재생성만 처리
+        if recreate:
+            self.clear()
+
+    def _index(
+        self,
+        documents: Iterable[Document],
+        batch_size: int | None = None,
+        replace: bool = False,
+    ) -> int:
+        settings = get_settings()
+        embeddings = create_embeddings()
+
+        # 배치 단위로 임베딩한 뒤 파일은 한 번만 다시 씀
+        docs: list[Document] = []
+        vectors: list[list[float]] = []
+        for batch in iter_batches(documents, batch_size or settings.index_batch_size):
+            docs += batch
+            vectors += embeddings.embed_documents([doc.page_content for doc in batch])
+
+        total = self.add(docs, vectors, replace=replace)
+
+        if settings.debug:
+            print(f"{total}개 문서 인덱싱 완료 (로컬)")
+
+        return total
+
+    def index_documents(
+        self,
+        documents: Iterable[Document],
+        batch_size: int | None = None,
+        concurrency: int | None = None,
+    ) -> int:
+        return self._index(documents, batch_size)
+
+    def sync_documents(self, documents: Iterable[Document]) -> dict[str, int]:
+        existing = self.content_hashes()
+
+        changed: dict[str, Document] = {}
+        seen_ids: set[str] = set()
+        added = 0
+        for doc in documents:
+            doc_id = chunk_id(doc)
+            if doc_id in seen_ids:
+                continue
+            seen_ids.add(doc_id)
+            if existing.get(doc_id, "") != chunk_hash(doc):
+                changed[doc_id] = doc
+                added += doc_id not in existing
+
+        # 추가/수정/삭제를 모아 파일을 한 번만 다시 씀
+        with self.batch():
+            self._index(changed.values())
+            deleted = self.delete(existing.keys() - seen_ids)
+        return {
+            "added": added,
+            "updated": len(changed) - added,
+            "deleted": deleted,
+            "unchanged": len(seen_ids) - len(changed),
+        }
+
+    def rebuild_index(
+        self,
+        documents: Iterable[Document],
+        profile: str | None = None,
+        keep_versions: int | None = None,
+        **overrides,
+    ) -> dict:
+        # 모든 문서를 임베딩한 뒤 파일을 한 번에 교체
+        indexed = self._index(documents, replace=True)
+        return {"index": "local", "previous": [], "deleted": [], "indexed": indexed}
+
+    def vector_search(
+        self, query: str, k: int, section: str | None = None
+    ) -> list[dict]:
+        # 프로세스 내 전수 비교 (근사 없음 -> 리스코어링 불필요)
+        return self.search_by_vector(create_embeddings().embed_query(query), k, section)
+
+    async def avector_search(
+        self, query: str, k: int, section: str | None = None
+    ) -> list[dict]:
+        query_vector = await create_embeddings().aembed_query(query)
+        return self.search_by_vector(query_vector, k, section)
+
+    def search_by_vector(
+        self, query_vector: list[float], k: int, section: str | None = None
+    ) -> list[dict]:
+        # 검색 도중 다시 로드되어도 같은 세대의 문서/벡터를 씀
+        snapshot = self._snapshot_now()
+        if not snapshot.documents:
+            return []
+        query = np.asarray(query_vector, dtype=np.float32)
+        query /= np.linalg.norm(query) or 1.0
+        # OpenSearch cosinesimil 점수와 같은 범위 (1 + cos) / 2
+        scores = (1 + snapshot.vectors @ query) / 2
+        return self._top_k(snapshot.documents, scores, k, section)
+
+    def keyword_search(
+        self, query: str, k: int, section: str | None = None
+    ) -> list[dict]:
+        snapshot = self._snapshot_now()
+        if not snapshot.documents:
+            return []
+        # multi_match(best_fields)와 같이 본문/제목 경로 중 높은 점수를 쓰고,
+        # 분석 방식(기본/n-gram)별 점수는 bool should처럼 더함
+        # n-gram 쪽(두 번째 쌍)에만 minimum_should_match 적용 (OpenSearch 쿼리와 동일)
+        scores = np.zeros(len(snapshot.documents), dtype=np.float32)
+        for i, (content_index, heading_index) in enumerate(snapshot.text_indexes):
+            minimum_should_match = self.minimum_should_match if i else None
+            scores += np.maximum(
+                content_index.score(query, minimum_should_match),
+                heading_index.score(query, minimum_should_match) * self.heading_boost,
+            )
+        # 일치하는 단어가 없는 문서는 제외
+        return self._top_k(
+            snapshot.documents, np.where(scores > 0, scores, -np.inf), k, section
+        )
+
+    async def akeyword_search(
+        self, query: str, k: int, section: str | None = None
+    ) -> list[dict]:
+        # 메모리 내 BM25는 I/O가 없으므로 바로 실행
+        return self.keyword_search(query, k, section)
+
+    def get_chunks(self, wanted: dict[str, set[int]]) -> list[dict]:
+        return [
+            {
+                "content": doc["content"],
+                "score": 0.0,
+                "metadata": doc["metadata"],
+                "id": doc["id"],
+            }
+            for doc in self._snapshot_now().documents
+            if doc["metadata"].get("chunk_index")
+            in wanted.get(doc["metadata"].get("source"), ())
+        ]
+
+    async def aget_chunks(self, wanted: dict[str, set[int]]) -> list[dict]:
+        return self.get_chunks(wanted)
+
+
+@lru_cache
+def get_local_backend() -> LocalSearchBackend:
+    settings = get_settings()
+    return LocalSearchBackend(
+        settings.local_index_path,
+        heading_boost=settings.heading_boost,
+        analyzer=settings.korean_analyzer,
+        minimum_should_match=settings.korean_minimum_should_match,
+    )
+
+
+def get_search_backend(
+    client: OpenSearch | None = None,
+    index_name: str | None = None,
+    async_client: AsyncOpenSearch | None = None,
+) -> SearchBackend:
+    """설정(``SEARCH_BACKEND``)에 맞는 백엔드. 검색/인덱싱 함수는 여기서만 백엔드를 고른다.
+
+    로컬 백엔드는 클라이언트와 인덱스 이름을 쓰지 않는다.
+    """
+    if get_settings().search_backend == "local":
+        return get_local_backend()
+
+    # opensearch_backend -> indexer -> backend 순환을 피하려고 여기서 import
+    from rag_agent.opensearch_backend import OpenSearchBackend
+
+    return OpenSearchBackend(client, index_name, async_client)
@@ -0,0 +1,165 @@
+import copy
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Hashable
+from functools import lru_cache
+from pathlib import Path
+from typing import Any
+
+from rag_agent.config import get_settings
+
+
+class LRUCache:
+    """스레드 안전한 인메모리 LRU 캐시.
+
+    ``max_size`` 를 넘으면 가장 오래 사용되지 않은 항목부터 버린다.
+    ``ttl`` (초)을 지정하면 만료된 항목은 조회 시 미스로 처리한다.
+    """
+
+    def __init__(self, max_size: int = 1024, ttl: float | None = None):
+        self.max_size = max_size
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._data: OrderedDict[Hashable, tuple[float, Any]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        with self._lock:
+            item = self._data.get(key)
+            if item is not None and self.ttl is not None:
+                if time.monotonic() - item[0] > self.ttl:
+                    del self._data[key]
+                    item = None
+
+            if item is None:
+                self.misses += 1
+                return default
+
+            self._data.move_to_end(key)
+            self.hits += 1
+            return item[1]
+
+    def set(self, key: Hashable, value: Any) -> None:
+        if self.max_size <= 0:
+            return
+
+        with self._lock:
+            self._data[key] = (time.monotonic(), value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_size:
+                self._data.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self) -> dict[str, int]:
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses, "size": len(self._data)}
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+class SQLiteStore:
+    """여러 프로세스가 공유하는 JSON 키-값 저장소 (SQLite 파일)."""
+
+    def __init__(self, path: str | Path, ttl: float | None = None):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        with self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS cache ("
+                "key TEXT PRIMARY KEY, value TEXT NOT NULL, created_at REAL NOT NULL)"
+            )
+
+    def get(self, key: str) -> Any:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value, created_at FROM cache WHERE key = ?", (key,)
+            ).fetchone()
+        if row is None:
+            return None
+        if self.ttl is not None and time.time() - row[1] > self.ttl:
+            return None
+        return json.loads(row[0])
+
+    def set(self, key: str, value: Any) -> None:
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO cache (key, value, created_at) VALUES (?, ?, ?)",
+                (key, json.dumps(value, ensure_ascii=False), time.time()),
+            )
+            if self.ttl is not None:
+                self._conn.execute(
+                    "DELETE FROM cache WHERE created_at < ?", (time.time() - self.ttl,)
+                )
+
+
+class ResultCache:
+    """검색 결과 캐시: 인메모리 LRU + 선택적 공유 백엔드.
+
+    결과 딕셔너리는 호출 측에서 수정될 수 있으므로(예: ``rerank_score``)
+    저장/반환 시 복사본을 사용한다.
+    """
+
+    def __init__(
+        self,
+        max_size: int = 1024,
+        ttl: float | None = None,
+        shared: SQLiteStore | None = None,
+    ):
+        self.memory = LRUCache(max_size=max_size, ttl=ttl)
+        self.shared = shared
+
+    @staticmethod
+    def make_key(*parts: Any) -> str:
+        return hashlib.sha256(
+            json.dumps(parts, ensure_ascii=False).encode()
+        ).hexdigest()
+
+    def get(self, key: str) -> list[dict] | None:
+        value = self.memory.get(key)
+        if value is None and self.shared is not None:
+            value = self.shared.get(key)
+            if value is not None:
+                self.memory.set(key, value)
+        return copy.deepcopy(value) if value is not None else None
+
+    def set(self, key: str, value: list[dict]) -> None:
+        value = copy.deepcopy(value)
+        self.memory.set(key, value)
+        if self.shared is not None:
+            self.shared.set(key, value)
+
+    def clear(self) -> None:
+        self.memory.clear()
+
+    def stats(self) -> dict[str, int]:
+        return self.memory.stats()
+
+
+@lru_cache
+def get_retrieval_cache() -> ResultCache:
+    settings = get_settings()
+    shared = None
+    if settings.retrieval_cache_path:
+        shared = SQLiteStore(
+            settings.retrieval_cache_path, ttl=settings.retrieval_cache_ttl
+        )
+    return ResultCache(
+        max_size=settings.retrieval_cache_size,
+        ttl=settings.retrieval_cache_ttl,
+        shared=shared,
+    )
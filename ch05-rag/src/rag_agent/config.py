@@ -14,29 +14,203 @@ class Settings(BaseSettings):
 
     openai_api_key: SecretStr = Field(..., description="OpenAI API 키")
 
+    search_backend: str = Field(
+        default="opensearch",
+        description="검색 백엔드 (opensearch: OpenSearch 서버, local: 프로세스 내 인덱스)",
+    )
+    local_index_path: str = Field(
+        default=".cache/local_index", description="로컬 검색 인덱스 저장 폴더"
+    )
+
     opensearch_host: str = Field(default="localhost", description="OpenSearch 호스트")
     opensearch_port: int = Field(default=9200, description="OpenSearch 포트")
     opensearch_user: str | None = Field(default=None, description="OpenSearch 사용자")
     opensearch_password: SecretStr | None = Field(
         default=None, description="OpenSearch 비밀번호"
     )
+    opensearch_pool_maxsize: int = Field(
+        default=20, description="OpenSearch 연결 풀 최대 크기"
+    )
+    opensearch_timeout: int = Field(
+        default=10, description="OpenSearch 요청 타임아웃(초)"
+    )
+    opensearch_max_retries: int = Field(default=3, description="OpenSearch 재시도 횟수")
+    opensearch_health_ttl: float = Field(
+        default=30.0, description="OpenSearch 상태 확인 결과 캐시 시간(초)"
+    )
 
     default_model: str = Field(default="gpt-5.2", description="기본 LLM 모델")
+    llm_max_connections: int = Field(
+        default=100, description="LLM HTTP 연결 풀 최대 크기"
+    )
+    llm_timeout: float = Field(default=60.0, description="LLM 요청 타임아웃(초)")
     embedding_model: str = Field(
         default="text-embedding-3-small", description="임베딩 모델"
     )
+    embedding_dimensions: int | None = Field(
+        default=None, description="축소 임베딩 차원 (Matryoshka, None: 모델 기본값)"
+    )
+    embedding_cache_enabled: bool = Field(
+        default=True, description="임베딩 디스크 캐시 사용 여부"
+    )
+    embedding_cache_path: str = Field(
+        default=".cache/embeddings.sqlite3", description="임베딩 캐시 파일 경로"
+    )
+    embedding_cache_max_entries: int = Field(
+        default=100_000, description="임베딩 캐시 최대 항목 수 (LRU)"
+    )
     reranker_model: str = Field(
         default="cross-encoder/ms-marco-MiniLM-L-6-v2", description="리랭킹 모델"
     )
+    reranker_batch_size: int = Field(default=32, description="리랭킹 배치 크기")
+    reranker_max_length: int = Field(
+        default=512, description="리랭킹 입력 최대 토큰 수 (초과분 절단)"
+    )
+    reranker_num_threads: int | None = Field(
+        default=None, description="리랭킹 CPU 스레드 수 (None: torch 기본값)"
+    )
+    reranker_backend: str = Field(
+        default="torch", description="리랭킹 백엔드 (torch/onnx/openvino)"
+    )
+    reranker_onnx_file: str | None = Field(
+        default=None, description="ONNX 모델 파일 (예: 양자화 int8 모델)"
+    )
+    reranker_device: str | None = Field(
+        default=None, description="리랭킹 디바이스 (cpu/cuda/mps, None: 자동)"
+    )
+    rerank_cache_size: int = Field(
+        default=4096, description="리랭킹 점수 캐시 크기 (질문-청크 쌍)"
+    )
+    reranker_worker_address: str | None = Field(
+        default=None, description="리랭커 워커 프로세스 주소 (host:port)"
+    )
+    reranker_worker_authkey: SecretStr | None = Field(
+        default=None,
+        description="리랭커 워커 인증 키 (워커/클라이언트 모두 필수, 기본값 없음)",
+    )
+    reranker_preload: bool = Field(
+        default=True, description="앱 시작 시 리랭커를 백그라운드에서 미리 로드"
+    )
+    rerank_cascade: bool = Field(
+        default=False, description="캐스케이드 리랭킹 (1차 점수로 후보 축소)"
+    )
+    rerank_prefilter_model: str | None = Field(
+        default=None, description="1차 점수용 소형 Cross-Encoder (None: 검색 점수)"
+    )
+    rerank_prefilter_k: int = Field(
+        default=6, description="캐스케이드 1차 통과 후보 수"
+    )
+    rerank_min_score: float | None = Field(
+        default=None, description="리랭킹 최소 점수 (미만은 제외)"
+    )
 
     index_name: str = Field(default="company-docs", description="인덱스 이름")
     chunk_size: int = Field(default=500, description="청크 크기")
     chunk_overlap: int = Field(default=50, description="청크 오버랩")
+    chunk_by_heading: bool = Field(
+        default=True, description="마크다운 제목 단위로 청킹 (제목 경로 기록)"
+    )
+    heading_boost: float = Field(
+        default=2.0, description="키워드 검색 시 제목 경로 필드 가중치"
+    )
+    korean_analyzer: str = Field(
+        default="ngram",
+        description="한국어 키워드 검색 분석기 (standard / ngram / nori, 변경 시 재인덱싱)",
+    )
+    korean_minimum_should_match: str = Field(
+        default="1<2",
+        description="한국어 분석 서브필드에서 일치해야 하는 질문 토큰 수 (OpenSearch 형식)",
+    )
+    hybrid_candidate_multiplier: int = Field(
+        default=3,
+        description="하이브리드 검색 시 각 검색에서 가져올 후보 배수 (k x 배수)",
+    )
     search_top_k: int = Field(default=5, description="검색 결과 수")
     rerank_top_k: int = Field(default=3, description="리랭킹 후 결과 수")
+    neighbor_window: int = Field(
+        default=0, description="검색 결과에 붙일 앞뒤 이웃 청크 수 (0: 사용 안 함)"
+    )
+    context_token_budget: int | None = Field(
+        default=3000, description="LLM 컨텍스트 최대 토큰 수 (0/None: 제한 없음)"
+    )
+
+    vector_dimension: int = Field(default=1536, description="임베딩 벡터 차원")
+    index_profile: str = Field(
+        default="default",
+        description="HNSW 인덱스 프로필 (default/latency/recall/memory)",
+    )
+    hnsw_engine: str | None = Field(
+        default=None, description="k-NN 엔진 (nmslib/faiss/lucene, None: 프로필 값)"
+    )
+    hnsw_m: int | None = Field(default=None, description="HNSW 노드당 연결 수 (m)")
+    hnsw_ef_construction: int | None = Field(
+        default=None, description="HNSW 그래프 생성 시 탐색 폭"
+    )
+    hnsw_ef_search: int | None = Field(
+        default=None, description="HNSW 검색 시 탐색 폭 (nmslib/faiss, lucene 미지원)"
+    )
+    vector_encoder: str | None = Field(
+        default=None, description="faiss 벡터 압축 (sq_fp16/pq, None: float32)"
+    )
+    pq_model_id: str | None = Field(
+        default=None, description="PQ 인코더용 학습된 k-NN 모델 ID"
+    )
+    rescore_full_vectors: bool = Field(
+        default=False, description="전체 정밀도 벡터로 상위 후보 재채점"
+    )
+    rescore_oversample: float = Field(
+        default=2.0, description="재채점 시 가져올 후보 배수 (k x 배수)"
+    )
+    index_shards: int | None = Field(default=None, description="프라이머리 샤드 수")
+    index_replicas: int | None = Field(default=None, description="레플리카 수")
+    index_refresh_interval: str | None = Field(
+        default=None, description="인덱스 refresh 주기 (예: 1s, 30s, -1)"
+    )
+
+    index_keep_versions: int = Field(
+        default=1,
+        description="재구축 후 남겨둘 이전 인덱스 버전 수 (1 이상, 롤백/진행 중 검색용)",
+    )
+    index_batch_size: int = Field(default=256, description="벌크 인덱싱 배치 크기")
+    index_concurrency: int = Field(default=4, description="벌크 인덱싱 동시 배치 수")
+    index_max_retries: int = Field(
+        default=5, description="벌크 요청 429 응답 시 최대 재시도 횟수"
+    )
+    ingest_workers: int | None = Field(
+        default=None, description="문서 로딩/청킹 프로세스 수 (None: CPU 코어 수)"
+    )
 
     vector_weight: float = Field(default=0.7, description="벡터 검색 가중치")
     keyword_weight: float = Field(default=0.3, description="키워드 검색 가중치")
+    fusion_method: str = Field(
+        default="rrf", description="검색 결과 결합 방식 (rrf/weighted_sum/combmnz)"
+    )
+    rrf_k: int = Field(default=60, description="RRF 순위 상수")
+    hybrid_search_mode: str = Field(
+        default="msearch", description="하이브리드 검색 방식 (client/msearch/native)"
+    )
+    retrieval_cache_enabled: bool = Field(
+        default=True, description="검색 결과 캐시 사용 여부"
+    )
+    retrieval_cache_size: int = Field(default=1024, description="검색 결과 캐시 크기")
+    retrieval_cache_ttl: float = Field(
+        default=600.0, description="검색 결과 캐시 유지 시간(초)"
+    )
+    retrieval_cache_path: str | None = Field(
+        default=None, description="프로세스 간 공유 캐시 파일 경로 (SQLite)"
+    )
+    answer_cache_enabled: bool = Field(
+        default=False, description="의미 기반 답변 캐시 사용 여부"
+    )
+    answer_cache_threshold: float = Field(
+        default=0.98, description="답변 캐시 적중 최소 코사인 유사도"
+    )
+    answer_cache_ttl: float = Field(
+        default=3600.0, description="답변 캐시 유지 시간(초)"
+    )
+    answer_cache_max_entries: int = Field(
+        default=1000, description="답변 캐시 최대 항목 수"
+    )
 
     debug: bool = Field(default=False, description="디버그 모드")
 
@@ -0,0 +1,173 @@
+from functools import lru_cache
+
+import tiktoken
+
+from rag_agent.config import get_settings
+
+SEPARATOR = "\n\n---\n\n"
+
+# 이보다 짧은 겹침은 우연의 일치로 보고 병합하지 않음
+MIN_OVERLAP = 5
+
+
+@lru_cache
+def get_encoding() -> tiktoken.Encoding:
+    model = get_settings().default_model
+    try:
+        return tiktoken.encoding_for_model(model)
+    except KeyError:
+        # tiktoken이 모르는 모델은 최신 OpenAI 토크나이저로 근사
+        return tiktoken.get_encoding("o200k_base")
+
+
+def count_tokens(text: str) -> int:
+    return len(get_encoding().encode(text, disallowed_special=()))
+
+
+def truncate_tokens(text: str, max_tokens: int) -> str:
+    encoding = get_encoding()
+    tokens = encoding.encode(text, disallowed_special=())
+    if len(tokens) <= max_tokens:
+        return text
+    # 말줄임표 자리를 남기고 자름
+    return encoding.decode(tokens[: max(max_tokens - 1, 0)]).rstrip() + "…"
+
+
+def _merge_text(
+    left: str, right: str, left_end: int | None = None, right_start: int | None = None
+) -> str:
+    # 원문 위치가 있으면 겹치는 길이를 바로 계산
+    if left_end is not None and right_start is not None and right_start >= 0:
+        overlap = left_end - right_start
+        if overlap > 0:
+            return left + right[overlap:]
+        return f"{left}\n{right}"
+
+    # 청크 오버랩: left의 끝과 right의 앞이 겹치면 한 번만 남김
+    for size in range(min(len(left), len(right)), MIN_OVERLAP - 1, -1):
+        if left.endswith(right[:size]):
+            return left + right[size:]
+    return f"{left}\n{right}"
+
+
+def merge_adjacent_chunks(results: list[dict]) -> list[dict]:
+    """같은 출처의 중복/인접 청크를 하나로 합친다.
+
+    ``chunk_index`` 가 같으면 중복으로 보고 버리고, 연속되면 본문의 오버랩을
+    제거해 이어 붙인다. 합쳐진 구간의 ``score`` 는 구성 청크 중 최고 점수
+    (리랭킹 점수 우선)이며, 반환 순서는 점수 내림차순이다.
+    """
+    seen: set = set()
+    by_source: dict[str, list[dict]] = {}
+    unindexed: list[dict] = []
+
+    for result in results:
+        metadata = result.get("metadata", {})
+        source = metadata.get("source", "unknown")
+        chunk_idx = metadata.get("chunk_index")
+        key = (source, chunk_idx) if chunk_idx is not None else result["content"]
+        if key in seen:
+            continue
+        seen.add(key)
+
+        if chunk_idx is None:
+            unindexed.append(result)
+        else:
+            by_source.setdefault(source, []).append(result)
+
+    merged = list(unindexed)
+    for chunks in by_source.values():
+        chunks.sort(key=lambda r: r["metadata"]["chunk_index"])
+
+        current: dict | None = None
+        for chunk in chunks:
+            chunk_idx = chunk["metadata"]["chunk_index"]
+            score = _score(chunk)
+            if current and chunk_idx == current["metadata"]["chunk_end"] + 1:
+                current["content"] = _merge_text(
+                    current["content"],
+                    chunk["content"],
+                    current["metadata"].get("end_index"),
+                    chunk["metadata"].get("start_index"),
+                )
+                current["metadata"]["chunk_end"] = chunk_idx
+                if "end_index" in chunk["metadata"]:
+                    current["metadata"]["end_index"] = chunk["metadata"]["end_index"]
+                current["score"] = max(current["score"], score)
+                continue
+
+            if current:
+                merged.append(current)
+            # 구간 점수는 score 하나로 관리 (rerank_score를 남기면 _score가
+            # 첫 청크의 리랭킹 점수를 읽어 최고 점수가 반영되지 않음)
+            current = {
+                **{key: value for key, value in chunk.items() if key != "rerank_score"},
+                "metadata": {**chunk["metadata"], "chunk_end": chunk_idx},
+                "score": score,
+            }
+        if current:
+            merged.append(current)
+
+    return sorted(merged, key=_score, reverse=True)
+
+
+def _score(result: dict) -> float:
+    # 리랭킹 점수가 있으면 우선 사용
+    score = result.get("rerank_score", result.get("score"))
+    return float(score) if score is not None else 0.0
+
+
+def _header(i: int, result: dict, include_score: bool) -> str:
+    metadata = result.get("metadata", {})
+    source = metadata.get("source", "unknown")
+    chunk_idx = metadata.get("chunk_index", "?")
+    chunk_end = metadata.get("chunk_end", chunk_idx)
+    chunks = f"{chunk_idx}-{chunk_end}" if chunk_end != chunk_idx else chunk_idx
+    if metadata.get("heading_path"):
+        source = f"{source} ({metadata['heading_path']})"
+
+    if include_score:
+        return f"[문서 {i}] 출처: {source}, 청크 {chunks}, 점수: {result['score']:.3f}"
+    return f"[문서 {i}] 출처: {source}, 청크 {chunks}"
+
+
+def pack_context(
+    results: list[dict],
+    max_tokens: int | None = None,
+    include_score: bool = True,
+) -> str:
+    """토큰 예산 안에서 검색 결과를 프롬프트 컨텍스트로 구성.
+
+    중복/인접 청크를 합친 뒤 점수 순으로 채우고, 예산을 넘으면 점수가 가장
+    낮은 구간부터 잘라내거나 제외한다. ``max_tokens`` 가 없으면
+    ``context_token_budget`` 설정을 사용한다 (0 또는 None이면 제한 없음).
+    """
+    if max_tokens is None:
+        max_tokens = get_settings().context_token_budget
+
+    segments = merge_adjacent_chunks(results)
+    separator_tokens = count_tokens(SEPARATOR) if max_tokens else 0
+
+    parts: list[str] = []
+    used = 0
+    for i, segment in enumerate(segments, 1):
+        header = _header(i, segment, include_score)
+        content = segment["content"]
+
+        if max_tokens:
+            cost = count_tokens(header) + 1 + (separator_tokens if parts else 0)
+            remaining = max_tokens - used - cost
+            if remaining <= 0:
+                break
+
+            content_tokens = count_tokens(content)
+            if content_tokens > remaining:
+                # 남은 예산만큼만 포함 (이후 구간은 점수가 더 낮으므로 제외)
+                content = truncate_tokens(content, remaining)
+                parts.append(f"{header}\n{content}")
+                break
+            used += cost + content_tokens
+
+        parts.append(f"{header}\n{content}")
+
+    return SEPARATOR.join(parts)
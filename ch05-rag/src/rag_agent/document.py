@@ -1,3 +1,6 @@
+import hashlib
+import json
+import re
 from pathlib import Path
 
 from langchain_core.documents import Document
@@ -16,9 +19,140 @@ def create_text_splitter(
         chunk_overlap=chunk_overlap or settings.chunk_overlap,
         separators=["\n## ", "\n### ", "\n#### ", "\n\n", "\n", " ", ""],
         length_function=len,
+        add_start_index=True,  # 원문 내 시작 위치 (metadata["start_index"])
     )
 
 
+HEADING_PATTERN = re.compile(r"^(#{1,6})[ \t]+(.+?)[ \t#]*$")
+
+# 제목 경로 구분자 (예: "휴가 정책 > 특별휴가 > 경조사 휴가")
+HEADING_SEPARATOR = " > "
+
+
+def split_markdown_sections(text: str) -> list[tuple[int, int, list[str]]]:
+    """마크다운을 제목 단위 구간 ``(시작, 끝, 제목 경로)`` 으로 나눈다.
+
+    코드 블록 안의 ``#`` 은 제목으로 보지 않는다. 본문 없이 제목만 있는
+    구간(예: 바로 하위 제목이 이어지는 경우)은 다음 구간에 합친다. 문서 끝의
+    제목만 있는 구간은 제목 자체를 하나의 구간으로 남긴다.
+    """
+    boundaries: list[tuple[int, list[str]]] = [(0, [])]
+    stack: list[tuple[int, str]] = []
+    in_fence = False
+    offset = 0
+
+    for line in text.splitlines(keepends=True):
+        stripped = line.strip()
+        if stripped.startswith(("```", "~~~")):
+            in_fence = not in_fence
+        elif not in_fence and (match := HEADING_PATTERN.match(stripped)):
+            level = len(match.group(1))
+            while stack and stack[-1][0] >= level:
+                stack.pop()
+            stack.append((level, match.group(2)))
+            boundaries.append((offset, [title for _, title in stack]))
+        offset += len(line)
+
+    sections = []
+    carry_start: int | None = None
+    for i, (start, path) in enumerate(boundaries):
+        end = boundaries[i + 1][0] if i + 1 < len(boundaries) else len(text)
+        body = text[start:end]
+        if path:
+            # 제목 줄을 뺀 본문
+            body = body.split("\n", 1)[1] if "\n" in body else ""
+
+        if not body.strip():
+            if not path:
+                # 첫 제목 앞의 빈 구간
+                continue
+            if i + 1 < len(boundaries):
+                carry_start = start if carry_start is None else carry_start
+                continue
+            # 마지막 구간: 다음에 합칠 구간이 없으므로 제목만으로 구간 유지
+
+        sections.append((start if carry_start is None else carry_start, end, path))
+        carry_start = None
+
+    return sections
+
+
+def _split_by_heading(
+    splitter: RecursiveCharacterTextSplitter, documents: list[Document]
+) -> list[Document]:
+    chunks = []
+    for doc in documents:
+        for start, end, path in split_markdown_sections(doc.page_content):
+            section = Document(
+                page_content=doc.page_content[start:end],
+                metadata={**doc.metadata, "heading_path": HEADING_SEPARATOR.join(path)},
+            )
+            for chunk in splitter.split_documents([section]):
+                # 구간 기준 위치 -> 원문 기준 위치
+                if chunk.metadata.get("start_index", -1) >= 0:
+                    chunk.metadata["start_index"] += start
+                chunks.append(chunk)
+
+    return chunks
+
+
+def document_id(doc: Document) -> str:
+    """출처와 청크 번호(``chunk_index``)로 결정되는 위치 기반 ID.
+
+    같은 출처에 본문이 같은 청크가 여러 개 있어도 ID가 겹치지 않는다.
+    ``chunk_index`` 가 없는 문서는 출처와 본문의 해시를 사용한다.
+    """
+    source = str(doc.metadata.get("source", "unknown"))
+    chunk_idx = doc.metadata.get("chunk_index")
+    key = doc.page_content if chunk_idx is None else f"#{chunk_idx}"
+    return hashlib.sha256(f"{source}\x00{key}".encode()).hexdigest()
+
+
+def content_hash(doc: Document) -> str:
+    """본문과 메타데이터(위치, 제목 경로 등)의 해시.
+
+    ID가 같아도 내용이나 원문 내 위치가 바뀌면 값이 달라지므로, 증분
+    동기화에서 다시 저장할 청크를 고르는 데 사용한다.
+    """
+    metadata = {
+        key: value
+        for key, value in doc.metadata.items()
+        if key not in ("chunk_id", "content_hash")
+    }
+    payload = json.dumps(metadata, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(f"{doc.page_content}\x00{payload}".encode()).hexdigest()
+
+
+def chunk_id(doc: Document) -> str:
+    # 메타데이터에 저장된 ID 우선 (없으면 위치/내용으로 계산)
+    return doc.metadata.get("chunk_id") or document_id(doc)
+
+
+def chunk_hash(doc: Document) -> str:
+    return doc.metadata.get("content_hash") or content_hash(doc)
+
+
+def _annotate_chunks(chunks: list[Document]) -> list[Document]:
+    """출처별 청크 번호, 원문 내 위치(start/end), 청크 ID와 내용 해시를 기록.
+
+    ``chunk_index`` 는 문서마다 0부터 다시 시작하므로 다른 파일이 바뀌어도
+    번호가 밀리지 않는다.
+    """
+    counters: dict[str, int] = {}
+    for chunk in chunks:
+        source = str(chunk.metadata.get("source", "unknown"))
+        chunk.metadata["chunk_index"] = counters.get(source, 0)
+        counters[source] = chunk.metadata["chunk_index"] + 1
+
+        start = chunk.metadata.get("start_index", -1)
+        if start >= 0:
+            chunk.metadata["end_index"] = start + len(chunk.page_content)
+        chunk.metadata["chunk_id"] = document_id(chunk)
+        chunk.metadata["content_hash"] = content_hash(chunk)
+
+    return chunks
+
+
 def load_text_file(file_path: str | Path) -> Document:
     path = Path(file_path)
     content = path.read_text(encoding="utf-8")
@@ -30,29 +164,26 @@ def chunk_text(
     source: str = "unknown",
     chunk_size: int | None = None,
     chunk_overlap: int | None = None,
+    by_heading: bool | None = None,
 ) -> list[Document]:
-    splitter = create_text_splitter(chunk_size, chunk_overlap)
     doc = Document(page_content=text, metadata={"source": source})
-    chunks = splitter.split_documents([doc])
-
-    for i, chunk in enumerate(chunks):
-        chunk.metadata["chunk_index"] = i
-
-    return chunks
+    return chunk_documents([doc], chunk_size, chunk_overlap, by_heading)
 
 
 def chunk_documents(
     documents: list[Document],
     chunk_size: int | None = None,
     chunk_overlap: int | None = None,
+    by_heading: bool | None = None,
 ) -> list[Document]:
     splitter = create_text_splitter(chunk_size, chunk_overlap)
-    chunks = splitter.split_documents(documents)
+    if by_heading is None:
+        by_heading = get_settings().chunk_by_heading
 
-    for i, chunk in enumerate(chunks):
-        chunk.metadata["chunk_index"] = i
-
-    return chunks
+    # 제목 단위로 먼저 나누고 각 구간을 청킹 (청크에 제목 경로 기록)
+    if by_heading:
+        return _annotate_chunks(_split_by_heading(splitter, documents))
+    return _annotate_chunks(splitter.split_documents(documents))
 
 
 # 샘플 문서 데이터 (실습용)
@@ -158,7 +289,7 @@ def get_sample_documents() -> list[Document]:
     sources = ["휴가정책.md", "재택근무정책.md", "비용정산가이드.md"]
     return [
         Document(page_content=text.strip(), metadata={"source": source})
-        for text, source in zip(SAMPLE_DOCUMENTS, sources)
+        for text, source in zip(SAMPLE_DOCUMENTS, sources, strict=True)
     ]
 
 
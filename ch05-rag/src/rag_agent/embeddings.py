@@ -1,15 +1,274 @@
+import asyncio
+import hashlib
 import os
+import sqlite3
+import threading
+import time
+import unicodedata
+from functools import lru_cache
+from pathlib import Path
 
 import numpy as np
+from langchain_core.embeddings import Embeddings
 from langchain_openai import OpenAIEmbeddings
 
 from rag_agent.config import get_settings
 
 
-def create_embeddings() -> OpenAIEmbeddings:
+def normalize_text(text: str) -> str:
+    # 유니코드 정규화 + 공백 정리 (캐시 키 용도)
+    return unicodedata.normalize("NFC", " ".join(text.split()))
+
+
+class EmbeddingCache:
+    """(모델명, 정규화된 텍스트)를 키로 임베딩 벡터를 저장하는 SQLite 캐시.
+
+    항목 수가 ``max_entries`` 를 넘으면 가장 오래 사용되지 않은 항목부터
+    10% 여유가 생길 때까지 삭제한다(LRU). 여러 스레드에서 공유해도 안전하다.
+    """
+
+    def __init__(self, path: str | Path, max_entries: int = 100_000):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        with self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS embeddings ("
+                "key TEXT PRIMARY KEY, vector BLOB NOT NULL, last_used REAL NOT NULL)"
+            )
+            self._conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_embeddings_last_used "
+                "ON embeddings (last_used)"
+            )
+        # 저장된 항목 수의 상한 (덮어쓴 행도 더하므로 실제보다 클 수 있음)
+        # 상한이 max_entries를 넘을 때만 실제로 세어 정리
+        (self._count,) = self._conn.execute(
+            "SELECT COUNT(*) FROM embeddings"
+        ).fetchone()
+
+    @staticmethod
+    def make_key(model: str, text: str) -> str:
+        return hashlib.sha256(f"{model}\x00{normalize_text(text)}".encode()).hexdigest()
+
+    def get_many(self, keys: list[str]) -> dict[str, list[float]]:
+        if not keys:
+            return {}
+
+        unique_keys = list(dict.fromkeys(keys))
+        found: dict[str, list[float]] = {}
+        with self._lock:
+            # SQLite 바인딩 변수 제한을 피하기 위해 나눠서 조회
+            for i in range(0, len(unique_keys), 500):
+                part = unique_keys[i : i + 500]
+                placeholders = ",".join("?" * len(part))
+                rows = self._conn.execute(
+                    f"SELECT key, vector FROM embeddings WHERE key IN ({placeholders})",
+                    part,
+                ).fetchall()
+                for key, blob in rows:
+                    found[key] = np.frombuffer(blob, dtype=np.float32).tolist()
+
+            if found:
+                now = time.time()
+                with self._conn:
+                    self._conn.executemany(
+                        "UPDATE embeddings SET last_used = ? WHERE key = ?",
+                        [(now, key) for key in found],
+                    )
+
+            hit_count = sum(1 for key in keys if key in found)
+            self.hits += hit_count
+            self.misses += len(keys) - hit_count
+
+        return found
+
+    def put_many(self, items: dict[str, list[float]]) -> None:
+        if not items:
+            return
+
+        now = time.time()
+        rows = [
+            (key, np.asarray(vector, dtype=np.float32).tobytes(), now)
+            for key, vector in items.items()
+        ]
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO embeddings (key, vector, last_used) "
+                "VALUES (?, ?, ?)",
+                rows,
+            )
+            self._evict(len(rows))
+
+    def _evict(self, added: int) -> None:
+        self._count += added
+        if self._count <= self.max_entries:
+            return
+
+        # 다른 프로세스가 추가한 항목도 반영되도록 실제 수를 다시 셈
+        (count,) = self._conn.execute("SELECT COUNT(*) FROM embeddings").fetchone()
+        if count <= self.max_entries:
+            self._count = count
+            return
+
+        # 여유분(10%)까지 한 번에 비워서 가득 찬 뒤에도 매번 세지 않도록 함
+        target = self.max_entries - self.max_entries // 10
+        self._conn.execute(
+            "DELETE FROM embeddings WHERE key IN ("
+            "SELECT key FROM embeddings ORDER BY last_used LIMIT ?)",
+            (count - target,),
+        )
+        self._count = target
+
+    def clear(self) -> None:
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM embeddings")
+            self._count = 0
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self) -> dict[str, int]:
+        with self._lock:
+            (size,) = self._conn.execute("SELECT COUNT(*) FROM embeddings").fetchone()
+            return {"hits": self.hits, "misses": self.misses, "size": size}
+
+
+class CachedEmbeddings(Embeddings):
+    """캐시에 없는 텍스트만 실제 임베딩 모델로 계산하는 래퍼."""
+
+    def __init__(self, embeddings: Embeddings, cache: EmbeddingCache, model: str):
+        self.embeddings = embeddings
+        self.cache = cache
+        self.model = model
+
+    def embed_documents(self, texts: list[str]) -> list[list[float]]:
+        keys = [self.cache.make_key(self.model, text) for text in texts]
+        found = self.cache.get_many(keys)
+
+        # 캐시 미스만 모아서 한 번에 계산 (중복 텍스트는 한 번만)
+        missing = {
+            key: text for key, text in zip(keys, texts, strict=True) if key not in found
+        }
+        if missing:
+            vectors = self.embeddings.embed_documents(list(missing.values()))
+            computed = dict(zip(missing.keys(), vectors, strict=True))
+            self.cache.put_many(computed)
+            found.update(computed)
+
+        return [found[key] for key in keys]
+
+    def embed_query(self, text: str) -> list[float]:
+        key = self.cache.make_key(self.model, text)
+        found = self.cache.get_many([key])
+        if key in found:
+            return found[key]
+
+        vector = self.embeddings.embed_query(text)
+        self.cache.put_many({key: vector})
+        return vector
+
+    async def aembed_documents(self, texts: list[str]) -> list[list[float]]:
+        keys = [self.cache.make_key(self.model, text) for text in texts]
+        # SQLite 조회/저장은 블로킹 I/O이므로 스레드 풀에서 실행
+        found = await asyncio.to_thread(self.cache.get_many, keys)
+
+        missing = {
+            key: text for key, text in zip(keys, texts, strict=True) if key not in found
+        }
+        if missing:
+            vectors = await self.embeddings.aembed_documents(list(missing.values()))
+            computed = dict(zip(missing.keys(), vectors, strict=True))
+            await asyncio.to_thread(self.cache.put_many, computed)
+            found.update(computed)
+
+        return [found[key] for key in keys]
+
+    async def aembed_query(self, text: str) -> list[float]:
+        key = self.cache.make_key(self.model, text)
+        found = await asyncio.to_thread(self.cache.get_many, [key])
+        if key in found:
+            return found[key]
+
+        vector = await self.embeddings.aembed_query(text)
+        await asyncio.to_thread(self.cache.put_many, {key: vector})
+        return vector
+
+
+def truncate_embedding(vector: list[float], dimensions: int | None) -> list[float]:
+    """Matryoshka 방식 차원 축소: 앞쪽 ``dimensions`` 개만 남기고 L2 정규화.
+
+    text-embedding-3 계열은 앞쪽 차원에 정보가 몰려 있어 API의 ``dimensions``
+    인자와 같은 결과를 로컬에서 얻을 수 있다.
+    """
+    if not dimensions or dimensions >= len(vector):
+        return vector
+    v = np.asarray(vector[:dimensions], dtype=np.float32)
+    norm = np.linalg.norm(v)
+    truncated: list[float] = (v / norm if norm else v).tolist()
+    return truncated
+
+
+class TruncatedEmbeddings(Embeddings):
+    """전체 차원 임베딩을 계산(캐시)한 뒤 ``dimensions`` 로 잘라 반환하는 래퍼.
+
+    캐시에는 전체 벡터만 저장하므로 차원을 바꿔도 다시 계산하지 않고,
+    리스코어링용 전체 벡터와 API 호출을 공유한다.
+    """
+
+    def __init__(self, embeddings: Embeddings, dimensions: int):
+        self.embeddings = embeddings
+        self.dimensions = dimensions
+
+    def embed_documents(self, texts: list[str]) -> list[list[float]]:
+        vectors = self.embeddings.embed_documents(texts)
+        return [truncate_embedding(v, self.dimensions) for v in vectors]
+
+    def embed_query(self, text: str) -> list[float]:
+        return truncate_embedding(self.embeddings.embed_query(text), self.dimensions)
+
+    async def aembed_documents(self, texts: list[str]) -> list[list[float]]:
+        vectors = await self.embeddings.aembed_documents(texts)
+        return [truncate_embedding(v, self.dimensions) for v in vectors]
+
+    async def aembed_query(self, text: str) -> list[float]:
+        vector = await self.embeddings.aembed_query(text)
+        return truncate_embedding(vector, self.dimensions)
+
+
+@lru_cache
+def get_embedding_cache() -> EmbeddingCache:
+    settings = get_settings()
+    return EmbeddingCache(
+        settings.embedding_cache_path,
+        max_entries=settings.embedding_cache_max_entries,
+    )
+
+
+@lru_cache
+def create_full_embeddings() -> Embeddings:
+    # 모델 원래 차원의 임베딩 (리스코어링용 전체 벡터)
     settings = get_settings()
     os.environ["OPENAI_API_KEY"] = settings.openai_api_key.get_secret_value()
-    return OpenAIEmbeddings(model=settings.embedding_model)
+    embeddings = OpenAIEmbeddings(model=settings.embedding_model)
+
+    # 쿼리/문서 경로가 같은 캐시를 공유
+    if not settings.embedding_cache_enabled:
+        return embeddings
+    return CachedEmbeddings(embeddings, get_embedding_cache(), settings.embedding_model)
+
+
+@lru_cache
+def create_embeddings() -> Embeddings:
+    # 인덱스에 저장/검색하는 임베딩 (EMBEDDING_DIMENSIONS 설정 시 축소)
+    settings = get_settings()
+    embeddings = create_full_embeddings()
+    if settings.embedding_dimensions:
+        return TruncatedEmbeddings(embeddings, settings.embedding_dimensions)
+    return embeddings
 
 
 def embed_texts(texts: list[str]) -> list[list[float]]:
@@ -0,0 +1,93 @@
+from collections.abc import Sequence
+
+import numpy as np
+
+FUSION_METHODS = ("rrf", "weighted_sum", "combmnz")
+
+
+def fuse(
+    ranked_lists: Sequence[list[dict]],
+    weights: Sequence[float] | None = None,
+    names: Sequence[str] | None = None,
+    method: str = "rrf",
+    k: int | None = None,
+    rrf_k: int = 60,
+) -> list[dict]:
+    """여러 검색기의 순위 리스트를 하나로 결합.
+
+    각 리스트는 점수 내림차순으로 정렬된 ``{"id", "content", "metadata",
+    "score"}`` 딕셔너리 목록이다. 문서 ID를 열 인덱스로 바꿔 (검색기 수 x
+    문서 수) 배열에서 한 번에 점수를 계산한다.
+
+    - ``"rrf"``: ``Σ w / (rrf_k + rank)``
+    - ``"weighted_sum"``: 검색기별 min-max 정규화 점수의 가중합
+    - ``"combmnz"``: ``weighted_sum`` x 해당 문서를 찾은 검색기 수
+
+    결과에는 ``names`` 별 ``{name}_rank`` (1-indexed, 없으면 ``None``)가 붙는다.
+    """
+    if method not in FUSION_METHODS:
+        raise ValueError(f"지원하지 않는 결합 방식입니다: {method}")
+
+    n_legs = len(ranked_lists)
+    weights = weights if weights is not None else [1.0] * n_legs
+    names = names if names is not None else [f"leg{i}" for i in range(n_legs)]
+
+    # 문서 ID -> 열 인덱스 (처음 등장한 결과의 본문/메타데이터 사용)
+    columns: dict[str, int] = {}
+    docs: list[dict] = []
+    for results in ranked_lists:
+        for result in results:
+            if result["id"] not in columns:
+                columns[result["id"]] = len(docs)
+                docs.append(result)
+
+    if not docs:
+        return []
+
+    # 순위(0 = 해당 검색기에 없음)와 원점수 배열
+    ranks = np.zeros((n_legs, len(docs)))
+    raw_scores = np.zeros((n_legs, len(docs)))
+    for leg, results in enumerate(ranked_lists):
+        if not results:
+            continue
+        cols = np.fromiter((columns[r["id"]] for r in results), dtype=np.intp)
+        ranks[leg, cols] = np.arange(1, len(results) + 1)
+        raw_scores[leg, cols] = [r.get("score") or 0.0 for r in results]
+
+    present = ranks > 0
+    leg_weights = np.asarray(weights, dtype=float)[:, None]
+
+    if method == "rrf":
+        fused = (leg_weights * np.where(present, 1.0 / (rrf_k + ranks), 0.0)).sum(0)
+    else:
+        # 검색기별 min-max 정규화 (점수가 모두 같으면 1.0)
+        mins = np.where(present, raw_scores, np.inf).min(axis=1, keepdims=True)
+        maxs = np.where(present, raw_scores, -np.inf).max(axis=1, keepdims=True)
+        mins[~np.isfinite(mins)] = 0.0
+        spans = maxs - mins
+        spans[~np.isfinite(spans) | (spans == 0)] = 1.0
+        normalized = np.where(present, (raw_scores - mins) / spans, 0.0)
+        normalized[present & (maxs == mins)] = 1.0
+
+        fused = (leg_weights * normalized).sum(0)
+        if method == "combmnz":
+            fused *= present.sum(0)
+
+    order = np.argsort(-fused, kind="stable")
+    if k is not None:
+        order = order[:k]
+
+    fused_results = []
+    for col in order:
+        doc = docs[col]
+        result = {
+            "id": doc["id"],
+            "content": doc["content"],
+            "metadata": doc.get("metadata", {}),
+            "score": float(fused[col]),
+        }
+        for leg, name in enumerate(names):
+            result[f"{name}_rank"] = int(ranks[leg, col]) if present[leg, col] else None
+        fused_results.append(result)
+
+    return fused_results
@@ -1,109 +1,881 @@
+import asyncio
+import time
+import weakref
+from collections.abc import Callable, Iterable, Iterator
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from functools import lru_cache
+
 from langchain_core.documents import Document
-from opensearchpy import OpenSearch
+from langchain_core.embeddings import Embeddings
+from opensearchpy import AsyncOpenSearch, OpenSearch, helpers
 
+from rag_agent.backend import get_search_backend, iter_batches
 from rag_agent.config import get_settings
-from rag_agent.embeddings import create_embeddings
+from rag_agent.document import chunk_hash, chunk_id
+from rag_agent.embeddings import (
+    create_embeddings,
+    create_full_embeddings,
+    truncate_embedding,
+)
 
+# 이벤트 루프별 비동기 클라이언트 (aiohttp 세션은 루프에 묶여 있음)
+_async_clients: weakref.WeakKeyDictionary[
+    asyncio.AbstractEventLoop, AsyncOpenSearch
+] = weakref.WeakKeyDictionary()
 
-def create_opensearch_client() -> OpenSearch:
+# 상태 확인 결과 캐시: key -> (확인 시각, 결과)
+_health_cache: dict[str, tuple[float, bool]] = {}
+
+# 인덱스 매핑 캐시: index_name -> (확인 시각, 세대, k-NN 엔진)
+# (매핑 한 번 조회로 캐시 키용 세대와 섹션 필터 방식을 정할 엔진을 함께 읽음)
+_mapping_cache: dict[str, tuple[float, str, str]] = {}
+
+
+def _http_auth() -> tuple[str, str] | None:
     settings = get_settings()
 
     # 인증 설정
-    http_auth = None
     if settings.opensearch_user and settings.opensearch_password:
-        http_auth = (
+        return (
             settings.opensearch_user,
             settings.opensearch_password.get_secret_value(),
         )
+    return None
+
 
+def create_opensearch_client() -> OpenSearch:
+    settings = get_settings()
     return OpenSearch(
         hosts=[{"host": settings.opensearch_host, "port": settings.opensearch_port}],
-        http_auth=http_auth,
+        http_auth=_http_auth(),
+        use_ssl=False,
+        pool_maxsize=settings.opensearch_pool_maxsize,
+        timeout=settings.opensearch_timeout,
+        max_retries=settings.opensearch_max_retries,
+        retry_on_timeout=True,
+    )
+
+
+def create_async_opensearch_client() -> AsyncOpenSearch:
+    settings = get_settings()
+    return AsyncOpenSearch(
+        hosts=[{"host": settings.opensearch_host, "port": settings.opensearch_port}],
+        http_auth=_http_auth(),
         use_ssl=False,
+        maxsize=settings.opensearch_pool_maxsize,
+        timeout=settings.opensearch_timeout,
+        max_retries=settings.opensearch_max_retries,
+        retry_on_timeout=True,
+    )
+
+
+@lru_cache
+def get_opensearch_client() -> OpenSearch:
+    # 프로세스 전체에서 공유하는 클라이언트 (keep-alive 연결 풀 재사용)
+    return create_opensearch_client()
+
+
+def get_async_opensearch_client() -> AsyncOpenSearch:
+    loop = asyncio.get_running_loop()
+    client = _async_clients.get(loop)
+    if client is None:
+        client = create_async_opensearch_client()
+        _async_clients[loop] = client
+    return client
+
+
+async def close_async_opensearch_client() -> None:
+    client = _async_clients.pop(asyncio.get_running_loop(), None)
+    if client is not None:
+        await client.close()
+
+
+def _cached_probe(key: str, probe: Callable[[], bool], ttl: float | None) -> bool:
+    settings = get_settings()
+    ttl = ttl if ttl is not None else settings.opensearch_health_ttl
+
+    cached = _health_cache.get(key)
+    if cached and time.monotonic() - cached[0] < ttl:
+        return cached[1]
+
+    try:
+        result = bool(probe())
+    except Exception:
+        result = False
+
+    _health_cache[key] = (time.monotonic(), result)
+    return result
+
+
+def check_cluster_health(ttl: float | None = None) -> bool:
+    return get_search_backend().healthy(ttl)
+
+
+def check_index_exists(index_name: str | None = None, ttl: float | None = None) -> bool:
+    return get_search_backend(index_name=index_name).exists(ttl)
+
+
+def invalidate_health_cache(index_name: str | None = None) -> None:
+    if index_name is None:
+        _health_cache.clear()
+    else:
+        _health_cache.pop(f"index:{index_name}", None)
+
+
+def get_index_generation(
+    index_name: str | None = None, ttl: float | None = None
+) -> str:
+    """인덱스 내용이 바뀔 때마다 갱신되는 세대 값 (매핑 ``_meta`` 에 저장).
+
+    답변/검색 캐시의 키에 포함해 재인덱싱 시 이전 결과를 무효화한다.
+    """
+    return get_search_backend(index_name=index_name).generation(ttl)
+
+
+def _parse_index_mapping(mappings: dict) -> tuple[str, str]:
+    # 별칭이면 실제 인덱스 이름이 키가 됨
+    mapping = next(iter(mappings.values()))["mappings"]
+    generation = str(mapping.get("_meta", {}).get("generation", "0"))
+    return generation, _mapping_engine(mapping)
+
+
+def _cached_mapping(index_name: str, ttl: float | None) -> tuple[str, str] | None:
+    ttl = ttl if ttl is not None else get_settings().opensearch_health_ttl
+    cached = _mapping_cache.get(index_name)
+    if cached and time.monotonic() - cached[0] < ttl:
+        return cached[1], cached[2]
+    return None
+
+
+def _store_mapping(index_name: str, mappings: dict | None) -> tuple[str, str]:
+    try:
+        generation, engine = _parse_index_mapping(mappings or {})
+    except Exception:
+        # 인덱스가 없거나 조회 실패: 엔진은 현재 설정으로 추정
+        generation, engine = "0", resolve_index_profile()["engine"]
+    _mapping_cache[index_name] = (time.monotonic(), generation, engine)
+    return generation, engine
+
+
+def _read_index_mapping(
+    client: OpenSearch, index_name: str, ttl: float | None = None
+) -> tuple[str, str]:
+    """인덱스 매핑의 (세대, k-NN 엔진). ``ttl`` 동안 캐시한다."""
+    cached = _cached_mapping(index_name, ttl)
+    if cached is not None:
+        return cached
+    try:
+        mappings = client.indices.get_mapping(index=index_name)
+    except Exception:
+        mappings = None
+    return _store_mapping(index_name, mappings)
+
+
+async def _aread_index_mapping(
+    client: AsyncOpenSearch, index_name: str, ttl: float | None = None
+) -> tuple[str, str]:
+    cached = _cached_mapping(index_name, ttl)
+    if cached is not None:
+        return cached
+    try:
+        mappings = await client.indices.get_mapping(index=index_name)
+    except Exception:
+        mappings = None
+    return _store_mapping(index_name, mappings)
+
+
+def bump_index_generation(
+    client: OpenSearch | None = None, index_name: str | None = None
+) -> str:
+    settings = get_settings()
+    client = client or get_opensearch_client()
+    index_name = index_name or settings.index_name
+
+    generation = str(time.time_ns())
+    client.indices.put_mapping(
+        index=index_name, body={"_meta": {"generation": generation}}
+    )
+    cached = _mapping_cache.get(index_name)
+    if cached:
+        _mapping_cache[index_name] = (time.monotonic(), generation, cached[2])
+    return generation
+
+
+# HNSW 인덱스 프로필 (OpenSearch k-NN 기본값: m=16, ef_construction=100, ef_search=100)
+# - latency: 그래프를 작게 만들고 탐색 폭을 줄여 지연 시간 우선
+# - recall : 연결 수와 탐색 폭을 늘려 재현율 우선 (인덱싱이 느리고 메모리 증가)
+# - memory : JVM 힙 밖 네이티브 메모리를 쓰지 않는 lucene 엔진 + 작은 그래프
+# ef_search는 nmslib에서 동적 인덱스 설정, faiss에서 매핑(생성 시 고정)으로 적용되며
+# lucene은 지원하지 않음 (탐색 폭 = k)
+INDEX_PROFILES: dict[str, dict] = {
+    "default": {"engine": "nmslib", "m": 16, "ef_construction": 100, "ef_search": 100},
+    "latency": {"engine": "faiss", "m": 16, "ef_construction": 128, "ef_search": 32},
+    "recall": {"engine": "faiss", "m": 32, "ef_construction": 512, "ef_search": 256},
+    "memory": {"engine": "lucene", "m": 8, "ef_construction": 64, "ef_search": None},
+}
+
+
+# 한국어 분석 서브필드 (KOREAN_ANALYZER). 기본 standard 분석기는 공백 단위로
+# 토큰화하므로 "연차휴가"가 "연차"와 일치하지 않음
+# - ngram: 2~3글자 n-gram (플러그인 불필요, 색인 크기 증가)
+# - nori : 형태소 분석 + 복합어 분해 (analysis-nori 플러그인 필요)
+TEXT_ANALYZERS: dict[str, dict] = {
+    "ngram": {
+        "tokenizer": {
+            "korean_ngram": {
+                "type": "ngram",
+                "min_gram": 2,
+                "max_gram": 3,
+                "token_chars": ["letter", "digit"],
+            }
+        },
+        "analyzer": {
+            "korean_ngram": {
+                "type": "custom",
+                "tokenizer": "korean_ngram",
+                "filter": ["lowercase"],
+            }
+        },
+    },
+    "nori": {
+        "tokenizer": {
+            # mixed: 복합어 원형과 분해된 형태소를 모두 색인
+            "korean_nori": {"type": "nori_tokenizer", "decompound_mode": "mixed"}
+        },
+        "analyzer": {
+            "korean_nori": {
+                "type": "custom",
+                "tokenizer": "korean_nori",
+                # 조사/어미 제거, 한자 -> 한글 읽기
+                "filter": ["nori_part_of_speech", "nori_readingform", "lowercase"],
+            }
+        },
+    },
+}
+
+
+def resolve_text_analyzer(analyzer: str | None = None) -> str:
+    analyzer = analyzer or get_settings().korean_analyzer
+    if analyzer != "standard" and analyzer not in TEXT_ANALYZERS:
+        raise ValueError(f"알 수 없는 한국어 분석기입니다: {analyzer}")
+    return analyzer
+
+
+# 분석기별로 필요한 OpenSearch 플러그인
+ANALYZER_PLUGINS = {"nori": "analysis-nori"}
+
+
+def _check_analyzer_plugin(client: OpenSearch, analyzer: str) -> None:
+    # 플러그인이 없으면 인덱스 생성이 알 수 없는 토크나이저 400 오류로 실패하므로 먼저 확인
+    plugin = ANALYZER_PLUGINS.get(analyzer)
+    if plugin is None:
+        return
+    installed = client.cat.plugins(format="json", h="component")
+    if not any(p.get("component") == plugin for p in installed):
+        raise RuntimeError(
+            f"KOREAN_ANALYZER={analyzer} 에는 OpenSearch {plugin} 플러그인이 "
+            f"필요합니다. 모든 노드에 설치하거나 (docker-compose.yml 주석 참고) "
+            f"KOREAN_ANALYZER=ngram 을 사용하세요"
+        )
+
+
+def _text_mapping(analyzer: str, **fields: dict) -> dict:
+    # 기본 text 필드 + 분석기별 서브필드 (예: content.ngram)
+    if analyzer in TEXT_ANALYZERS:
+        fields[analyzer] = {"type": "text", "analyzer": f"korean_{analyzer}"}
+    mapping: dict = {"type": "text"}
+    if fields:
+        mapping["fields"] = fields
+    return mapping
+
+
+def resolve_index_profile(profile: str | None = None, **overrides) -> dict:
+    """프로필 값에 설정(``HNSW_*``, ``INDEX_*``)과 인자의 개별 값을 덮어쓴다."""
+    settings = get_settings()
+    profile = profile or settings.index_profile
+    if profile not in INDEX_PROFILES:
+        raise ValueError(f"알 수 없는 인덱스 프로필입니다: {profile}")
+
+    resolved = {
+        "encoder": None,
+        "shards": None,
+        "replicas": None,
+        "refresh_interval": None,
+        **INDEX_PROFILES[profile],
+    }
+    configured = {
+        "encoder": settings.vector_encoder,
+        "engine": settings.hnsw_engine,
+        "m": settings.hnsw_m,
+        "ef_construction": settings.hnsw_ef_construction,
+        "ef_search": settings.hnsw_ef_search,
+        "shards": settings.index_shards,
+        "replicas": settings.index_replicas,
+        "refresh_interval": settings.index_refresh_interval,
+    }
+    explicit = {**configured, **overrides}
+    for key, value in explicit.items():
+        if value is not None:
+            resolved[key] = value
+
+    if resolved["engine"] == "lucene":
+        # 적용되지 않는 값을 조용히 무시하지 않음 (프로필 기본값은 제거)
+        if explicit["ef_search"] is not None:
+            raise ValueError(
+                "lucene 엔진은 ef_search를 지원하지 않습니다 (탐색 폭은 k 값으로 결정)"
+            )
+        resolved["ef_search"] = None
+
+    return resolved
+
+
+def _space_type(engine: str) -> str:
+    # faiss는 cosinesimil 미지원(2.19 미만) -> 정규화된 임베딩이므로 내적으로 동일
+    return "innerproduct" if engine == "faiss" else "cosinesimil"
+
+
+def _knn_method(profile: dict) -> dict:
+    parameters: dict = {
+        "m": profile["m"],
+        "ef_construction": profile["ef_construction"],
+    }
+    # faiss는 인덱스 설정(knn.algo_param.ef_search)을 읽지 않고 매핑 값을 사용
+    if profile["engine"] == "faiss" and profile["ef_search"] is not None:
+        parameters["ef_search"] = profile["ef_search"]
+
+    if profile["encoder"] == "sq_fp16":
+        # float32 -> fp16 스칼라 양자화 (메모리 1/2, faiss + OpenSearch 2.13 이상)
+        if profile["engine"] != "faiss":
+            raise ValueError("sq_fp16 인코더는 faiss 엔진에서만 사용할 수 있습니다")
+        parameters["encoder"] = {"name": "sq", "parameters": {"type": "fp16"}}
+
+    return {
+        "name": "hnsw",
+        "space_type": _space_type(profile["engine"]),
+        "engine": profile["engine"],
+        "parameters": parameters,
+    }
+
+
+def _embedding_mapping(profile: dict, vector_dimension: int) -> dict:
+    if profile["encoder"] == "pq":
+        # PQ는 학습된 모델(train_pq_model)이 차원/방법을 결정
+        model_id = get_settings().pq_model_id
+        if not model_id:
+            raise ValueError("pq 인코더를 쓰려면 PQ_MODEL_ID를 설정하세요")
+        return {"type": "knn_vector", "model_id": model_id}
+
+    return {
+        "type": "knn_vector",
+        "dimension": vector_dimension,
+        "method": _knn_method(profile),
+    }
+
+
+def _index_settings(profile: dict) -> dict:
+    index_settings: dict = {"knn": True}  # k-NN 검색 활성화
+
+    # 인덱스 단위 ef_search 설정은 nmslib만 읽음 (faiss는 _knn_method에서 지정)
+    if profile["engine"] == "nmslib" and profile["ef_search"] is not None:
+        index_settings["knn.algo_param.ef_search"] = profile["ef_search"]
+    if profile["shards"] is not None:
+        index_settings["number_of_shards"] = profile["shards"]
+    if profile["replicas"] is not None:
+        index_settings["number_of_replicas"] = profile["replicas"]
+    if profile["refresh_interval"] is not None:
+        index_settings["refresh_interval"] = profile["refresh_interval"]
+
+    return index_settings
+
+
+def _mapping_engine(mapping: dict) -> str:
+    # 인덱스를 만들 때의 엔진 (현재 설정과 다를 수 있음)
+    embedding = mapping.get("properties", {}).get("embedding", {})
+    if "model_id" in embedding:
+        return "faiss"  # PQ 모델 인덱스
+    return str(embedding.get("method", {}).get("engine", "nmslib"))
+
+
+def set_ef_search(
+    ef_search: int, client: OpenSearch | None = None, index_name: str | None = None
+) -> None:
+    """nmslib 인덱스의 ef_search를 재인덱싱 없이 변경.
+
+    faiss 인덱스는 ef_search가 매핑에 고정되므로 ``create_index(ef_search=...)``
+    로 다시 만들어야 하고, lucene 엔진은 ef_search를 지원하지 않는다.
+    """
+    client = client or get_opensearch_client()
+    index_name = index_name or get_settings().index_name
+
+    mappings = client.indices.get_mapping(index=index_name)
+    engine = _mapping_engine(next(iter(mappings.values()))["mappings"])
+    if engine == "faiss":
+        raise ValueError(
+            "faiss 인덱스의 ef_search는 생성 시 고정됩니다. "
+            "create_index(ef_search=...) 또는 rebuild_index로 다시 만드세요"
+        )
+    if engine != "nmslib":
+        raise ValueError(f"{engine} 엔진은 ef_search를 지원하지 않습니다")
+
+    client.indices.put_settings(
+        index=index_name,
+        body={"index": {"knn.algo_param.ef_search": ef_search}},
+    )
+
+
+def train_pq_model(
+    model_id: str,
+    training_index: str | None = None,
+    code_count: int | None = None,
+    client: OpenSearch | None = None,
+    profile: str | None = None,
+    timeout: float = 600.0,
+) -> dict:
+    """기존 float 인덱스의 벡터로 faiss PQ 모델을 학습.
+
+    ``code_count`` (서브벡터 수, 차원의 약수)가 작을수록 압축률이 높다.
+    기본값은 차원 / 8 (1536차원 -> 192바이트, float32 대비 32배 압축).
+    학습에는 최소 256개 이상의 벡터가 필요하다. 학습이 끝나면
+    ``PQ_MODEL_ID`` 와 ``VECTOR_ENCODER=pq`` 로 새 인덱스를 만든다.
+    """
+    settings = get_settings()
+    client = client or get_opensearch_client()
+    training_index = training_index or settings.index_name
+    dimension = settings.embedding_dimensions or settings.vector_dimension
+    index_profile = resolve_index_profile(profile, engine="faiss")
+
+    client.transport.perform_request(
+        "POST",
+        f"/_plugins/_knn/models/{model_id}/_train",
+        body={
+            "training_index": training_index,
+            "training_field": "embedding",
+            "dimension": dimension,
+            "description": f"RAG PQ 모델 ({training_index})",
+            "method": {
+                "name": "hnsw",
+                "engine": "faiss",
+                "space_type": _space_type("faiss"),
+                "parameters": {
+                    "m": index_profile["m"],
+                    "ef_construction": index_profile["ef_construction"],
+                    # PQ 인덱스는 모델의 ef_search를 사용
+                    "ef_search": index_profile["ef_search"] or 100,
+                    "encoder": {
+                        "name": "pq",
+                        # HNSW + PQ는 code_size 8만 지원
+                        "parameters": {
+                            "m": code_count or dimension // 8,
+                            "code_size": 8,
+                        },
+                    },
+                },
+            },
+        },
     )
 
+    # 학습 완료 대기 (state: training -> created/failed)
+    deadline = time.monotonic() + timeout
+    while True:
+        model: dict = client.transport.perform_request(
+            "GET",
+            f"/_plugins/_knn/models/{model_id}",
+            params={"filter_path": "state,error"},
+        )
+        if model.get("state") != "training" or time.monotonic() > deadline:
+            return model
+        time.sleep(2)
+
 
 def create_index(
     client: OpenSearch | None = None,
     index_name: str | None = None,
-    vector_dimension: int = 1536,
+    vector_dimension: int | None = None,
+    recreate: bool = True,
+    profile: str | None = None,
+    **overrides,
+) -> None:
+    """RAG 인덱스 생성.
+
+    HNSW 파라미터와 샤드/레플리카/refresh 설정은 ``profile``
+    (``INDEX_PROFILES``, 기본값 ``settings.index_profile``)에서 가져오며,
+    ``m=32`` 처럼 키워드 인자로 개별 값을 덮어쓸 수 있다.
+    """
+    get_search_backend(client, index_name).create_index(
+        recreate, profile, vector_dimension, **overrides
+    )
+
+
+def _create_index(
+    client: OpenSearch,
+    index_name: str,
+    vector_dimension: int | None = None,
+    recreate: bool = True,
+    profile: str | None = None,
+    **overrides,
 ) -> None:
     settings = get_settings()
-    client = client or create_opensearch_client()
-    index_name = index_name or settings.index_name
+    vector_dimension = (
+        vector_dimension or settings.embedding_dimensions or settings.vector_dimension
+    )
+    index_profile = resolve_index_profile(profile, **overrides)
+    analyzer = resolve_text_analyzer()
+    _check_analyzer_plugin(client, analyzer)
 
     # 인덱스 설정
-    index_body = {
-        "settings": {
-            "index": {
-                "knn": True,  # k-NN 검색 활성화
-            }
-        },
+    index_body: dict = {
+        "settings": {"index": _index_settings(index_profile)},
         "mappings": {
+            "_meta": {"generation": str(time.time_ns())},
             "properties": {
-                "content": {"type": "text"},  # 문서 내용 (키워드 검색용)
-                "embedding": {
-                    "type": "knn_vector",
-                    "dimension": vector_dimension,
-                    "method": {
-                        "name": "hnsw",
-                        "space_type": "cosinesimil",  # 코사인 유사도
-                        "engine": "nmslib",
-                    },
-                },
+                # 문서 내용 (키워드 검색용)
+                "content": _text_mapping(analyzer),
+                # 제목 경로 (키워드 검색 가중치 + keyword 접두어로 섹션 필터)
+                "heading_path": _text_mapping(
+                    analyzer, keyword={"type": "keyword", "ignore_above": 512}
+                ),
+                "embedding": _embedding_mapping(index_profile, vector_dimension),
                 "metadata": {"type": "object"},  # 추가 메타데이터
-            }
+            },
         },
     }
 
-    # 기존 인덱스가 있으면 삭제 후 생성
+    if analyzer in TEXT_ANALYZERS:
+        index_body["settings"]["analysis"] = TEXT_ANALYZERS[analyzer]
+
+    # 리스코어링용 전체 정밀도 벡터: _source에만 저장 (색인/그래프/힙 사용 없음)
+    if settings.rescore_full_vectors:
+        index_body["mappings"]["properties"]["embedding_full"] = {
+            "type": "object",
+            "enabled": False,
+        }
+
+    # 기존 인덱스가 있으면 삭제 후 생성 (recreate=False면 그대로 유지)
+    # 무중단 재구축은 rebuild_index 사용
     if client.indices.exists(index=index_name):
-        client.indices.delete(index=index_name)
+        if not recreate:
+            return
+        # 별칭이면 연결된 실제 인덱스를 삭제
+        client.indices.delete(index=_alias_targets(client, index_name) or index_name)
 
     client.indices.create(index=index_name, body=index_body)
+    invalidate_health_cache(index_name)
+    _mapping_cache.pop(index_name, None)
 
     if settings.debug:
         print(f"인덱스 '{index_name}' 생성 완료")
 
 
-def index_documents(
-    documents: list[Document],
+def _alias_targets(client: OpenSearch, alias: str) -> list[str]:
+    # 별칭이 가리키는 실제 인덱스 목록 (별칭이 아니면 빈 목록)
+    if not client.indices.exists_alias(name=alias):
+        return []
+    return sorted(client.indices.get_alias(name=alias))
+
+
+def _next_index_version(client: OpenSearch, alias: str) -> int:
+    versions = [0]
+    for name in client.indices.get(index=f"{alias}-v*", ignore_unavailable=True):
+        suffix = name.removeprefix(f"{alias}-v")
+        if suffix.isdigit():
+            versions.append(int(suffix))
+    return max(versions) + 1
+
+
+def rebuild_index(
+    documents: Iterable[Document],
+    alias: str | None = None,
     client: OpenSearch | None = None,
-    index_name: str | None = None,
+    profile: str | None = None,
+    keep_versions: int | None = None,
+    **overrides,
+) -> dict:
+    """새 버전 인덱스에 문서를 인덱싱한 뒤 별칭을 원자적으로 교체.
+
+    ``{alias}-v{n}`` 인덱스를 refresh 중지 + 레플리카 0 설정으로 만들어
+    인덱싱하고, 원래 설정을 복원한 뒤 ``alias`` 를 새 인덱스로 옮긴다.
+    검색은 교체 직전까지 이전 인덱스를 사용하므로 중단되지 않는다.
+    이전 버전은 최근 ``keep_versions`` 개(1 이상, 교체 직전 인덱스로 진행 중인
+    검색 보호)만 남기고 삭제한다. 같은 이름의 일반 인덱스(별칭 도입 전)는
+    교체와 함께 삭제한다. 교체 전에 실패하면 새 인덱스를 지우고 별칭은 그대로 둔다.
+
+    로컬 백엔드에서는 모든 문서를 임베딩한 뒤 파일을 한 번에 교체한다.
+    """
+    return get_search_backend(client, alias).rebuild_index(
+        documents, profile, keep_versions, **overrides
+    )
+
+
+def _rebuild_index(
+    client: OpenSearch,
+    alias: str,
+    documents: Iterable[Document],
+    profile: str | None = None,
+    keep_versions: int | None = None,
+    **overrides,
+) -> dict:
+    settings = get_settings()
+    keep_versions = (
+        keep_versions if keep_versions is not None else settings.index_keep_versions
+    )
+    if keep_versions < 1:
+        # 교체 직후 이전 인덱스를 지우면 그 인덱스로 진행 중인 검색이 실패함
+        raise ValueError(f"keep_versions는 1 이상이어야 합니다: {keep_versions}")
+    index_profile = resolve_index_profile(profile, **overrides)
+
+    previous = _alias_targets(client, alias)
+    legacy = not previous and client.indices.exists(index=alias)
+    new_index = f"{alias}-v{_next_index_version(client, alias)}"
+
+    # 1~4 중 실패하면 새 인덱스만 지우고 별칭은 그대로 (교체는 원자적)
+    try:
+        # 1. 벌크 인덱싱용 설정으로 생성 (refresh 중지, 레플리카 0)
+        _create_index(
+            client,
+            new_index,
+            profile=profile,
+            **{**overrides, "refresh_interval": "-1", "replicas": 0},
+        )
+
+        # 2. 인덱싱
+        indexed = _index_documents(client, new_index, documents)
+
+        # 3. 원래 설정 복원 (None이면 클러스터 기본값) 후 샤드 할당 대기
+        client.indices.put_settings(
+            index=new_index,
+            body={
+                "index": {
+                    "refresh_interval": index_profile["refresh_interval"],
+                    "number_of_replicas": index_profile["replicas"],
+                }
+            },
+        )
+        client.indices.refresh(index=new_index)
+        health = client.cluster.health(
+            index=new_index,
+            wait_for_status="yellow",
+            timeout=f"{settings.opensearch_timeout}s",
+        )
+        if health.get("timed_out"):
+            raise TimeoutError(f"새 인덱스 '{new_index}'의 샤드 할당 대기 시간 초과")
+
+        # 4. 별칭 원자적 교체
+        actions: list[dict] = [{"add": {"index": new_index, "alias": alias}}]
+        if legacy:
+            actions.insert(0, {"remove_index": {"index": alias}})
+        actions += [{"remove": {"index": old, "alias": alias}} for old in previous]
+        client.indices.update_aliases(body={"actions": actions})
+    except BaseException:
+        client.indices.delete(index=new_index, ignore_unavailable=True)
+        raise
+
+    invalidate_health_cache(alias)
+    _mapping_cache.pop(alias, None)
+
+    # 5. 오래된 버전 정리 (롤백용으로 최근 keep_versions개 유지)
+    old_versions = [
+        name
+        for name in client.indices.get(index=f"{alias}-v*", ignore_unavailable=True)
+        if name != new_index and name.removeprefix(f"{alias}-v").isdigit()
+    ]
+    old_versions.sort(key=lambda name: int(name.removeprefix(f"{alias}-v")))
+    deleted = old_versions[: max(len(old_versions) - keep_versions, 0)]
+    if deleted:
+        client.indices.delete(index=",".join(deleted))
+
+    if settings.debug:
+        print(f"별칭 '{alias}' -> '{new_index}' 교체 완료 (삭제: {deleted})")
+
+    return {
+        "index": new_index,
+        "previous": previous,
+        "deleted": deleted,
+        "indexed": indexed,
+    }
+
+
+def _index_batch(
+    client: OpenSearch,
+    index_name: str,
+    embeddings: Embeddings,
+    batch: list[Document],
+    max_retries: int,
+    store_full: bool = False,
 ) -> int:
     settings = get_settings()
-    client = client or create_opensearch_client()
-    index_name = index_name or settings.index_name
-    embeddings = create_embeddings()
+    texts = [doc.page_content for doc in batch]
 
-    # 문서 텍스트를 벡터로 변환
-    texts = [doc.page_content for doc in documents]
-    vectors = embeddings.embed_documents(texts)
+    # 배치 단위로 임베딩 (전체 코퍼스를 메모리에 올리지 않음)
+    full_vectors: list[list[float]] | list[None]
+    if store_full:
+        # 전체 벡터 한 번 계산 -> 축소 벡터는 로컬에서 잘라냄
+        full_vectors = create_full_embeddings().embed_documents(texts)
+        vectors = [
+            truncate_embedding(v, settings.embedding_dimensions) for v in full_vectors
+        ]
+    else:
+        full_vectors = [None] * len(batch)
+        vectors = embeddings.embed_documents(texts)
 
-    # OpenSearch에 문서 저장
-    for i, (doc, vector) in enumerate(zip(documents, vectors)):
-        document = {
+    actions = []
+    for doc, vector, full_vector in zip(batch, vectors, full_vectors, strict=True):
+        source = {
             "content": doc.page_content,
+            "heading_path": doc.metadata.get("heading_path", ""),
             "embedding": vector,
             "metadata": doc.metadata,
         }
-        client.index(index=index_name, body=document, id=str(i))
+        if full_vector is not None:
+            source["embedding_full"] = full_vector
+        actions.append({"_index": index_name, "_id": chunk_id(doc), "_source": source})
+
+    # _bulk API로 한 번에 저장 (429 응답은 지수 백오프로 재시도)
+    success, _ = helpers.bulk(
+        client,
+        actions,
+        chunk_size=len(actions),
+        max_retries=max_retries,
+        initial_backoff=1,
+        max_backoff=30,
+    )
+    return int(success)
+
+
+def index_documents(
+    documents: Iterable[Document],
+    client: OpenSearch | None = None,
+    index_name: str | None = None,
+    batch_size: int | None = None,
+    concurrency: int | None = None,
+) -> int:
+    backend = get_search_backend(client, index_name)
+    return backend.index_documents(documents, batch_size, concurrency)
+
+
+def _index_documents(
+    client: OpenSearch,
+    index_name: str,
+    documents: Iterable[Document],
+    batch_size: int | None = None,
+    concurrency: int | None = None,
+) -> int:
+    settings = get_settings()
+    batch_size = batch_size or settings.index_batch_size
+    concurrency = concurrency or settings.index_concurrency
+    embeddings = create_embeddings()
+
+    # 배치를 스트리밍으로 처리하며 동시에 처리 중인 배치 수를 제한
+    total = 0
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        pending: set[Future[int]] = set()
+        for batch in iter_batches(documents, batch_size):
+            if len(pending) >= concurrency:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                total += sum(future.result() for future in done)
+
+            pending.add(
+                executor.submit(
+                    _index_batch,
+                    client,
+                    index_name,
+                    embeddings,
+                    batch,
+                    settings.index_max_retries,
+                    settings.rescore_full_vectors,
+                )
+            )
+
+        total += sum(future.result() for future in wait(pending).done)
 
     # 인덱스 새로고침 (검색 가능하도록)
     client.indices.refresh(index=index_name)
 
+    # 내용이 바뀌었으면 세대 갱신 (캐시 무효화)
+    if total:
+        bump_index_generation(client, index_name)
+
     if settings.debug:
-        print(f"{len(documents)}개 문서 인덱싱 완료")
+        print(f"{total}개 문서 인덱싱 완료")
+
+    return total
 
-    return len(documents)
+
+def sync_documents(
+    documents: Iterable[Document],
+    client: OpenSearch | None = None,
+    index_name: str | None = None,
+) -> dict[str, int]:
+    return get_search_backend(client, index_name).sync_documents(documents)
+
+
+def _sync_documents(
+    client: OpenSearch, index_name: str, documents: Iterable[Document]
+) -> dict[str, int]:
+    settings = get_settings()
+
+    # 인덱스가 없을 때만 생성 (기존 데이터 유지)
+    _create_index(client, index_name, recreate=False)
+
+    # 이미 저장된 문서 ID -> 내용 해시 조회 (본문/벡터는 가져오지 않음)
+    existing = {
+        hit["_id"]: hit.get("_source", {}).get("metadata", {}).get("content_hash")
+        for hit in helpers.scan(
+            client,
+            index=index_name,
+            query={"query": {"match_all": {}}},
+            _source=["metadata.content_hash"],
+        )
+    }
+
+    # 새 문서와 내용/위치가 바뀐 문서만 임베딩/저장 (같은 ID는 덮어씀)
+    seen_ids: set[str] = set()
+    counts = {"added": 0, "updated": 0}
+
+    def changed_documents() -> Iterator[Document]:
+        for doc in documents:
+            doc_id = chunk_id(doc)
+            if doc_id in seen_ids:
+                continue
+            seen_ids.add(doc_id)
+            if doc_id not in existing:
+                counts["added"] += 1
+                yield doc
+            elif existing[doc_id] != chunk_hash(doc):
+                counts["updated"] += 1
+                yield doc
+
+    _index_documents(client, index_name, changed_documents())
+
+    # 더 이상 존재하지 않는 문서 삭제
+    stale_ids = existing.keys() - seen_ids
+    if stale_ids:
+        helpers.bulk(
+            client,
+            (
+                {"_op_type": "delete", "_index": index_name, "_id": doc_id}
+                for doc_id in stale_ids
+            ),
+            chunk_size=settings.index_batch_size,
+            max_retries=settings.index_max_retries,
+        )
+        client.indices.refresh(index=index_name)
+        bump_index_generation(client, index_name)
+
+    stats = {
+        **counts,
+        "deleted": len(stale_ids),
+        "unchanged": len(seen_ids) - counts["added"] - counts["updated"],
+    }
+
+    if settings.debug:
+        print(f"증분 동기화 완료: {stats}")
+
+    return stats
 
 
 def setup_sample_index() -> int:
     from rag_agent.document import get_sample_chunks
 
-    # 인덱스 생성
-    create_index()
-
-    # 샘플 문서 인덱싱
+    # 새 버전 인덱스에 샘플 문서 인덱싱 후 별칭 교체 (검색 중단 없음)
     chunks = get_sample_chunks()
-    return index_documents(chunks)
+    return int(rebuild_index(chunks)["indexed"])
@@ -0,0 +1,200 @@
+import logging
+import os
+from collections import deque
+from collections.abc import Iterable, Iterator
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from html.parser import HTMLParser
+from pathlib import Path
+
+from langchain_core.documents import Document
+from opensearchpy import OpenSearch
+
+from rag_agent.config import get_settings
+from rag_agent.document import chunk_documents
+from rag_agent.indexer import create_index, index_documents
+
+logger = logging.getLogger(__name__)
+
+# 확장자별 로더가 지원하는 파일
+DEFAULT_PATTERNS = ("**/*.md", "**/*.txt", "**/*.html", "**/*.htm", "**/*.pdf")
+
+# 순서대로 시도 (utf-8-sig는 BOM 유무 모두 처리, cp949는 euc-kr의 상위 집합)
+ENCODINGS = ("utf-8-sig", "cp949")
+
+
+def read_text(path: Path) -> str:
+    data = path.read_bytes()
+    for encoding in ENCODINGS:
+        try:
+            return data.decode(encoding)
+        except UnicodeDecodeError:
+            continue
+    # 어떤 인코딩으로도 안 되면 깨진 문자만 대체
+    return data.decode("utf-8", errors="replace")
+
+
+class _HTMLTextExtractor(HTMLParser):
+    # 본문 텍스트만 추출 (script/style 제외, 블록 태그는 줄바꿈)
+    SKIP_TAGS = {"script", "style", "noscript", "head"}
+    BLOCK_TAGS = {"p", "div", "br", "li", "tr", "section", "article"}
+    HEADING_TAGS = {"h1": "#", "h2": "##", "h3": "###", "h4": "####"}
+
+    def __init__(self):
+        super().__init__()
+        self.parts: list[str] = []
+        self._skip = 0
+
+    def handle_starttag(self, tag, attrs):
+        if tag in self.SKIP_TAGS:
+            self._skip += 1
+        elif tag in self.HEADING_TAGS:
+            # 제목은 마크다운 형식으로 바꿔 청킹 구분자를 그대로 활용
+            self.parts.append(f"\n{self.HEADING_TAGS[tag]} ")
+        elif tag in self.BLOCK_TAGS:
+            self.parts.append("\n")
+
+    def handle_endtag(self, tag):
+        if tag in self.SKIP_TAGS:
+            self._skip = max(self._skip - 1, 0)
+        elif tag in self.HEADING_TAGS or tag in self.BLOCK_TAGS:
+            self.parts.append("\n")
+
+    def handle_data(self, data):
+        if not self._skip:
+            self.parts.append(data)
+
+    def text(self) -> str:
+        lines = (line.strip() for line in "".join(self.parts).splitlines())
+        return "\n".join(line for line in lines if line)
+
+
+def _load_html(path: Path) -> str:
+    parser = _HTMLTextExtractor()
+    parser.feed(read_text(path))
+    parser.close()
+    return parser.text()
+
+
+def _load_pdf(path: Path) -> str:
+    try:
+        from pypdf import PdfReader
+    except ImportError as e:
+        raise ImportError("PDF 로딩에는 pypdf가 필요합니다: uv sync --extra pdf") from e
+
+    reader = PdfReader(str(path))
+    return "\n\n".join(page.extract_text() or "" for page in reader.pages)
+
+
+def load_file(path: str | Path, root: str | Path | None = None) -> Document:
+    path = Path(path)
+    suffix = path.suffix.lower()
+
+    if suffix in (".html", ".htm"):
+        content = _load_html(path)
+    elif suffix == ".pdf":
+        content = _load_pdf(path)
+    else:
+        # .md / .txt 및 기타 텍스트 파일
+        content = read_text(path)
+
+    # 출처: 루트 기준 상대 경로 (다른 폴더의 같은 파일명 구분)
+    source = path.relative_to(root).as_posix() if root else path.name
+    return Document(page_content=content, metadata={"source": source})
+
+
+def iter_files(
+    directory: str | Path, patterns: Iterable[str] = DEFAULT_PATTERNS
+) -> Iterator[Path]:
+    directory = Path(directory)
+    seen: set[Path] = set()
+    for pattern in patterns:
+        for path in sorted(directory.glob(pattern)):
+            if path.is_file() and path not in seen:
+                seen.add(path)
+                yield path
+
+
+def _load_and_chunk(
+    path: str, root: str, chunk_size: int, chunk_overlap: int, by_heading: bool
+) -> list[Document]:
+    # 워커 프로세스에서 실행: 파일 하나를 읽어 청크로 분할
+    doc = load_file(path, root)
+    if not doc.page_content.strip():
+        return []
+    return chunk_documents([doc], chunk_size, chunk_overlap, by_heading)
+
+
+def _chunks_or_skip(path: Path, future: Future[list[Document]]) -> list[Document]:
+    # 읽을 수 없거나 손상된 파일 하나 때문에 전체 인덱싱이 중단되지 않도록 건너뜀
+    try:
+        return future.result()
+    except BrokenProcessPool:
+        # 워커 프로세스 자체가 죽은 경우는 파일 문제가 아니므로 중단
+        raise
+    except Exception as e:
+        logger.warning("파일을 건너뜁니다: %s (%s: %s)", path, type(e).__name__, e)
+        return []
+
+
+def iter_chunks(
+    directory: str | Path,
+    patterns: Iterable[str] = DEFAULT_PATTERNS,
+    workers: int | None = None,
+    chunk_size: int | None = None,
+    chunk_overlap: int | None = None,
+) -> Iterator[Document]:
+    """디렉터리의 문서를 프로세스 풀에서 읽고 청킹해 순서대로 내보낸다.
+
+    처리 중인 파일 수를 워커 수의 2배로 제한하므로 코퍼스 크기와 관계없이
+    메모리 사용량이 일정하다. 결과는 ``index_documents`` 에 바로 넘길 수 있다.
+    읽기/파싱에 실패한 파일은 경고 로그를 남기고 건너뛴다.
+    """
+    settings = get_settings()
+    workers = workers or settings.ingest_workers or os.cpu_count() or 1
+    # 워커는 부모의 설정을 공유하지 않으므로 청킹 옵션을 명시적으로 전달
+    chunk_size = chunk_size or settings.chunk_size
+    chunk_overlap = chunk_overlap or settings.chunk_overlap
+    by_heading = settings.chunk_by_heading
+    root = str(Path(directory))
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        pending: deque[tuple[Path, Future[list[Document]]]] = deque()
+        for path in iter_files(directory, patterns):
+            if len(pending) >= workers * 2:
+                yield from _chunks_or_skip(*pending.popleft())
+
+            pending.append(
+                (
+                    path,
+                    executor.submit(
+                        _load_and_chunk,
+                        str(path),
+                        root,
+                        chunk_size,
+                        chunk_overlap,
+                        by_heading,
+                    ),
+                )
+            )
+
+        while pending:
+            yield from _chunks_or_skip(*pending.popleft())
+
+
+def ingest_directory(
+    directory: str | Path,
+    patterns: Iterable[str] = DEFAULT_PATTERNS,
+    client: OpenSearch | None = None,
+    index_name: str | None = None,
+    workers: int | None = None,
+) -> int:
+    # 인덱스가 없을 때만 생성 (기존 데이터 유지)
+    create_index(client=client, index_name=index_name, recreate=False)
+
+    # 청킹과 임베딩/벌크 저장이 파이프라인으로 겹쳐 실행됨
+    return index_documents(
+        iter_chunks(directory, patterns, workers=workers),
+        client=client,
+        index_name=index_name,
+    )
@@ -0,0 +1,798 @@
+import math
+from collections.abc import Iterable
+
+import numpy as np
+from langchain_core.documents import Document
+from opensearchpy import AsyncOpenSearch, OpenSearch, TransportError
+from opensearchpy import ConnectionError as OpenSearchConnectionError
+
+from rag_agent.backend import SearchBackend, fuse_legs
+from rag_agent.config import get_settings
+from rag_agent.embeddings import (
+    create_embeddings,
+    create_full_embeddings,
+    truncate_embedding,
+)
+from rag_agent.indexer import (
+    TEXT_ANALYZERS,
+    _aread_index_mapping,
+    _cached_probe,
+    _create_index,
+    _index_documents,
+    _read_index_mapping,
+    _rebuild_index,
+    _sync_documents,
+    get_async_opensearch_client,
+    get_opensearch_client,
+    resolve_index_profile,
+    resolve_text_analyzer,
+)
+
+# 검색 결과에서 가져올 _source 필드 (임베딩 벡터는 전송하지 않음)
+SEARCH_SOURCE_FIELDS = ["content", "metadata"]
+
+# 응답 JSON에서 남길 경로 (took, _shards, _index 등 제외)
+SEARCH_FILTER_PATH = ["hits.hits._id", "hits.hits._score", "hits.hits._source"]
+MSEARCH_FILTER_PATH = [f"responses.{path}" for path in SEARCH_FILTER_PATH] + [
+    "responses.error",
+    "responses.status",
+]
+MGET_FILTER_PATH = ["docs._id", "docs._source"]
+
+# 섹션 필터를 k-NN 쿼리 안에서 처리하지 못하는 엔진(nmslib)의 후보 배수
+# (전체 상위 k개를 먼저 찾은 뒤 필터링하므로 후보를 늘려 섹션 결과 확보)
+SECTION_KNN_OVERSAMPLE = 10
+
+# k-NN 쿼리의 k 최대값 (OpenSearch 제한)
+MAX_KNN_K = 10_000
+
+# 이미 생성한 하이브리드 검색 파이프라인 이름
+_hybrid_pipelines: set[str] = set()
+
+# hybrid 쿼리(neural-search)를 지원하지 않는 클러스터 (호스트 목록)
+# (매 요청마다 실패하는 왕복을 반복하지 않도록 한 번만 확인)
+_native_unsupported: set[str] = set()
+
+
+def _source_filter(source_fields: list[str] | None) -> dict:
+    # None이면 전체 _source (embedding 포함)
+    if source_fields is None:
+        return {"excludes": []}
+    return {"includes": source_fields}
+
+
+def _with_section(query: dict, section: str | None) -> dict:
+    # 제목 경로 접두어로 섹션 제한 (예: "휴가 정책 > 특별휴가")
+    if not section:
+        return query
+    return {
+        "bool": {
+            "must": [query],
+            "filter": [{"prefix": {"heading_path.keyword": section}}],
+        }
+    }
+
+
+def _vector_query(
+    query_vector: list[float],
+    k: int,
+    source_fields: list[str] | None = SEARCH_SOURCE_FIELDS,
+    section: str | None = None,
+    engine: str | None = None,
+) -> dict:
+    # k-NN 검색 쿼리
+    knn: dict = {"vector": query_vector, "k": k}
+    query: dict = {"knn": {"embedding": knn}}
+
+    if section:
+        # engine: 검색할 인덱스 매핑의 엔진 (지정하지 않으면 현재 설정)
+        if (engine or resolve_index_profile()["engine"]) in ("lucene", "faiss"):
+            # 효율적 필터링: 섹션에 속한 문서 안에서 k개를 찾음
+            knn["filter"] = {"prefix": {"heading_path.keyword": section}}
+        else:
+            # nmslib은 k-NN 후 필터(post-filter)만 가능 -> 후보를 늘려 보완
+            knn["k"] = min(k * SECTION_KNN_OVERSAMPLE, MAX_KNN_K)
+            query = _with_section(query, section)
+
+    return {
+        "size": k,
+        "_source": _source_filter(source_fields),
+        "track_total_hits": False,
+        "query": query,
+    }
+
+
+def _keyword_query(
+    query: str,
+    k: int,
+    source_fields: list[str] | None = SEARCH_SOURCE_FIELDS,
+    section: str | None = None,
+) -> dict:
+    # BM25 검색 쿼리 (본문 + 가중치를 준 제목 경로)
+    settings = get_settings()
+    heading_boost = settings.heading_boost
+    analyzer = resolve_text_analyzer()
+    match: dict = {
+        "multi_match": {
+            "query": query,
+            "fields": ["content", f"heading_path^{heading_boost}"],
+        }
+    }
+
+    if analyzer in TEXT_ANALYZERS:
+        # 한국어 분석 서브필드 점수를 더함 (공백 단위 일치 + 부분 단어 일치)
+        # 서브필드가 없는 이전 인덱스에서는 기본 필드만 일치
+        match = {
+            "bool": {
+                "should": [
+                    match,
+                    {
+                        "multi_match": {
+                            "query": query,
+                            "fields": [
+                                f"content.{analyzer}",
+                                f"heading_path.{analyzer}^{heading_boost}",
+                            ],
+                            # n-gram 하나만 겹쳐서는 일치하지 않도록 최소 일치 수 요구
+                            "minimum_should_match": settings.korean_minimum_should_match,
+                        }
+                    },
+                ]
+            }
+        }
+
+    return {
+        "size": k,
+        "_source": _source_filter(source_fields),
+        "track_total_hits": False,
+        "query": _with_section(match, section),
+    }
+
+
+def _parse_hits(response: dict) -> list[dict]:
+    # 결과 추출
+    results = []
+    # filter_path 사용 시 결과가 없으면 "hits" 키 자체가 빠짐
+    for hit in response.get("hits", {}).get("hits", []):
+        # 리스코어링 후보는 전체 벡터만 받음 (본문은 _fetch_sources로 조회)
+        source = hit.get("_source", {})
+        results.append(
+            {
+                "content": source.get("content", ""),
+                "score": hit["_score"],
+                "metadata": source.get("metadata", {}),
+                "id": hit["_id"],
+            }
+        )
+        if "embedding_full" in source:
+            results[-1]["embedding_full"] = source["embedding_full"]
+
+    return results
+
+
+def _query_vectors(query: str) -> tuple[list[float], list[float] | None]:
+    # (검색용 벡터, 리스코어링용 전체 벡터)
+    settings = get_settings()
+    if not settings.rescore_full_vectors:
+        return create_embeddings().embed_query(query), None
+    full_vector = create_full_embeddings().embed_query(query)
+    return truncate_embedding(full_vector, settings.embedding_dimensions), full_vector
+
+
+async def _aquery_vectors(query: str) -> tuple[list[float], list[float] | None]:
+    settings = get_settings()
+    if not settings.rescore_full_vectors:
+        return await create_embeddings().aembed_query(query), None
+    full_vector = await create_full_embeddings().aembed_query(query)
+    return truncate_embedding(full_vector, settings.embedding_dimensions), full_vector
+
+
+def _rescore_k(k: int, full_vector: list[float] | None) -> int:
+    # 리스코어링 시 후보를 더 많이 가져옴
+    if full_vector is None:
+        return k
+    return math.ceil(k * get_settings().rescore_oversample)
+
+
+def _vector_source_fields(full_vector: list[float] | None) -> list[str]:
+    if full_vector is None:
+        return SEARCH_SOURCE_FIELDS
+    # k x 배수 후보는 재채점용 벡터만 받고, 본문은 최종 k개만 조회
+    return ["embedding_full"]
+
+
+def _fill_sources(results: list[dict], response: dict) -> list[dict]:
+    # 최종 결과에 본문/메타데이터 채우기 (그 사이 삭제된 문서는 제외)
+    sources = {
+        doc["_id"]: doc["_source"]
+        for doc in response.get("docs", [])
+        if "_source" in doc
+    }
+    filled = []
+    for result in results:
+        source = sources.get(result["id"])
+        if source is not None:
+            result["content"] = source.get("content", "")
+            result["metadata"] = source.get("metadata", {})
+            filled.append(result)
+    return filled
+
+
+def _fetch_sources(
+    client: OpenSearch, index_name: str, results: list[dict]
+) -> list[dict]:
+    if not results:
+        return results
+    response = client.mget(
+        index=index_name,
+        body={"ids": [r["id"] for r in results]},
+        _source_includes=SEARCH_SOURCE_FIELDS,
+        filter_path=MGET_FILTER_PATH,
+    )
+    return _fill_sources(results, response)
+
+
+async def _afetch_sources(
+    client: AsyncOpenSearch, index_name: str, results: list[dict]
+) -> list[dict]:
+    if not results:
+        return results
+    response = await client.mget(
+        index=index_name,
+        body={"ids": [r["id"] for r in results]},
+        _source_includes=SEARCH_SOURCE_FIELDS,
+        filter_path=MGET_FILTER_PATH,
+    )
+    return _fill_sources(results, response)
+
+
+def _rescore(
+    results: list[dict], full_vector: list[float] | None, k: int
+) -> list[dict]:
+    """근사(축소/양자화) 검색 후보를 전체 정밀도 벡터의 코사인 유사도로 재정렬.
+
+    전체 벡터가 없는 문서(리스코어링 도입 전 인덱싱)는 뒤에 원래 순서로 둔다.
+    후보에는 본문이 없으므로 호출한 쪽에서 ``_fetch_sources`` 로 채운다.
+    """
+    if full_vector is None:
+        return results[:k]
+
+    rescored = [r for r in results if r.get("embedding_full")]
+    rest = [r for r in results if not r.get("embedding_full")]
+    if rescored:
+        matrix = np.asarray([r.pop("embedding_full") for r in rescored], np.float32)
+        query = np.asarray(full_vector, dtype=np.float32)
+        norms = np.linalg.norm(matrix, axis=1) * np.linalg.norm(query)
+        similarities = matrix @ query / np.where(norms == 0, 1.0, norms)
+        for result, similarity in zip(rescored, similarities, strict=True):
+            result["score"] = float(similarity)
+        rescored.sort(key=lambda r: r["score"], reverse=True)
+
+    for result in rest:
+        result.pop("embedding_full", None)
+    return (rescored + rest)[:k]
+
+
+def _msearch_body(
+    index_name: str,
+    query: str,
+    query_vector: list[float],
+    k: int,
+    section: str | None = None,
+    full_vector: list[float] | None = None,
+    engine: str | None = None,
+) -> list[dict]:
+    # 벡터/키워드 검색을 _msearch 한 번의 요청으로 전송
+    return [
+        {"index": index_name},
+        _vector_query(
+            query_vector,
+            _rescore_k(k, full_vector),
+            _vector_source_fields(full_vector),
+            section,
+            engine,
+        ),
+        {"index": index_name},
+        _keyword_query(query, k, section=section),
+    ]
+
+
+def _msearch_hits(response: dict) -> list[list[dict]]:
+    legs = []
+    for leg in response["responses"]:
+        if "error" in leg:
+            raise TransportError(leg.get("status", 500), "msearch", leg["error"])
+        legs.append(_parse_hits(leg))
+    return legs
+
+
+def _msearch_legs(
+    client: OpenSearch,
+    index_name: str,
+    query: str,
+    query_vector: list[float],
+    k: int,
+    section: str | None = None,
+    full_vector: list[float] | None = None,
+    engine: str | None = None,
+) -> tuple[list[dict], list[dict]]:
+    response = client.msearch(
+        body=_msearch_body(
+            index_name, query, query_vector, k, section, full_vector, engine
+        ),
+        filter_path=MSEARCH_FILTER_PATH,
+    )
+    legs = _msearch_hits(response)
+
+    vector_results = _rescore(legs[0], full_vector, k)
+    if full_vector is not None:
+        vector_results = _fetch_sources(client, index_name, vector_results)
+    return vector_results, legs[1]
+
+
+async def _amsearch_legs(
+    client: AsyncOpenSearch,
+    index_name: str,
+    query: str,
+    query_vector: list[float],
+    k: int,
+    section: str | None = None,
+    full_vector: list[float] | None = None,
+    engine: str | None = None,
+) -> tuple[list[dict], list[dict]]:
+    response = await client.msearch(
+        body=_msearch_body(
+            index_name, query, query_vector, k, section, full_vector, engine
+        ),
+        filter_path=MSEARCH_FILTER_PATH,
+    )
+    legs = _msearch_hits(response)
+
+    vector_results = _rescore(legs[0], full_vector, k)
+    if full_vector is not None:
+        vector_results = await _afetch_sources(client, index_name, vector_results)
+    return vector_results, legs[1]
+
+
+def _hybrid_pipeline(vector_weight: float, keyword_weight: float) -> tuple[str, dict]:
+    # 정규화 파이프라인의 가중치 합은 1이어야 함 (_check_weights로 검증됨)
+    total = vector_weight + keyword_weight
+    weights = [vector_weight / total, keyword_weight / total]
+    name = f"rag-hybrid-{weights[0]:.3f}-{weights[1]:.3f}"
+    body = {
+        "description": "RAG 하이브리드 검색 점수 정규화",
+        "phase_results_processors": [
+            {
+                "normalization-processor": {
+                    "normalization": {"technique": "min_max"},
+                    "combination": {
+                        "technique": "arithmetic_mean",
+                        "parameters": {"weights": weights},
+                    },
+                }
+            }
+        ],
+    }
+    return name, body
+
+
+def _ensure_hybrid_pipeline(
+    client: OpenSearch, vector_weight: float, keyword_weight: float
+) -> str:
+    name, body = _hybrid_pipeline(vector_weight, keyword_weight)
+    if name not in _hybrid_pipelines:
+        client.transport.perform_request("PUT", f"/_search/pipeline/{name}", body=body)
+        _hybrid_pipelines.add(name)
+    return name
+
+
+async def _aensure_hybrid_pipeline(
+    client: AsyncOpenSearch, vector_weight: float, keyword_weight: float
+) -> str:
+    name, body = _hybrid_pipeline(vector_weight, keyword_weight)
+    if name not in _hybrid_pipelines:
+        await client.transport.perform_request(
+            "PUT", f"/_search/pipeline/{name}", body=body
+        )
+        _hybrid_pipelines.add(name)
+    return name
+
+
+def _native_hybrid_query(
+    query: str,
+    query_vector: list[float],
+    k: int,
+    section: str | None = None,
+    engine: str | None = None,
+) -> dict:
+    # OpenSearch hybrid 쿼리 (neural-search 플러그인, 2.10+)
+    # 점수를 서버에서 정규화/결합하므로 전체 벡터 리스코어링은 적용되지 않음
+    candidate_k = k * get_settings().hybrid_candidate_multiplier
+    return {
+        "size": k,
+        "_source": _source_filter(SEARCH_SOURCE_FIELDS),
+        "query": {
+            "hybrid": {
+                "queries": [
+                    _vector_query(
+                        query_vector, candidate_k, section=section, engine=engine
+                    )["query"],
+                    _keyword_query(query, candidate_k, section=section)["query"],
+                ]
+            }
+        },
+    }
+
+
+def _native_hits(response: dict) -> list[dict]:
+    results = _parse_hits(response)
+    for result in results:
+        result["vector_rank"] = None
+        result["keyword_rank"] = None
+    return results
+
+
+def _native_hybrid_search(
+    client: OpenSearch,
+    index_name: str,
+    query: str,
+    query_vector: list[float],
+    k: int,
+    vector_weight: float,
+    keyword_weight: float,
+    section: str | None = None,
+    engine: str | None = None,
+) -> list[dict]:
+    pipeline = _ensure_hybrid_pipeline(client, vector_weight, keyword_weight)
+    response = client.search(
+        index=index_name,
+        body=_native_hybrid_query(query, query_vector, k, section, engine),
+        filter_path=SEARCH_FILTER_PATH,
+        params={"search_pipeline": pipeline},
+    )
+    return _native_hits(response)
+
+
+async def _anative_hybrid_search(
+    client: AsyncOpenSearch,
+    index_name: str,
+    query: str,
+    query_vector: list[float],
+    k: int,
+    vector_weight: float,
+    keyword_weight: float,
+    section: str | None = None,
+    engine: str | None = None,
+) -> list[dict]:
+    pipeline = await _aensure_hybrid_pipeline(client, vector_weight, keyword_weight)
+    response = await client.search(
+        index=index_name,
+        body=_native_hybrid_query(query, query_vector, k, section, engine),
+        filter_path=SEARCH_FILTER_PATH,
+        params={"search_pipeline": pipeline},
+    )
+    return _native_hits(response)
+
+
+def _neighbor_query(wanted: dict[str, set[int]]) -> dict | None:
+    # 모든 출처의 이웃 청크를 한 번의 요청으로 조회
+    if not wanted:
+        return None
+
+    clauses = [
+        {
+            "bool": {
+                "filter": [
+                    {"term": {"metadata.source.keyword": source}},
+                    {"terms": {"metadata.chunk_index": sorted(indices)}},
+                ]
+            }
+        }
+        for source, indices in wanted.items()
+    ]
+    size = sum(len(indices) for indices in wanted.values())
+
+    return {
+        "size": size,
+        "_source": _source_filter(SEARCH_SOURCE_FIELDS),
+        "track_total_hits": False,
+        "query": {"bool": {"should": clauses, "minimum_should_match": 1}},
+    }
+
+
+class OpenSearchBackend(SearchBackend):
+    """OpenSearch 인덱스(또는 별칭) 하나에 대한 백엔드.
+
+    ``client`` / ``async_client`` 를 넘기지 않으면 공유 클라이언트를 쓴다.
+    """
+
+    def __init__(
+        self,
+        client: OpenSearch | None = None,
+        index_name: str | None = None,
+        async_client: AsyncOpenSearch | None = None,
+    ):
+        self._client = client
+        self._async_client = async_client
+        self.index_name = index_name or get_settings().index_name
+
+    @property
+    def client(self) -> OpenSearch:
+        return self._client or get_opensearch_client()
+
+    @property
+    def async_client(self) -> AsyncOpenSearch:
+        # 비동기 클라이언트는 이벤트 루프별이므로 사용할 때 가져옴
+        return self._async_client or get_async_opensearch_client()
+
+    def _engine(self, section: str | None) -> str | None:
+        # 섹션 필터 방식은 현재 설정이 아니라 인덱스를 만들 때의 엔진을 따름
+        if not section:
+            return None
+        return _read_index_mapping(self.client, self.index_name)[1]
+
+    async def _aengine(self, section: str | None) -> str | None:
+        if not section:
+            return None
+        return (await _aread_index_mapping(self.async_client, self.index_name))[1]
+
+    def vector_search(
+        self, query: str, k: int, section: str | None = None
+    ) -> list[dict]:
+        client = self.client
+
+        # 질문을 벡터로 변환
+        query_vector, full_vector = _query_vectors(query)
+
+        # 검색 실행
+        response = client.search(
+            index=self.index_name,
+            body=_vector_query(
+                query_vector,
+                _rescore_k(k, full_vector),
+                _vector_source_fields(full_vector),
+                section,
+                self._engine(section),
+            ),
+            filter_path=SEARCH_FILTER_PATH,
+        )
+
+        results = _rescore(_parse_hits(response), full_vector, k)
+        if full_vector is not None:
+            results = _fetch_sources(client, self.index_name, results)
+        return results
+
+    async def avector_search(
+        self, query: str, k: int, section: str | None = None
+    ) -> list[dict]:
+        client = self.async_client
+        query_vector, full_vector = await _aquery_vectors(query)
+
+        response = await client.search(
+            index=self.index_name,
+            body=_vector_query(
+                query_vector,
+                _rescore_k(k, full_vector),
+                _vector_source_fields(full_vector),
+                section,
+                await self._aengine(section),
+            ),
+            filter_path=SEARCH_FILTER_PATH,
+        )
+
+        results = _rescore(_parse_hits(response), full_vector, k)
+        if full_vector is not None:
+            results = await _afetch_sources(client, self.index_name, results)
+        return results
+
+    def keyword_search(
+        self, query: str, k: int, section: str | None = None
+    ) -> list[dict]:
+        response = self.client.search(
+            index=self.index_name,
+            body=_keyword_query(query, k, section=section),
+            filter_path=SEARCH_FILTER_PATH,
+        )
+        return _parse_hits(response)
+
+    async def akeyword_search(
+        self, query: str, k: int, section: str | None = None
+    ) -> list[dict]:
+        response = await self.async_client.search(
+            index=self.index_name,
+            body=_keyword_query(query, k, section=section),
+            filter_path=SEARCH_FILTER_PATH,
+        )
+        return _parse_hits(response)
+
+    @property
+    def _cluster(self) -> str:
+        # native 지원 여부는 클러스터 단위 (동기/비동기 클라이언트가 공유)
+        client = self._client or self._async_client or get_opensearch_client()
+        return repr(client.transport.hosts)
+
+    def hybrid_mode(self, mode: str) -> str:
+        # hybrid 쿼리를 지원하지 않는 클러스터는 바로 msearch 사용
+        if mode == "native" and self._cluster in _native_unsupported:
+            return "msearch"
+        return mode
+
+    def _native_failed(self, error: TransportError) -> None:
+        # 400/404: 파이프라인 프로세서나 hybrid 쿼리를 모르는 클러스터
+        if error.status_code in (400, 404):
+            _native_unsupported.add(self._cluster)
+        if get_settings().debug:
+            print(f"hybrid 쿼리 실패, _msearch로 대체: {error}")
+
+    def hybrid_search(
+        self,
+        query: str,
+        k: int,
+        vector_weight: float,
+        keyword_weight: float,
+        mode: str = "client",
+        section: str | None = None,
+    ) -> list[dict]:
+        mode = self.hybrid_mode(mode)
+        if mode == "client":
+            return super().hybrid_search(
+                query, k, vector_weight, keyword_weight, mode, section
+            )
+
+        client = self.client
+        query_vector, full_vector = _query_vectors(query)
+        engine = self._engine(section)
+
+        if mode == "native":
+            try:
+                return _native_hybrid_search(
+                    client,
+                    self.index_name,
+                    query,
+                    query_vector,
+                    k,
+                    vector_weight,
+                    keyword_weight,
+                    section,
+                    engine,
+                )
+            except OpenSearchConnectionError:
+                raise
+            except TransportError as e:
+                self._native_failed(e)
+
+        vector_results, keyword_results = _msearch_legs(
+            client,
+            self.index_name,
+            query,
+            query_vector,
+            k * get_settings().hybrid_candidate_multiplier,
+            section,
+            full_vector,
+            engine,
+        )
+        return fuse_legs(
+            vector_results, keyword_results, k, vector_weight, keyword_weight
+        )
+
+    async def ahybrid_search(
+        self,
+        query: str,
+        k: int,
+        vector_weight: float,
+        keyword_weight: float,
+        mode: str = "client",
+        section: str | None = None,
+    ) -> list[dict]:
+        mode = self.hybrid_mode(mode)
+        if mode == "client":
+            return await super().ahybrid_search(
+                query, k, vector_weight, keyword_weight, mode, section
+            )
+
+        client = self.async_client
+        query_vector, full_vector = await _aquery_vectors(query)
+        engine = await self._aengine(section)
+
+        if mode == "native":
+            try:
+                return await _anative_hybrid_search(
+                    client,
+                    self.index_name,
+                    query,
+                    query_vector,
+                    k,
+                    vector_weight,
+                    keyword_weight,
+                    section,
+                    engine,
+                )
+            except OpenSearchConnectionError:
+                raise
+            except TransportError as e:
+                self._native_failed(e)
+
+        vector_results, keyword_results = await _amsearch_legs(
+            client,
+            self.index_name,
+            query,
+            query_vector,
+            k * get_settings().hybrid_candidate_multiplier,
+            section,
+            full_vector,
+            engine,
+        )
+        return fuse_legs(
+            vector_results, keyword_results, k, vector_weight, keyword_weight
+        )
+
+    def get_chunks(self, wanted: dict[str, set[int]]) -> list[dict]:
+        body = _neighbor_query(wanted)
+        if body is None:
+            return []
+        response = self.client.search(
+            index=self.index_name, body=body, filter_path=SEARCH_FILTER_PATH
+        )
+        return _parse_hits(response)
+
+    async def aget_chunks(self, wanted: dict[str, set[int]]) -> list[dict]:
+        body = _neighbor_query(wanted)
+        if body is None:
+            return []
+        response = await self.async_client.search(
+            index=self.index_name, body=body, filter_path=SEARCH_FILTER_PATH
+        )
+        return _parse_hits(response)
+
+    def healthy(self, ttl: float | None = None) -> bool:
+        return _cached_probe("cluster", lambda: self.client.ping(), ttl)
+
+    def exists(self, ttl: float | None = None) -> bool:
+        return _cached_probe(
+            f"index:{self.index_name}",
+            lambda: self.client.indices.exists(index=self.index_name),
+            ttl,
+        )
+
+    def generation(self, ttl: float | None = None) -> str:
+        return _read_index_mapping(self.client, self.index_name, ttl)[0]
+
+    def create_index(
+        self,
+        recreate: bool = True,
+        profile: str | None = None,
+        vector_dimension: int | None = None,
+        **overrides,
+    ) -> None:
+        _create_index(
+            self.client,
+            self.index_name,
+            vector_dimension,
+            recreate,
+            profile,
+            **overrides,
+        )
+
+    def index_documents(
+        self,
+        documents: Iterable[Document],
+        batch_size: int | None = None,
+        concurrency: int | None = None,
+    ) -> int:
+        return _index_documents(
+            self.client, self.index_name, documents, batch_size, concurrency
+        )
+
+    def sync_documents(self, documents: Iterable[Document]) -> dict[str, int]:
+        return _sync_documents(self.client, self.index_name, documents)
+
+    def rebuild_index(
+        self,
+        documents: Iterable[Document],
+        profile: str | None = None,
+        keep_versions: int | None = None,
+        **overrides,
+    ) -> dict:
+        return _rebuild_index(
+            self.client, self.index_name, documents, profile, keep_versions, **overrides
+        )
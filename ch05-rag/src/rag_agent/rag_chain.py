@@ -1,26 +1,66 @@
-from collections.abc import Iterator
+import asyncio
+import re
+from collections.abc import AsyncIterator, Callable, Iterator
+from functools import lru_cache
 
+import httpx
 from langchain.chat_models import init_chat_model
 from langchain_core.language_models import BaseChatModel
 from langchain_core.output_parsers import StrOutputParser
 from langchain_core.prompts import ChatPromptTemplate
+from langchain_core.runnables import Runnable
 
+from rag_agent.answer_cache import get_answer_cache
 from rag_agent.config import get_settings
-from rag_agent.reranker import search_with_rerank
-from rag_agent.search import format_search_results, hybrid_search, vector_search
+from rag_agent.embeddings import create_embeddings
+from rag_agent.indexer import get_index_generation
+from rag_agent.reranker import asearch_with_rerank, search_with_rerank
+from rag_agent.search import (
+    aexpand_neighbors,
+    ahybrid_search,
+    avector_search,
+    expand_neighbors,
+    format_search_results,
+    hybrid_search,
+    vector_search,
+)
 
 
-def create_llm(model_name: str | None = None) -> BaseChatModel:
+@lru_cache
+def get_http_client() -> httpx.Client:
+    # 모든 LLM 클라이언트가 공유하는 HTTP 연결 풀
+    settings = get_settings()
+    return httpx.Client(
+        limits=httpx.Limits(
+            max_connections=settings.llm_max_connections,
+            max_keepalive_connections=settings.llm_max_connections,
+        ),
+        timeout=settings.llm_timeout,
+    )
+
+
+def create_llm(model_name: str | None = None, temperature: float = 0) -> BaseChatModel:
     settings = get_settings()
     model_name = model_name or settings.default_model
     return init_chat_model(
         model_provider="openai",
         model=model_name,
-        temperature=0,
+        temperature=temperature,
         api_key=settings.openai_api_key.get_secret_value(),
+        http_client=get_http_client(),
     )
 
 
+def get_llm(model_name: str | None = None, temperature: float = 0) -> BaseChatModel:
+    # (모델, temperature)별로 한 번만 생성해 재사용
+    return _cached_llm(model_name or get_settings().default_model, float(temperature))
+
+
+@lru_cache
+def _cached_llm(model_name: str, temperature: float) -> BaseChatModel:
+    return create_llm(model_name, temperature)
+
+
 RAG_PROMPT = ChatPromptTemplate.from_messages(
     [
         (
@@ -46,12 +86,18 @@ RAG_PROMPT = ChatPromptTemplate.from_messages(
 )
 
 
-def ask_rag(
-    question: str,
-    search_type: str = "hybrid",
-    use_rerank: bool = True,
-) -> str:
-    # 1. 검색
+def get_rag_chain(model_name: str | None = None, temperature: float = 0) -> Runnable:
+    return _cached_rag_chain(
+        model_name or get_settings().default_model, float(temperature)
+    )
+
+
+@lru_cache
+def _cached_rag_chain(model_name: str, temperature: float) -> Runnable:
+    return RAG_PROMPT | get_llm(model_name, temperature) | StrOutputParser()
+
+
+def _retrieve(question: str, search_type: str, use_rerank: bool) -> list[dict]:
     if use_rerank:
         results = search_with_rerank(question)
     elif search_type == "vector":
@@ -59,31 +105,231 @@ def ask_rag(
     else:
         results = hybrid_search(question)
 
+    # 이웃 청크 확장 (NEIGHBOR_WINDOW > 0일 때만)
+    return expand_neighbors(results)
+
+
+async def _aretrieve(question: str, search_type: str, use_rerank: bool) -> list[dict]:
+    if use_rerank:
+        results = await asearch_with_rerank(question)
+    elif search_type == "vector":
+        results = await avector_search(question)
+    else:
+        results = await ahybrid_search(question)
+
+    return await aexpand_neighbors(results)
+
+
+def _cache_key(
+    search_type: str,
+    use_rerank: bool,
+    model_name: str | None = None,
+    temperature: float = 0,
+    chain: Runnable | None = None,
+) -> tuple[str, str]:
+    # (인덱스 세대, 검색 방식 + 답변 생성 모델)
+    mode = "rerank" if use_rerank else search_type
+    if chain is not None:
+        # 직접 넘긴 체인은 모델을 알 수 없으므로 체인 객체 단위로 구분
+        llm = f"chain-{id(chain)}"
+    else:
+        llm = f"{model_name or get_settings().default_model}@{float(temperature)}"
+    # 세대 캐시(TTL)를 건너뜀: 다른 프로세스의 재인덱싱 직후 이전 답변 방지
+    return get_index_generation(ttl=0), f"{mode}|{llm}"
+
+
+def _sources(results: list[dict]) -> list[dict]:
+    return [
+        {
+            "source": r.get("metadata", {}).get("source", "unknown"),
+            "chunk_index": r.get("metadata", {}).get("chunk_index"),
+        }
+        for r in results
+    ]
+
+
+def _replay(answer: str) -> Iterator[str]:
+    # 캐시된 답변을 단어 단위로 나눠 스트리밍처럼 전달
+    yield from re.findall(r"\S+\s*|\s+", answer)
+
+
+def ask_rag(
+    question: str,
+    search_type: str = "hybrid",
+    use_rerank: bool = True,
+    use_cache: bool | None = None,
+    chain: Runnable | None = None,
+    model_name: str | None = None,
+    temperature: float = 0,
+    on_sources: Callable[[list[dict]], None] | None = None,
+) -> str:
+    """검색한 문서로 답변 생성.
+
+    ``on_sources`` 를 넘기면 답변 근거 문서(출처, 청크 번호) 목록으로 호출한다.
+    캐시된 답변이면 저장할 때의 출처를 전달한다 (``stream_rag`` / ``aask_rag`` /
+    ``astream_rag`` 도 같음).
+    """
+    settings = get_settings()
+    use_cache = use_cache if use_cache is not None else settings.answer_cache_enabled
+
+    # 0. 의미 기반 답변 캐시 조회
+    if use_cache:
+        cache = get_answer_cache()
+        generation, mode = _cache_key(
+            search_type, use_rerank, model_name, temperature, chain
+        )
+        question_vector = create_embeddings().embed_query(question)
+        cached = cache.lookup(question_vector, generation, mode)
+        if cached:
+            if on_sources:
+                on_sources(cached["sources"])
+            return str(cached["answer"])
+
+    # 1. 검색
+    results = _retrieve(question, search_type, use_rerank)
+    sources = _sources(results)
+    if on_sources:
+        on_sources(sources)
+
     # 2. 컨텍스트 구성
     context = format_search_results(results, include_score=False)
 
     # 3. LLM 답변 생성
-    llm = create_llm()
-    chain = RAG_PROMPT | llm | StrOutputParser()
-    return chain.invoke({"context": context, "question": question})
+    chain = chain or get_rag_chain(model_name, temperature)
+    answer: str = chain.invoke({"context": context, "question": question})
+
+    if use_cache:
+        cache.store(question, question_vector, answer, sources, generation, mode)
+
+    return answer
 
 
 def stream_rag(
     question: str,
     search_type: str = "hybrid",
     use_rerank: bool = True,
+    use_cache: bool | None = None,
+    chain: Runnable | None = None,
+    model_name: str | None = None,
+    temperature: float = 0,
+    on_sources: Callable[[list[dict]], None] | None = None,
 ) -> Iterator[str]:
-    if use_rerank:
-        results = search_with_rerank(question)
-    elif search_type == "vector":
-        results = vector_search(question)
-    else:
-        results = hybrid_search(question)
+    settings = get_settings()
+    use_cache = use_cache if use_cache is not None else settings.answer_cache_enabled
+
+    if use_cache:
+        cache = get_answer_cache()
+        generation, mode = _cache_key(
+            search_type, use_rerank, model_name, temperature, chain
+        )
+        question_vector = create_embeddings().embed_query(question)
+        cached = cache.lookup(question_vector, generation, mode)
+        if cached:
+            if on_sources:
+                on_sources(cached["sources"])
+            yield from _replay(cached["answer"])
+            return
+
+    results = _retrieve(question, search_type, use_rerank)
+    sources = _sources(results)
+    if on_sources:
+        on_sources(sources)
+
+    context = format_search_results(results, include_score=False)
+    chain = chain or get_rag_chain(model_name, temperature)
+
+    answer = ""
+    for chunk in chain.stream({"context": context, "question": question}):
+        answer += chunk
+        yield chunk
+
+    # 끝까지 생성된 답변만 캐시
+    if use_cache:
+        cache.store(question, question_vector, answer, sources, generation, mode)
+
+
+async def aask_rag(
+    question: str,
+    search_type: str = "hybrid",
+    use_rerank: bool = True,
+    use_cache: bool | None = None,
+    chain: Runnable | None = None,
+    model_name: str | None = None,
+    temperature: float = 0,
+    on_sources: Callable[[list[dict]], None] | None = None,
+) -> str:
+    settings = get_settings()
+    use_cache = use_cache if use_cache is not None else settings.answer_cache_enabled
+
+    if use_cache:
+        cache = get_answer_cache()
+        generation, mode = await asyncio.to_thread(
+            _cache_key, search_type, use_rerank, model_name, temperature, chain
+        )
+        question_vector = await create_embeddings().aembed_query(question)
+        cached = cache.lookup(question_vector, generation, mode)
+        if cached:
+            if on_sources:
+                on_sources(cached["sources"])
+            return str(cached["answer"])
+
+    results = await _aretrieve(question, search_type, use_rerank)
+    sources = _sources(results)
+    if on_sources:
+        on_sources(sources)
 
     context = format_search_results(results, include_score=False)
-    llm = create_llm()
-    chain = RAG_PROMPT | llm | StrOutputParser()
-    yield from chain.stream({"context": context, "question": question})
+    chain = chain or get_rag_chain(model_name, temperature)
+    answer: str = await chain.ainvoke({"context": context, "question": question})
+
+    if use_cache:
+        cache.store(question, question_vector, answer, sources, generation, mode)
+
+    return answer
+
+
+async def astream_rag(
+    question: str,
+    search_type: str = "hybrid",
+    use_rerank: bool = True,
+    use_cache: bool | None = None,
+    chain: Runnable | None = None,
+    model_name: str | None = None,
+    temperature: float = 0,
+    on_sources: Callable[[list[dict]], None] | None = None,
+) -> AsyncIterator[str]:
+    settings = get_settings()
+    use_cache = use_cache if use_cache is not None else settings.answer_cache_enabled
+
+    if use_cache:
+        cache = get_answer_cache()
+        generation, mode = await asyncio.to_thread(
+            _cache_key, search_type, use_rerank, model_name, temperature, chain
+        )
+        question_vector = await create_embeddings().aembed_query(question)
+        cached = cache.lookup(question_vector, generation, mode)
+        if cached:
+            if on_sources:
+                on_sources(cached["sources"])
+            for piece in _replay(cached["answer"]):
+                yield piece
+            return
+
+    results = await _aretrieve(question, search_type, use_rerank)
+    sources = _sources(results)
+    if on_sources:
+        on_sources(sources)
+
+    context = format_search_results(results, include_score=False)
+    chain = chain or get_rag_chain(model_name, temperature)
+
+    answer = ""
+    async for chunk in chain.astream({"context": context, "question": question}):
+        answer += chunk
+        yield chunk
+
+    if use_cache:
+        cache.store(question, question_vector, answer, sources, generation, mode)
 
 
 class RAGAgent:
@@ -91,16 +337,28 @@ class RAGAgent:
         self,
         search_type: str = "hybrid",
         use_rerank: bool = True,
+        model_name: str | None = None,
+        temperature: float = 0,
     ):
         self.search_type = search_type
         self.use_rerank = use_rerank
+        self.model_name = model_name
+        self.temperature = temperature
         self.history: list[dict[str, str]] = []
+        # 마지막 답변의 근거 문서 (캐시된 답변이면 저장 당시의 출처)
+        self.last_sources: list[dict] = []
+
+    def _set_sources(self, sources: list[dict]) -> None:
+        self.last_sources = sources
 
     def chat(self, question: str) -> str:
         answer = ask_rag(
             question,
             search_type=self.search_type,
             use_rerank=self.use_rerank,
+            model_name=self.model_name,
+            temperature=self.temperature,
+            on_sources=self._set_sources,
         )
         self.history.append({"role": "user", "content": question})
         self.history.append({"role": "assistant", "content": answer})
@@ -113,6 +371,37 @@ class RAGAgent:
             question,
             search_type=self.search_type,
             use_rerank=self.use_rerank,
+            model_name=self.model_name,
+            temperature=self.temperature,
+            on_sources=self._set_sources,
+        ):
+            full_response += chunk
+            yield chunk
+        self.history.append({"role": "assistant", "content": full_response})
+
+    async def achat(self, question: str) -> str:
+        answer = await aask_rag(
+            question,
+            search_type=self.search_type,
+            use_rerank=self.use_rerank,
+            model_name=self.model_name,
+            temperature=self.temperature,
+            on_sources=self._set_sources,
+        )
+        self.history.append({"role": "user", "content": question})
+        self.history.append({"role": "assistant", "content": answer})
+        return answer
+
+    async def astream(self, question: str) -> AsyncIterator[str]:
+        self.history.append({"role": "user", "content": question})
+        full_response = ""
+        async for chunk in astream_rag(
+            question,
+            search_type=self.search_type,
+            use_rerank=self.use_rerank,
+            model_name=self.model_name,
+            temperature=self.temperature,
+            on_sources=self._set_sources,
         ):
             full_response += chunk
             yield chunk
@@ -128,5 +417,12 @@ class RAGAgent:
 def create_rag_agent(
     search_type: str = "hybrid",
     use_rerank: bool = True,
+    model_name: str | None = None,
+    temperature: float = 0,
 ) -> RAGAgent:
-    return RAGAgent(search_type=search_type, use_rerank=use_rerank)
+    return RAGAgent(
+        search_type=search_type,
+        use_rerank=use_rerank,
+        model_name=model_name,
+        temperature=temperature,
+    )
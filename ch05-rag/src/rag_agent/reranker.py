@@ -1,63 +1,440 @@
+import asyncio
+import hashlib
+import logging
+import threading
+import time
+from functools import lru_cache
+from multiprocessing.managers import BaseManager
+
 from sentence_transformers import CrossEncoder
 
+from rag_agent.backend import SearchBackend, get_search_backend
+from rag_agent.cache import LRUCache, get_retrieval_cache
 from rag_agent.config import get_settings
+from rag_agent.embeddings import normalize_text
+
+logger = logging.getLogger(__name__)
+
+
+def _hash(text: str) -> str:
+    return hashlib.sha1(text.encode()).hexdigest()
+
+
+def _content_key(doc: dict) -> str:
+    # 청크 ID는 위치 기반이라 내용이 바뀌어도 같으므로 내용 해시로 캐시
+    return doc.get("metadata", {}).get("content_hash") or _hash(doc["content"])
+
+
+class RerankerService:
+    """Cross-Encoder 리랭킹 서비스.
+
+    모델은 처음 점수를 계산할 때 로드한다. (질문 해시, 청크 내용 해시) 쌍의 점수를
+    LRU 캐시에 보관해 같은 쌍은 다시 계산하지 않는다.
+    """
+
+    def __init__(
+        self,
+        model_name: str,
+        batch_size: int = 32,
+        max_length: int | None = None,
+        num_threads: int | None = None,
+        backend: str = "torch",
+        onnx_file: str | None = None,
+        device: str | None = None,
+        cache_size: int = 4096,
+    ):
+        self.model_name = model_name
+        self.batch_size = batch_size
+        self.max_length = max_length
+        self.num_threads = num_threads
+        self.backend = backend
+        self.onnx_file = onnx_file
+        self.device = device
+        self.cache = LRUCache(max_size=cache_size)
+        self.load_seconds: float | None = None
+        self._model: CrossEncoder | None = None
+        self._lock = threading.Lock()
+
+    @property
+    def model(self) -> CrossEncoder:
+        if self._model is None:
+            with self._lock:
+                if self._model is None:
+                    start = time.perf_counter()
+                    self._model = self._load()
+                    self.load_seconds = time.perf_counter() - start
+        return self._model
+
+    def warmup(self) -> float:
+        # 모델 로드 + 더미 추론 (첫 요청의 지연 제거)
+        self.model.predict([("warmup", "warmup")], show_progress_bar=False)
+        return self.load_seconds or 0.0
+
+    def stats(self) -> dict:
+        return {
+            "loaded": self._model is not None,
+            "load_seconds": self.load_seconds,
+            "cache": self.cache.stats(),
+        }
+
+    def _load(self) -> CrossEncoder:
+        if self.num_threads:
+            import torch
+
+            torch.set_num_threads(self.num_threads)
+
+        kwargs: dict = {"max_length": self.max_length, "device": self.device}
+        if self.backend != "torch":
+            # ONNX/OpenVINO 백엔드 (예: onnx/model_qint8_avx512_vnni.onnx 양자화 모델)
+            kwargs["backend"] = self.backend
+            if self.onnx_file:
+                kwargs["model_kwargs"] = {"file_name": self.onnx_file}
+
+        model: CrossEncoder = CrossEncoder(self.model_name, **kwargs)
+        return model
+
+    def score(self, query: str, documents: list[dict]) -> list[float]:
+        query_hash = _hash(normalize_text(query))
+        keys = [(query_hash, _content_key(doc)) for doc in documents]
+
+        scores: list[float | None] = [self.cache.get(key) for key in keys]
+        missing = [i for i, score in enumerate(scores) if score is None]
+
+        if missing:
+            # 캐시에 없는 쌍만 배치 단위로 계산
+            pairs = [[query, documents[i]["content"]] for i in missing]
+            predicted = self.model.predict(
+                pairs, batch_size=self.batch_size, show_progress_bar=False
+            )
+            for i, score in zip(missing, predicted, strict=True):
+                scores[i] = float(score)
+                self.cache.set(keys[i], float(score))
+
+        return [score for score in scores if score is not None]
+
+
+@lru_cache
+def get_reranker_service() -> RerankerService:
+    settings = get_settings()
+    return RerankerService(
+        settings.reranker_model,
+        batch_size=settings.reranker_batch_size,
+        max_length=settings.reranker_max_length,
+        num_threads=settings.reranker_num_threads,
+        backend=settings.reranker_backend,
+        onnx_file=settings.reranker_onnx_file,
+        device=settings.reranker_device,
+        cache_size=settings.rerank_cache_size,
+    )
+
+
+class RerankerManager(BaseManager):
+    pass
+
+
+RerankerManager.register("reranker")
+
+
+def worker_authkey() -> bytes:
+    # 워커는 받은 데이터를 pickle로 복원하므로 알려진 기본 키를 쓰지 않음
+    key = get_settings().reranker_worker_authkey
+    if key is None or not key.get_secret_value():
+        raise ValueError(
+            "RERANKER_WORKER_AUTHKEY를 설정하세요 "
+            '(예: python -c "import secrets; print(secrets.token_hex(32))")'
+        )
+    return key.get_secret_value().encode()
+
+
+class RemoteReranker:
+    """별도 워커 프로세스(``rag_agent.reranker_worker``)의 리랭커 클라이언트.
+
+    여러 Streamlit 프로세스가 모델 한 벌을 공유할 때 사용한다.
+    """
+
+    def __init__(self, address: str, authkey: bytes):
+        host, port = address.rsplit(":", 1)
+        self.address = (host, int(port))
+        self.authkey = authkey
+        self._proxy = None
+        self._lock = threading.Lock()
+
+    def _connect(self):
+        if self._proxy is None:
+            with self._lock:
+                if self._proxy is None:
+                    manager = RerankerManager(
+                        address=self.address, authkey=self.authkey
+                    )
+                    manager.connect()
+                    self._proxy = manager.reranker()
+        return self._proxy
+
+    def score(self, query: str, documents: list[dict]) -> list[float]:
+        # 본문과 캐시 키(내용 해시)만 전송
+        payload = [
+            {
+                "content": doc["content"],
+                "metadata": {"content_hash": _content_key(doc)},
+            }
+            for doc in documents
+        ]
+        try:
+            scores: list[float] = self._connect().score(query, payload)
+            return scores
+        except (OSError, EOFError) as e:
+            # 워커에 접속할 수 없으면 로컬 모델로 계산 (다음 호출에서 재접속)
+            self._proxy = None
+            logger.warning("리랭커 워커 접속 실패, 로컬 모델 사용: %s", e)
+            return get_reranker_service().score(query, documents)
+
+    def warmup(self) -> float:
+        try:
+            return float(self._connect().warmup())
+        except (OSError, EOFError) as e:
+            self._proxy = None
+            logger.warning("리랭커 워커 접속 실패, 로컬 모델 로드: %s", e)
+            return get_reranker_service().warmup()
+
+    def stats(self) -> dict:
+        remote = f"{self.address[0]}:{self.address[1]}"
+        try:
+            return {"remote": remote, **self._connect().stats()}
+        except (OSError, EOFError) as e:
+            self._proxy = None
+            return {"remote": remote, "error": str(e), **get_reranker_service().stats()}
+
+
+@lru_cache
+def get_remote_reranker() -> RemoteReranker:
+    address = get_settings().reranker_worker_address
+    if not address:
+        raise ValueError("RERANKER_WORKER_ADDRESS를 설정하세요 (예: 127.0.0.1:50051)")
+    return RemoteReranker(address, worker_authkey())
+
+
+def get_scorer() -> RerankerService | RemoteReranker:
+    # 워커 주소가 설정되어 있으면 원격 리랭커 사용
+    if get_settings().reranker_worker_address:
+        return get_remote_reranker()
+    return get_reranker_service()
 
-# 모델 캐시 (싱글톤)
-_reranker_model: CrossEncoder | None = None
+
+@lru_cache
+def get_prefilter_service() -> RerankerService:
+    # 캐스케이드 1차 점수용 소형 Cross-Encoder (항상 로컬에서 실행)
+    settings = get_settings()
+    if not settings.rerank_prefilter_model:
+        raise ValueError("RERANK_PREFILTER_MODEL을 설정하세요")
+    return RerankerService(
+        settings.rerank_prefilter_model,
+        batch_size=settings.reranker_batch_size,
+        max_length=settings.reranker_max_length,
+        num_threads=settings.reranker_num_threads,
+        device=settings.reranker_device,
+        cache_size=settings.rerank_cache_size,
+    )
 
 
 def get_reranker() -> CrossEncoder:
-    global _reranker_model
+    return get_reranker_service().model
+
+
+def warmup_reranker() -> float:
+    return get_scorer().warmup()
+
+
+def preload_reranker_in_background() -> threading.Thread:
+    thread = threading.Thread(
+        target=warmup_reranker, name="reranker-preload", daemon=True
+    )
+    thread.start()
+    return thread
+
+
+def get_reranker_stats() -> dict:
+    return get_scorer().stats()
+
+
+def _prefilter(query: str, documents: list[dict], keep: int) -> list[dict]:
+    settings = get_settings()
 
-    if _reranker_model is None:
-        settings = get_settings()
-        _reranker_model = CrossEncoder(settings.reranker_model)
+    if settings.rerank_prefilter_model:
+        # 소형 Cross-Encoder로 1차 점수 계산
+        scores = get_prefilter_service().score(query, documents)
+        for doc, score in zip(documents, scores, strict=True):
+            doc["prefilter_score"] = score
+        ranked = sorted(documents, key=lambda x: x["prefilter_score"], reverse=True)
+    else:
+        # 별도 모델이 없으면 검색 단계의 결합 점수(RRF 등)를 그대로 사용
+        ranked = sorted(documents, key=lambda x: x.get("score") or 0.0, reverse=True)
 
-    return _reranker_model
+    return ranked[:keep]
 
 
 def rerank(
     query: str,
     documents: list[dict],
     top_k: int | None = None,
+    min_score: float | None = None,
+    cascade: bool | None = None,
+    prefilter_k: int | None = None,
 ) -> list[dict]:
+    """Cross-Encoder로 문서를 재정렬.
+
+    ``cascade`` 가 켜져 있으면 1차 점수(소형 모델 또는 검색 점수)로 상위
+    ``prefilter_k`` 개만 남긴 뒤 본 모델을 실행한다. ``min_score`` 미만인
+    문서는 버리므로 ``top_k`` 보다 적게 반환될 수 있다.
+    """
     settings = get_settings()
     top_k = top_k or settings.rerank_top_k
+    min_score = min_score if min_score is not None else settings.rerank_min_score
+    cascade = cascade if cascade is not None else settings.rerank_cascade
+    prefilter_k = prefilter_k or max(settings.rerank_prefilter_k, top_k)
 
     if not documents:
         return []
 
-    # 리랭킹 모델 로드
-    reranker = get_reranker()
-
-    # 질문-문서 쌍 생성
-    pairs = [[query, doc["content"]] for doc in documents]
+    # 1차 후보 축소 (캐스케이드)
+    if cascade and len(documents) > prefilter_k:
+        documents = _prefilter(query, documents, prefilter_k)
 
-    # 관련성 점수 계산
-    scores = reranker.predict(pairs)
+    # 관련성 점수 계산 (캐시 + 배치 추론)
+    scores = get_scorer().score(query, documents)
 
     # 점수 추가 및 재정렬
-    for doc, score in zip(documents, scores):
-        doc["rerank_score"] = float(score)
+    for doc, score in zip(documents, scores, strict=True):
+        doc["rerank_score"] = score
 
     reranked = sorted(documents, key=lambda x: x["rerank_score"], reverse=True)
 
+    # 최소 점수 컷오프
+    if min_score is not None:
+        reranked = [doc for doc in reranked if doc["rerank_score"] >= min_score]
+
     return reranked[:top_k]
 
 
+def _rerank_cache_key(
+    query: str,
+    initial_k: int,
+    final_k: int,
+    min_score: float | None,
+    backend: SearchBackend,
+    generation: str,
+    section: str | None = None,
+) -> str:
+    from rag_agent.search import _hybrid_cache_key
+
+    settings = get_settings()
+    # 1차 검색 결과는 하이브리드 검색 캐시와 같은 키로 구분 (실제 결합 방식 포함)
+    candidates_key = _hybrid_cache_key(
+        query,
+        initial_k,
+        settings.vector_weight,
+        settings.keyword_weight,
+        backend.hybrid_mode(settings.hybrid_search_mode),
+        settings.index_name,
+        generation,
+        section,
+    )
+    return get_retrieval_cache().make_key(
+        "rerank",
+        candidates_key,
+        settings.reranker_model,
+        settings.reranker_backend,
+        settings.reranker_onnx_file,
+        settings.reranker_max_length,
+        final_k,
+        min_score if min_score is not None else settings.rerank_min_score,
+        settings.rerank_cascade,
+        settings.rerank_prefilter_model,
+        settings.rerank_prefilter_k,
+    )
+
+
 def search_with_rerank(
     query: str,
     initial_k: int | None = None,
     final_k: int | None = None,
+    min_score: float | None = None,
+    use_cache: bool | None = None,
+    section: str | None = None,
 ) -> list[dict]:
     from rag_agent.search import hybrid_search
 
     settings = get_settings()
     initial_k = initial_k or settings.search_top_k * 2
     final_k = final_k or settings.rerank_top_k
+    use_cache = use_cache if use_cache is not None else settings.retrieval_cache_enabled
+
+    # 캐시 적중 시 검색과 리랭킹 모두 생략
+    if use_cache:
+        cache = get_retrieval_cache()
+        backend = get_search_backend()
+        cache_key = _rerank_cache_key(
+            query, initial_k, final_k, min_score, backend, backend.generation(), section
+        )
+        cached = cache.get(cache_key)
+        if cached is not None:
+            return cached
 
     # 1차 검색 (하이브리드)
-    candidates = hybrid_search(query, k=initial_k)
+    candidates = hybrid_search(query, k=initial_k, use_cache=use_cache, section=section)
 
     # 2차 리랭킹
-    return rerank(query, candidates, top_k=final_k)
+    results = rerank(query, candidates, top_k=final_k, min_score=min_score)
+
+    if use_cache:
+        cache.set(cache_key, results)
+
+    return results
+
+
+async def arerank(
+    query: str,
+    documents: list[dict],
+    top_k: int | None = None,
+    min_score: float | None = None,
+) -> list[dict]:
+    # CPU 연산이므로 이벤트 루프를 막지 않도록 스레드 풀에서 실행
+    return await asyncio.to_thread(
+        rerank, query, documents, top_k=top_k, min_score=min_score
+    )
+
+
+async def asearch_with_rerank(
+    query: str,
+    initial_k: int | None = None,
+    final_k: int | None = None,
+    min_score: float | None = None,
+    use_cache: bool | None = None,
+    section: str | None = None,
+) -> list[dict]:
+    from rag_agent.search import ahybrid_search
+
+    settings = get_settings()
+    initial_k = initial_k or settings.search_top_k * 2
+    final_k = final_k or settings.rerank_top_k
+    use_cache = use_cache if use_cache is not None else settings.retrieval_cache_enabled
+
+    if use_cache:
+        cache = get_retrieval_cache()
+        backend = get_search_backend()
+        generation = await asyncio.to_thread(backend.generation)
+        cache_key = _rerank_cache_key(
+            query, initial_k, final_k, min_score, backend, generation, section
+        )
+        cached = cache.get(cache_key)
+        if cached is not None:
+            return cached
+
+    candidates = await ahybrid_search(
+        query, k=initial_k, use_cache=use_cache, section=section
+    )
+    results = await arerank(query, candidates, top_k=final_k, min_score=min_score)
+
+    if use_cache:
+        cache.set(cache_key, results)
+
+    return results
@@ -0,0 +1,42 @@
+"""
+리랭커 워커 프로세스.
+
+Cross-Encoder 모델을 한 번만 로드해 두고, 여러 Streamlit/서버 프로세스가
+``RERANKER_WORKER_ADDRESS`` 로 접속해 같은 모델과 점수 캐시를 공유합니다.
+
+실행:
+    uv run python -m rag_agent.reranker_worker
+"""
+
+import logging
+
+from rag_agent.config import get_settings
+from rag_agent.reranker import RerankerManager, get_reranker_service, worker_authkey
+
+logger = logging.getLogger(__name__)
+
+
+def serve(address: str | None = None) -> None:
+    settings = get_settings()
+    address = address or settings.reranker_worker_address or "127.0.0.1:50051"
+    host, port = address.rsplit(":", 1)
+    # 키 없이 시작하지 않음 (모델 로드 전에 확인)
+    authkey = worker_authkey()
+
+    # 접속을 받기 전에 모델 로드
+    service = get_reranker_service()
+    load_seconds = service.warmup()
+    logger.info(
+        "리랭커 모델 로드 완료: %s (%.1f초)", settings.reranker_model, load_seconds
+    )
+
+    RerankerManager.register("reranker", callable=lambda: service)
+    manager = RerankerManager(address=(host, int(port)), authkey=authkey)
+    server = manager.get_server()
+    logger.info("리랭커 워커 대기 중: %s", address)
+    server.serve_forever()
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(message)s")
+    serve()
@@ -1,8 +1,14 @@
-from opensearchpy import OpenSearch
+import asyncio
 
+from opensearchpy import AsyncOpenSearch, OpenSearch
+
+from rag_agent.backend import get_search_backend
+from rag_agent.cache import get_retrieval_cache
 from rag_agent.config import get_settings
-from rag_agent.embeddings import create_embeddings
-from rag_agent.indexer import create_opensearch_client
+from rag_agent.context import pack_context
+from rag_agent.embeddings import normalize_text
+
+HYBRID_SEARCH_MODES = ("client", "msearch", "native")
 
 
 def rrf_score(ranks: list[int], k: int = 60) -> float:
@@ -22,173 +28,313 @@ def vector_search(
     k: int | None = None,
     client: OpenSearch | None = None,
     index_name: str | None = None,
+    section: str | None = None,
 ) -> list[dict]:
-    settings = get_settings()
-    client = client or create_opensearch_client()
-    index_name = index_name or settings.index_name
-    k = k or settings.search_top_k
+    k = k or get_settings().search_top_k
+    return get_search_backend(client, index_name).vector_search(query, k, section)
 
-    # 질문을 벡터로 변환
-    embeddings = create_embeddings()
-    query_vector = embeddings.embed_query(query)
-
-    # k-NN 검색 쿼리
-    search_query = {
-        "size": k,
-        "query": {
-            "knn": {
-                "embedding": {
-                    "vector": query_vector,
-                    "k": k,
-                }
-            }
-        },
-    }
 
-    # 검색 실행
-    response = client.search(index=index_name, body=search_query)
+def keyword_search(
+    query: str,
+    k: int | None = None,
+    client: OpenSearch | None = None,
+    index_name: str | None = None,
+    section: str | None = None,
+) -> list[dict]:
+    k = k or get_settings().search_top_k
+    return get_search_backend(client, index_name).keyword_search(query, k, section)
 
-    # 결과 추출
-    results = []
-    for hit in response["hits"]["hits"]:
-        results.append(
-            {
-                "content": hit["_source"]["content"],
-                "score": hit["_score"],
-                "metadata": hit["_source"].get("metadata", {}),
-                "id": hit["_id"],
-            }
-        )
 
-    return results
+async def avector_search(
+    query: str,
+    k: int | None = None,
+    client: AsyncOpenSearch | None = None,
+    index_name: str | None = None,
+    section: str | None = None,
+) -> list[dict]:
+    k = k or get_settings().search_top_k
+    backend = get_search_backend(index_name=index_name, async_client=client)
+    return await backend.avector_search(query, k, section)
 
 
-def keyword_search(
+async def akeyword_search(
     query: str,
     k: int | None = None,
+    client: AsyncOpenSearch | None = None,
+    index_name: str | None = None,
+    section: str | None = None,
+) -> list[dict]:
+    k = k or get_settings().search_top_k
+    backend = get_search_backend(index_name=index_name, async_client=client)
+    return await backend.akeyword_search(query, k, section)
+
+
+def _check_weights(vector_weight: float, keyword_weight: float) -> None:
+    if vector_weight < 0 or keyword_weight < 0 or vector_weight + keyword_weight <= 0:
+        raise ValueError(
+            f"검색 가중치는 0 이상이고 합이 0보다 커야 합니다: "
+            f"vector={vector_weight}, keyword={keyword_weight}"
+        )
+
+
+def hybrid_search(
+    query: str,
+    k: int | None = None,
+    vector_weight: float | None = None,
+    keyword_weight: float | None = None,
     client: OpenSearch | None = None,
     index_name: str | None = None,
+    mode: str | None = None,
+    use_cache: bool | None = None,
+    section: str | None = None,
 ) -> list[dict]:
+    """벡터 + 키워드 하이브리드 검색.
+
+    ``mode`` (기본값: ``settings.hybrid_search_mode``):
+
+    - ``"client"``: 두 번의 검색 요청 후 Python에서 결합 (``settings.fusion_method``)
+    - ``"msearch"``: ``_msearch`` 한 번의 요청 후 Python에서 결합
+    - ``"native"``: OpenSearch hybrid 쿼리 + 정규화 파이프라인. 클러스터가
+      지원하지 않으면 ``"msearch"`` 로 대체하고, 이후 같은 클라이언트에서는
+      바로 ``"msearch"`` 를 사용한다. 연결 오류는 그대로 전달한다.
+      서버에서 점수를 결합하므로 ``RESCORE_FULL_VECTORS`` 리스코어링은 적용되지 않는다.
+
+    로컬 백엔드는 요청 왕복이 없으므로 방식과 관계없이 두 번 검색 후 결합한다.
+    ``section`` 을 지정하면 제목 경로가 그 접두어로 시작하는 청크만 검색한다.
+    결과는 (정규화된 질문, k, 가중치, 방식, 섹션, 인덱스 세대)를 키로 캐시한다.
+    """
     settings = get_settings()
-    client = client or create_opensearch_client()
     index_name = index_name or settings.index_name
     k = k or settings.search_top_k
+    mode = mode or settings.hybrid_search_mode
+    use_cache = use_cache if use_cache is not None else settings.retrieval_cache_enabled
+    vector_weight = (
+        vector_weight if vector_weight is not None else settings.vector_weight
+    )
+    keyword_weight = (
+        keyword_weight if keyword_weight is not None else settings.keyword_weight
+    )
+    if mode not in HYBRID_SEARCH_MODES:
+        raise ValueError(f"지원하지 않는 하이브리드 검색 방식입니다: {mode}")
+    _check_weights(vector_weight, keyword_weight)
+    backend = get_search_backend(client, index_name)
+
+    if use_cache:
+        cache = get_retrieval_cache()
+        cache_key = _hybrid_cache_key(
+            query,
+            k,
+            vector_weight,
+            keyword_weight,
+            backend.hybrid_mode(mode),
+            index_name,
+            backend.generation(),
+            section,
+        )
+        cached = cache.get(cache_key)
+        if cached is not None:
+            return cached
 
-    # BM25 검색 쿼리
-    search_query = {
-        "size": k,
-        "query": {
-            "match": {
-                "content": query,
-            }
-        },
-    }
-
-    # 검색 실행
-    response = client.search(index=index_name, body=search_query)
+    results = backend.hybrid_search(
+        query, k, vector_weight, keyword_weight, mode, section
+    )
 
-    # 결과 추출
-    results = []
-    for hit in response["hits"]["hits"]:
-        results.append(
-            {
-                "content": hit["_source"]["content"],
-                "score": hit["_score"],
-                "metadata": hit["_source"].get("metadata", {}),
-                "id": hit["_id"],
-            }
-        )
+    if use_cache:
+        cache.set(cache_key, results)
 
     return results
 
 
-def hybrid_search(
+async def ahybrid_search(
     query: str,
     k: int | None = None,
     vector_weight: float | None = None,
     keyword_weight: float | None = None,
-    client: OpenSearch | None = None,
+    client: AsyncOpenSearch | None = None,
     index_name: str | None = None,
+    mode: str | None = None,
+    use_cache: bool | None = None,
+    section: str | None = None,
 ) -> list[dict]:
+    """``hybrid_search`` 의 비동기 버전 (``mode`` 도 같은 방식으로 동작).
+
+    ``client`` 방식은 두 검색을 동시에 실행한다.
+    """
     settings = get_settings()
+    index_name = index_name or settings.index_name
     k = k or settings.search_top_k
-    vector_weight = vector_weight if vector_weight is not None else settings.vector_weight
+    mode = mode or settings.hybrid_search_mode
+    use_cache = use_cache if use_cache is not None else settings.retrieval_cache_enabled
+    vector_weight = (
+        vector_weight if vector_weight is not None else settings.vector_weight
+    )
     keyword_weight = (
         keyword_weight if keyword_weight is not None else settings.keyword_weight
     )
+    if mode not in HYBRID_SEARCH_MODES:
+        raise ValueError(f"지원하지 않는 하이브리드 검색 방식입니다: {mode}")
+    _check_weights(vector_weight, keyword_weight)
+    backend = get_search_backend(index_name=index_name, async_client=client)
+
+    if use_cache:
+        cache = get_retrieval_cache()
+        generation = await asyncio.to_thread(backend.generation)
+        cache_key = _hybrid_cache_key(
+            query,
+            k,
+            vector_weight,
+            keyword_weight,
+            backend.hybrid_mode(mode),
+            index_name,
+            generation,
+            section,
+        )
+        cached = cache.get(cache_key)
+        if cached is not None:
+            return cached
 
-    # 각 검색 방식으로 더 많은 후보 추출
-    candidate_k = k * 3
-
-    # 벡터 검색
-    vector_results = vector_search(
-        query, k=candidate_k, client=client, index_name=index_name
+    results = await backend.ahybrid_search(
+        query, k, vector_weight, keyword_weight, mode, section
     )
 
-    # 키워드 검색
-    keyword_results = keyword_search(
-        query, k=candidate_k, client=client, index_name=index_name
+    if use_cache:
+        cache.set(cache_key, results)
+
+    return results
+
+
+def _hybrid_cache_key(
+    query: str,
+    k: int,
+    vector_weight: float,
+    keyword_weight: float,
+    mode: str,
+    index_name: str,
+    generation: str,
+    section: str | None = None,
+) -> str:
+    settings = get_settings()
+    return get_retrieval_cache().make_key(
+        "hybrid",
+        normalize_text(query),
+        k,
+        vector_weight,
+        keyword_weight,
+        mode,
+        settings.fusion_method,
+        settings.heading_boost,
+        settings.korean_analyzer,
+        settings.korean_minimum_should_match,
+        settings.hybrid_candidate_multiplier,
+        settings.embedding_dimensions,
+        settings.rescore_full_vectors,
+        index_name,
+        generation,
+        section,
     )
 
-    # RRF로 점수 병합
-    rrf_k = 60  # RRF 파라미터
-    rrf_scores: dict[str, dict] = {}
-
-    # 벡터 검색 결과에 RRF 점수 부여
-    # rank는 rrf_score 헬퍼와 동일하게 1-indexed로 사용한다.
-    for rank, result in enumerate(vector_results, start=1):
-        doc_id = result["id"]
-        score = vector_weight / (rrf_k + rank)
-
-        if doc_id not in rrf_scores:
-            rrf_scores[doc_id] = {
-                "content": result["content"],
-                "metadata": result["metadata"],
-                "score": 0,
-                "vector_rank": rank,
-                "keyword_rank": None,
-            }
-        rrf_scores[doc_id]["score"] += score
-        rrf_scores[doc_id]["vector_rank"] = rank
-
-    # 키워드 검색 결과에 RRF 점수 추가
-    for rank, result in enumerate(keyword_results, start=1):
-        doc_id = result["id"]
-        score = keyword_weight / (rrf_k + rank)
-
-        if doc_id not in rrf_scores:
-            rrf_scores[doc_id] = {
-                "content": result["content"],
-                "metadata": result["metadata"],
-                "score": 0,
-                "vector_rank": None,
-                "keyword_rank": rank,
+
+def _wanted_neighbors(results: list[dict], window: int) -> dict[str, set[int]]:
+    # 출처별로 (chunk_index ± window) 중 아직 없는 청크
+    have: dict[str, set[int]] = {}
+    for result in results:
+        metadata = result.get("metadata", {})
+        if "source" in metadata and metadata.get("chunk_index") is not None:
+            have.setdefault(metadata["source"], set()).add(metadata["chunk_index"])
+
+    wanted: dict[str, set[int]] = {}
+    for source, indices in have.items():
+        neighbors = {
+            i + offset
+            for i in indices
+            for offset in range(-window, window + 1)
+            if i + offset >= 0
+        } - indices
+        if neighbors:
+            wanted[source] = neighbors
+
+    return wanted
+
+
+def _attach_neighbors(results: list[dict], neighbors: list[dict]) -> list[dict]:
+    # 이웃 청크는 가장 가까운 검색 결과의 점수를 물려받음
+    anchors: dict[str, list[dict]] = {}
+    for result in results:
+        metadata = result.get("metadata", {})
+        if metadata.get("chunk_index") is not None:
+            anchors.setdefault(metadata.get("source"), []).append(result)
+
+    expanded = list(results)
+    for neighbor in neighbors:
+        chunk_idx = neighbor["metadata"]["chunk_index"]
+        anchor = min(
+            anchors.get(neighbor["metadata"].get("source"), []),
+            key=lambda r: abs(r["metadata"]["chunk_index"] - chunk_idx),
+            default=None,
+        )
+        if anchor is None:
+            continue
+        expanded.append(
+            {
+                **neighbor,
+                "score": anchor["score"],
+                "rerank_score": anchor.get("rerank_score", anchor["score"]),
+                "neighbor_of": anchor["id"],
             }
-        rrf_scores[doc_id]["score"] += score
-        rrf_scores[doc_id]["keyword_rank"] = rank
-
-    # 점수순 정렬
-    sorted_results = sorted(
-        [{"id": doc_id, **data} for doc_id, data in rrf_scores.items()],
-        key=lambda x: x["score"],
-        reverse=True,
-    )
+        )
+
+    return expanded
+
+
+def expand_neighbors(
+    results: list[dict],
+    window: int | None = None,
+    client: OpenSearch | None = None,
+    index_name: str | None = None,
+) -> list[dict]:
+    """검색된 청크의 앞뒤 이웃 청크(``chunk_index`` ± ``window``)를 추가.
+
+    작은 청크로 정밀하게 검색하고, 답변 생성에는 주변 문맥까지 넣기 위한
+    후처리 단계다. 모든 출처의 이웃을 한 번의 검색 요청으로 가져온다.
+    이웃 청크는 원래 결과 뒤에 붙으며, ``format_search_results`` 에서 인접
+    청크와 합쳐진다. ``window`` 가 0이면 그대로 반환한다.
+    """
+    settings = get_settings()
+    window = window if window is not None else settings.neighbor_window
+    if window <= 0 or not results:
+        return results
+
+    wanted = _wanted_neighbors(results, window)
+    if not wanted:
+        return results
 
-    return sorted_results[:k]
+    neighbors = get_search_backend(client, index_name).get_chunks(wanted)
+    return _attach_neighbors(results, neighbors)
 
 
-def format_search_results(results: list[dict], include_score: bool = True) -> str:
-    formatted_parts = []
+async def aexpand_neighbors(
+    results: list[dict],
+    window: int | None = None,
+    client: AsyncOpenSearch | None = None,
+    index_name: str | None = None,
+) -> list[dict]:
+    settings = get_settings()
+    window = window if window is not None else settings.neighbor_window
+    if window <= 0 or not results:
+        return results
 
-    for i, result in enumerate(results, 1):
-        source = result.get("metadata", {}).get("source", "unknown")
-        chunk_idx = result.get("metadata", {}).get("chunk_index", "?")
+    wanted = _wanted_neighbors(results, window)
+    if not wanted:
+        return results
 
-        if include_score:
-            header = f"[문서 {i}] 출처: {source}, 청크 {chunk_idx}, 점수: {result['score']:.3f}"
-        else:
-            header = f"[문서 {i}] 출처: {source}, 청크 {chunk_idx}"
+    backend = get_search_backend(index_name=index_name, async_client=client)
+    return _attach_neighbors(results, await backend.aget_chunks(wanted))
 
-        formatted_parts.append(f"{header}\n{result['content']}")
 
-    return "\n\n---\n\n".join(formatted_parts)
+def format_search_results(
+    results: list[dict],
+    include_score: bool = True,
+    max_tokens: int | None = None,
+) -> str:
+    # 중복/인접 청크 병합 + 토큰 예산 적용 (max_tokens 미지정 시 설정값)
+    return pack_context(results, max_tokens=max_tokens, include_score=include_score)
@@ -0,0 +1,15 @@
+import os
+
+import pytest
+
+# 설정 로드에 필요한 값 (테스트는 OpenAI API를 호출하지 않음)
+os.environ.setdefault("OPENAI_API_KEY", "test")
+
+
+@pytest.fixture(autouse=True)
+def fresh_settings():
+    from rag_agent.config import get_settings
+
+    get_settings.cache_clear()
+    yield
+    get_settings.cache_clear()
@@ -0,0 +1,235 @@
+import math
+
+import pytest
+from langchain_core.documents import Document
+
+from rag_agent.backend import (
+    BM25Index,
+    LocalSearchBackend,
+    get_local_backend,
+    get_search_backend,
+    minimum_matches,
+)
+from rag_agent.config import get_settings
+from rag_agent.document import chunk_id, content_hash, get_sample_chunks
+
+
+@pytest.mark.parametrize(
+    ("total", "spec", "expected"),
+    [
+        (14, "1<2", 2),
+        (1, "1<2", 1),
+        (14, "75%", 10),
+        (4, "-25%", 3),
+        (2, "2<-25% 9<-3", 2),
+        (5, "2<-25% 9<-3", 4),
+        (12, "2<-25% 9<-3", 9),
+        (3, None, 1),
+        (0, "2", 0),
+    ],
+)
+def test_minimum_matches(total, spec, expected):
+    assert minimum_matches(total, spec) == expected
+
+
+@pytest.fixture
+def sample_backend(tmp_path):
+    def build(analyzer: str) -> LocalSearchBackend:
+        backend = LocalSearchBackend(
+            tmp_path / analyzer,
+            analyzer=analyzer,
+            minimum_should_match=get_settings().korean_minimum_should_match,
+        )
+        chunks = get_sample_chunks()
+        backend.add(chunks, [[1.0, 0.0]] * len(chunks))
+        return backend
+
+    return build
+
+
+def test_ngram_matches_inside_compound_words(sample_backend):
+    # "연차"는 공백 단위 토큰 "연차휴가는"과 일치하지 않음
+    assert sample_backend("standard").keyword_search("연차", 5) == []
+
+    results = sample_backend("ngram").keyword_search("연차", 5)
+    assert results
+    assert all("연차휴가" in r["metadata"]["heading_path"] for r in results)
+
+
+def test_ngram_natural_question_keeps_recall(sample_backend):
+    results = sample_backend("ngram").keyword_search("연차휴가는 며칠인가요?", 5)
+
+    # 기본 minimum_should_match로 자연어 질문도 일치하고,
+    # "휴가" 하나만 겹치는 특별휴가 청크는 제외됨
+    assert results
+    assert all("1. 연차휴가" in r["metadata"]["heading_path"] for r in results)
+
+
+def _doc(content: str, source: str, chunk_index: int) -> Document:
+    return Document(
+        page_content=content,
+        metadata={"source": source, "chunk_index": chunk_index},
+    )
+
+
+def test_reloads_when_another_instance_saves(tmp_path):
+    reader = LocalSearchBackend(tmp_path)
+    writer = LocalSearchBackend(tmp_path)
+
+    writer.add([_doc("연차휴가", "a.md", 0)], [[1.0, 0.0]])
+    assert len(reader) == 1
+
+    writer.add([_doc("재택근무", "b.md", 0)], [[0.0, 1.0]])
+    results = reader.search_by_vector([0.0, 1.0], 1)
+    # 문서와 벡터가 같은 세대에서 나옴
+    assert [r["content"] for r in results] == ["재택근무"]
+    assert reader.generation() == writer.generation()
+
+
+def test_batch_writes_once_and_discards_on_error(tmp_path):
+    backend = LocalSearchBackend(tmp_path)
+    backend.add([_doc("연차휴가", "a.md", 0)], [[1.0, 0.0]])
+    generation = backend.generation()
+
+    with backend.batch():
+        backend.add([_doc("재택근무", "b.md", 0)], [[0.0, 1.0]])
+        backend.delete([chunk_id(_doc("연차휴가", "a.md", 0))])
+        # 블록이 끝나기 전에는 저장되지 않음
+        assert backend.generation() == generation
+    assert [r["content"] for r in backend.search_by_vector([0.0, 1.0], 5)] == [
+        "재택근무"
+    ]
+
+    with pytest.raises(KeyError), backend.batch():
+        backend.clear()
+        raise KeyError
+    assert len(backend) == 1
+
+
+def test_bm25_matches_lucene_formula():
+    index = BM25Index(["연차 휴가", "연차 연차 신청 절차", "재택근무"])
+    scores = index.score("연차")
+
+    # idf = ln(1 + (N - n + 0.5) / (n + 0.5)), 문서 길이로 tf 정규화
+    idf = math.log(1 + (3 - 2 + 0.5) / (2 + 0.5))
+    avg_length = 7 / 3
+    expected = [
+        idf * tf * 2.2 / (tf + 1.2 * (0.25 + 0.75 * length / avg_length))
+        for tf, length in [(1, 2), (2, 4)]
+    ]
+    assert scores[:2] == pytest.approx(expected)
+    assert scores[2] == 0.0
+
+
+def test_bm25_minimum_should_match_zeroes_partial_matches():
+    index = BM25Index(["연차 휴가 신청", "연차 규정"])
+
+    assert all(index.score("연차 휴가") > 0)
+    assert list(index.score("연차 휴가", "100%") > 0) == [True, False]
+
+
+class FakeEmbeddings:
+    # "휴가"가 들어간 텍스트는 x축, 나머지는 y축 (OpenAI API 호출 없음)
+    def __init__(self):
+        self.embedded: list[str] = []
+
+    def _embed(self, text: str) -> list[float]:
+        return [1.0, 0.0] if "휴가" in text else [0.0, 1.0]
+
+    def embed_documents(self, texts: list[str]) -> list[list[float]]:
+        self.embedded += texts
+        return [self._embed(text) for text in texts]
+
+    def embed_query(self, text: str) -> list[float]:
+        return self._embed(text)
+
+    async def aembed_query(self, text: str) -> list[float]:
+        return self._embed(text)
+
+
+@pytest.fixture
+def fake_embeddings(monkeypatch):
+    embeddings = FakeEmbeddings()
+    monkeypatch.setattr("rag_agent.backend.create_embeddings", lambda: embeddings)
+    return embeddings
+
+
+def _section_doc(content: str, heading_path: str, chunk_index: int) -> Document:
+    doc = Document(
+        page_content=content,
+        metadata={
+            "source": "rules.md",
+            "chunk_index": chunk_index,
+            "heading_path": heading_path,
+        },
+    )
+    # chunk_documents와 같이 증분 동기화용 내용 해시 기록
+    doc.metadata["content_hash"] = content_hash(doc)
+    return doc
+
+
+SECTION_DOCS = [
+    _section_doc("연차휴가 15일", "휴가 > 연차", 0),
+    _section_doc("병가 휴가 60일", "휴가 > 병가", 1),
+    _section_doc("재택근무 주 2회", "근무 > 재택", 2),
+]
+
+
+def test_section_filter_limits_vector_and_keyword_search(tmp_path, fake_embeddings):
+    backend = LocalSearchBackend(tmp_path)
+    backend.index_documents(SECTION_DOCS)
+
+    assert [r["content"] for r in backend.vector_search("휴가", 5, "근무")] == [
+        "재택근무 주 2회"
+    ]
+    results = backend.keyword_search("휴가", 5, "휴가 > 병가")
+    assert [r["content"] for r in results] == ["병가 휴가 60일"]
+    assert backend.keyword_search("휴가", 5, "없는 섹션") == []
+
+
+def test_hybrid_search_fuses_both_legs(tmp_path, fake_embeddings):
+    backend = LocalSearchBackend(tmp_path)
+    backend.index_documents(SECTION_DOCS)
+
+    results = backend.hybrid_search("재택근무", 2, 0.5, 0.5, mode="native")
+
+    assert results[0]["content"] == "재택근무 주 2회"
+    assert results[0]["vector_rank"] == 1
+    assert results[0]["keyword_rank"] == 1
+    assert len(results) == 2
+    assert backend.hybrid_mode("native") == "client"
+
+
+def test_sync_documents_embeds_only_changes(tmp_path, fake_embeddings):
+    backend = LocalSearchBackend(tmp_path)
+    assert backend.sync_documents(SECTION_DOCS) == {
+        "added": 3,
+        "updated": 0,
+        "deleted": 0,
+        "unchanged": 0,
+    }
+
+    fake_embeddings.embedded.clear()
+    edited = _section_doc("연차휴가 20일", "휴가 > 연차", 0)
+    stats = backend.sync_documents([edited, SECTION_DOCS[1]])
+
+    assert stats == {"added": 0, "updated": 1, "deleted": 1, "unchanged": 1}
+    assert fake_embeddings.embedded == ["연차휴가 20일"]
+    assert sorted(
+        r["content"] for r in backend.get_chunks({"rules.md": {0, 1, 2}})
+    ) == [
+        "병가 휴가 60일",
+        "연차휴가 20일",
+    ]
+
+
+def test_get_search_backend_uses_local_backend(tmp_path, monkeypatch):
+    monkeypatch.setenv("SEARCH_BACKEND", "local")
+    monkeypatch.setenv("LOCAL_INDEX_PATH", str(tmp_path))
+    get_local_backend.cache_clear()
+    try:
+        backend = get_search_backend()
+        assert isinstance(backend, LocalSearchBackend)
+        assert backend is get_search_backend(index_name="ignored")
+    finally:
+        get_local_backend.cache_clear()
@@ -0,0 +1,105 @@
+import pytest
+
+from rag_agent import context
+from rag_agent.context import SEPARATOR, merge_adjacent_chunks, pack_context
+
+
+def _chunk(
+    content: str,
+    chunk_index: int | None,
+    score: float,
+    source: str = "a.md",
+    **metadata,
+) -> dict:
+    return {
+        "id": f"{source}-{chunk_index}-{content}",
+        "content": content,
+        "metadata": {"source": source, "chunk_index": chunk_index, **metadata},
+        "score": score,
+    }
+
+
+class CharEncoding:
+    # 글자 하나를 토큰 하나로 세는 테스트용 토크나이저 (tiktoken 다운로드 없음)
+    def encode(self, text: str, disallowed_special=()) -> list[str]:
+        return list(text)
+
+    def decode(self, tokens: list[str]) -> str:
+        return "".join(tokens)
+
+
+@pytest.fixture
+def char_tokens(monkeypatch):
+    monkeypatch.setattr(context, "get_encoding", CharEncoding)
+
+
+def test_merges_adjacent_chunks_and_drops_duplicates():
+    results = [
+        _chunk("연차휴가는 15일이다.", 1, 0.5, start_index=10, end_index=23),
+        _chunk("15일이다. 이월 가능.", 2, 0.9, start_index=17, end_index=30),
+        _chunk("연차휴가는 15일이다.", 1, 0.7),
+        _chunk("재택근무", 0, 0.8, source="b.md"),
+    ]
+
+    merged = merge_adjacent_chunks(results)
+
+    assert [m["metadata"]["source"] for m in merged] == ["a.md", "b.md"]
+    # 원문 위치로 오버랩 제거, 구간 점수는 최고 점수
+    assert merged[0]["content"] == "연차휴가는 15일이다. 이월 가능."
+    assert merged[0]["metadata"]["chunk_end"] == 2
+    assert merged[0]["score"] == 0.9
+
+
+def test_merge_prefers_rerank_score_and_keeps_unindexed():
+    results = [
+        {**_chunk("첫 청크", 0, 0.1), "rerank_score": 0.2},
+        {**_chunk("둘째 청크", 1, 0.1), "rerank_score": 0.6},
+        _chunk("위치 없는 결과", None, 0.4, source="c.md"),
+    ]
+
+    merged = merge_adjacent_chunks(results)
+
+    assert merged[0]["content"] == "첫 청크\n둘째 청크"
+    assert merged[0]["score"] == 0.6
+    assert "rerank_score" not in merged[0]
+    assert merged[1]["content"] == "위치 없는 결과"
+
+
+def test_pack_context_without_budget_includes_everything():
+    packed = pack_context(
+        [_chunk("본문 A", 0, 0.9), _chunk("본문 B", 5, 0.3)],
+        max_tokens=0,
+        include_score=False,
+    )
+
+    assert packed == SEPARATOR.join(
+        [
+            "[문서 1] 출처: a.md, 청크 0\n본문 A",
+            "[문서 2] 출처: a.md, 청크 5\n본문 B",
+        ]
+    )
+
+
+def test_pack_context_truncates_lowest_scored_segment(char_tokens):
+    results = [_chunk("가" * 20, 0, 0.9), _chunk("나" * 20, 5, 0.3)]
+    header = "[문서 1] 출처: a.md, 청크 0"
+    second_header = "[문서 2] 출처: a.md, 청크 5"
+    budget = len(header) + 1 + 20 + len(SEPARATOR) + len(second_header) + 1 + 10
+
+    packed = pack_context(results, max_tokens=budget, include_score=False)
+
+    first, second = packed.split(SEPARATOR)
+    assert first == f"{header}\n{'가' * 20}"
+    # 남은 예산 10 토큰 중 한 자리는 말줄임표
+    assert second == f"{second_header}\n{'나' * 9}…"
+
+
+def test_pack_context_stops_when_header_does_not_fit(char_tokens):
+    results = [_chunk("가" * 20, 0, 0.9), _chunk("나" * 20, 5, 0.3)]
+    header = "[문서 1] 출처: a.md, 청크 0"
+
+    packed = pack_context(
+        results, max_tokens=len(header) + 1 + 20 + 3, include_score=False
+    )
+
+    assert packed == f"{header}\n{'가' * 20}"
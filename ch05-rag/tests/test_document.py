@@ -0,0 +1,36 @@
+from rag_agent.document import split_markdown_sections
+
+
+def _sections(text: str) -> list[tuple[str, list[str]]]:
+    return [
+        (text[start:end], path) for start, end, path in split_markdown_sections(text)
+    ]
+
+
+def test_splits_by_heading_with_path():
+    text = "서문\n# 휴가\n## 연차\n15일\n## 병가\n60일\n# 근무\n재택\n"
+
+    assert _sections(text) == [
+        ("서문\n", []),
+        # 본문 없는 "# 휴가"는 다음 구간에 합쳐짐
+        ("# 휴가\n## 연차\n15일\n", ["휴가", "연차"]),
+        ("## 병가\n60일\n", ["휴가", "병가"]),
+        ("# 근무\n재택\n", ["근무"]),
+    ]
+
+
+def test_ignores_headings_inside_code_fences():
+    text = "# 설치\n```bash\n# 주석\npip install\n```\n"
+
+    assert _sections(text) == [(text, ["설치"])]
+
+
+def test_keeps_trailing_heading_only_section():
+    text = "# 개요\n내용\n# 부록\n"
+
+    assert _sections(text) == [("# 개요\n내용\n", ["개요"]), ("# 부록\n", ["부록"])]
+
+
+def test_text_without_headings_is_one_section():
+    assert _sections("제목 없는 문서") == [("제목 없는 문서", [])]
+    assert split_markdown_sections("") == []
@@ -0,0 +1,65 @@
+import pytest
+
+from rag_agent.fusion import fuse
+
+
+def _ranked(*scored: tuple[str, float]) -> list[dict]:
+    return [
+        {"id": doc_id, "content": doc_id, "metadata": {}, "score": score}
+        for doc_id, score in scored
+    ]
+
+
+VECTOR = _ranked(("a", 0.9), ("b", 0.8), ("c", 0.1))
+KEYWORD = _ranked(("c", 12.0), ("a", 3.0), ("d", 3.0))
+
+
+def test_rrf_sums_weighted_reciprocal_ranks():
+    results = fuse([VECTOR, KEYWORD], weights=[1.0, 0.5], rrf_k=60)
+    scores = {r["id"]: r["score"] for r in results}
+
+    assert scores["a"] == pytest.approx(1 / 61 + 0.5 / 62)
+    assert scores["d"] == pytest.approx(0.5 / 63)
+    assert [r["id"] for r in results] == ["a", "c", "b", "d"]
+
+
+def test_weighted_sum_normalizes_each_leg():
+    results = fuse([VECTOR, KEYWORD], method="weighted_sum")
+    scores = {r["id"]: r["score"] for r in results}
+
+    # a: 벡터 1.0 + 키워드 0.0, c: 벡터 0.0 + 키워드 1.0
+    assert scores["a"] == pytest.approx(1.0)
+    assert scores["c"] == pytest.approx(1.0)
+    assert scores["b"] == pytest.approx(0.7 / 0.8)
+    assert scores["d"] == pytest.approx(0.0)
+
+
+def test_combmnz_multiplies_by_number_of_legs():
+    results = fuse([VECTOR, KEYWORD], method="combmnz")
+    scores = {r["id"]: r["score"] for r in results}
+
+    assert scores["a"] == pytest.approx(2.0)
+    assert scores["b"] == pytest.approx(0.7 / 0.8)
+
+
+def test_equal_scores_normalize_to_one():
+    results = fuse([_ranked(("a", 2.0), ("b", 2.0))], method="weighted_sum")
+    assert [r["score"] for r in results] == [1.0, 1.0]
+
+
+def test_ranks_names_and_k():
+    results = fuse([VECTOR, KEYWORD], names=["vector", "keyword"], k=2)
+
+    assert len(results) == 2
+    assert results[0]["vector_rank"] == 1
+    assert results[0]["keyword_rank"] == 2
+    # 한 검색기에만 있는 문서는 다른 검색기 순위가 None
+    only_vector = fuse([VECTOR, KEYWORD], names=["vector", "keyword"])[2]
+    assert only_vector["id"] == "b"
+    assert only_vector["keyword_rank"] is None
+
+
+def test_empty_and_invalid_inputs():
+    assert fuse([[], []]) == []
+    with pytest.raises(ValueError):
+        fuse([VECTOR], method="borda")